@@ -0,0 +1,154 @@
+# api/checkpoint.py
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, List, Optional
+
+from api.file_service import FileService
+
+
+class PlaylistCheckpoint:
+    """Manifesto de progresso de uma exportação de playlist.
+
+    Cada vídeo processado gera uma linha em `manifest.jsonl` com o status, o
+    idioma usado e o local do arquivo gerado, que fica salvo ao lado do
+    manifesto. Se a exportação for interrompida, uma nova execução do mesmo
+    trabalho (mesma playlist, idiomas e formato) reaproveita os vídeos já
+    concluídos e busca apenas os que faltaram ou falharam.
+
+    O manifesto só recebe anexos, então uma interrupção no meio da gravação
+    perde no máximo a última linha.
+    """
+
+    STATUS_DONE = "done"
+    STATUS_MISSING = "missing"
+    STATUS_FAILED = "failed"
+
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(self, directory: str):
+        """Abre (ou cria) o checkpoint no diretório informado.
+
+        Args:
+            directory: Diretório do trabalho, com o manifesto e os arquivos gerados
+        """
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, self.MANIFEST_NAME)
+        self.entries: Dict[str, Dict] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        self._manifest = open(self.manifest_path, "a", encoding="utf-8")
+
+    @staticmethod
+    def job_id(playlist_id: str, languages: List[str], export_format: str) -> str:
+        """Monta o identificador do trabalho a partir da playlist, idiomas e formato."""
+        digest = hashlib.sha1(",".join(languages).encode("utf-8")).hexdigest()[:8]
+        return f"{playlist_id}_{export_format}_{digest}"
+
+    @staticmethod
+    def open(playlist_id: str, languages: List[str], export_format: str,
+             jobs_dir: Optional[str] = None) -> "PlaylistCheckpoint":
+        """Abre o checkpoint do trabalho de exportação de uma playlist.
+
+        Args:
+            playlist_id: ID da playlist do YouTube
+            languages: Idiomas pedidos, por ordem de preferência
+            export_format: Formato dos arquivos exportados
+            jobs_dir: Diretório base dos trabalhos (padrão: FileService.create_jobs_dir())
+
+        Returns:
+            PlaylistCheckpoint com o progresso das execuções anteriores
+        """
+        base_dir = jobs_dir or FileService.create_jobs_dir()
+        job_id = PlaylistCheckpoint.job_id(playlist_id, languages, export_format)
+        return PlaylistCheckpoint(os.path.join(base_dir, job_id))
+
+    def __enter__(self) -> "PlaylistCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        """Lê o manifesto; a última linha de cada vídeo prevalece."""
+        if not os.path.exists(self.manifest_path):
+            return
+
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Linha incompleta de uma execução interrompida
+                    continue
+                if isinstance(entry, dict) and entry.get("video_id"):
+                    self.entries[entry["video_id"]] = entry
+
+    def _artifact_name(self, video_id: str) -> str:
+        return f"{video_id}.bin"
+
+    def is_done(self, video_id: str) -> bool:
+        """Indica se o vídeo já foi exportado e o arquivo gerado ainda existe."""
+        entry = self.entries.get(video_id)
+        if not entry or entry.get("status") != self.STATUS_DONE:
+            return False
+        return os.path.exists(os.path.join(self.directory, entry["artifact"]))
+
+    def read_artifact(self, video_id: str) -> Optional[bytes]:
+        """Retorna o arquivo exportado de um vídeo concluído, ou None se ausente."""
+        entry = self.entries.get(video_id)
+        if not entry or not entry.get("artifact"):
+            return None
+        try:
+            with open(os.path.join(self.directory, entry["artifact"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def record(self, video_id: str, status: str, filename: Optional[str] = None,
+               language: Optional[str] = None, data: Optional[bytes] = None,
+               error: Optional[str] = None) -> None:
+        """Registra o resultado de um vídeo no manifesto.
+
+        Args:
+            video_id: ID do vídeo
+            status: STATUS_DONE, STATUS_MISSING ou STATUS_FAILED
+            filename: Nome do arquivo do vídeo dentro do ZIP
+            language: Idioma da transcrição usada
+            data: Conteúdo exportado, salvo ao lado do manifesto
+            error: Mensagem de erro, se houver
+        """
+        entry = {"video_id": video_id, "status": status, "filename": filename,
+                 "language": language, "artifact": None, "error": error}
+
+        if data is not None:
+            artifact = self._artifact_name(video_id)
+            path = os.path.join(self.directory, artifact)
+            # Grava em arquivo temporário para nunca deixar um arquivo pela metade
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+            entry["artifact"] = artifact
+
+        self.entries[video_id] = entry
+        self._manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._manifest.flush()
+
+    def summary(self) -> Dict[str, int]:
+        """Retorna a quantidade de vídeos em cada status."""
+        counts = {self.STATUS_DONE: 0, self.STATUS_MISSING: 0, self.STATUS_FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def close(self) -> None:
+        """Fecha o manifesto."""
+        if not self._manifest.closed:
+            self._manifest.close()
+
+    def remove(self) -> None:
+        """Fecha e apaga o checkpoint e os arquivos gerados."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
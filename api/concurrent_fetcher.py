@@ -0,0 +1,113 @@
+# api/concurrent_fetcher.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from models.data_models import FetchResult
+from utils import config
+
+# Marca o fim da enumeração dos itens na fila de resultados
+_FEED_DONE = object()
+
+
+class ConcurrentFetcher:
+    """Executa buscas de rede em paralelo com um pool limitado de workers.
+
+    O limite de requisições por segundo não fica aqui: cada requisição ao
+    YouTube consome um token do bucket do processo
+    (TranscriptService.rate_limiter), qualquer que seja o número de
+    fetchers, trabalhos ou sessões em andamento.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or config.FETCH_MAX_WORKERS)
+
+    def iter_results(self, items: Iterable[Any], fn: Callable[[Any], Any]) -> Iterator[FetchResult]:
+        """Executa `fn` para cada item e produz os resultados à medida que terminam.
+
+        Os itens são consumidos por uma thread própria, então um gerador lento
+        (como a paginação de uma playlist) não impede que os resultados já
+        concluídos sejam entregues. Apenas um número limitado de itens fica
+        pendente ao mesmo tempo, então `items` pode ser arbitrariamente longo.
+
+        Args:
+            items: Itens a serem processados (por exemplo, vídeos da playlist)
+            fn: Função executada para cada item em uma thread do pool
+
+        Yields:
+            FetchResult de cada item, na ordem em que forem concluídos
+        """
+        slots = threading.Semaphore(self.max_workers * 2)
+        finished: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+        state = {"submitted": 0, "error": None}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def feed() -> None:
+                try:
+                    for index, item in enumerate(items):
+                        slots.acquire()
+                        if stop.is_set():
+                            break
+                        future = executor.submit(fn, item)
+                        state["submitted"] += 1
+                        future.add_done_callback(
+                            lambda f, index=index, item=item: finished.put((index, item, f))
+                        )
+                except Exception as e:
+                    state["error"] = e
+                finally:
+                    finished.put(_FEED_DONE)
+
+            feeder = threading.Thread(target=feed, name="fetch-feeder", daemon=True)
+            feeder.start()
+
+            received = 0
+            feeding = True
+            try:
+                while feeding or received < state["submitted"]:
+                    entry = finished.get()
+                    if entry is _FEED_DONE:
+                        feeding = False
+                        continue
+
+                    index, item, future = entry
+                    received += 1
+                    slots.release()
+                    try:
+                        result = FetchResult(index=index, item=item, value=future.result())
+                    except Exception as e:
+                        result = FetchResult(index=index, item=item, error=str(e))
+                    yield result
+            finally:
+                # Libera a thread de alimentação se o consumidor parar antes do fim
+                stop.set()
+                slots.release()
+                feeder.join()
+
+            if state["error"] is not None:
+                raise state["error"]
+
+    def run(self, items: Iterable[Any], fn: Callable[[Any], Any],
+            progress_callback: Optional[Callable[[int, FetchResult], None]] = None) -> List[FetchResult]:
+        """Executa `fn` para todos os itens e retorna os resultados na ordem original.
+
+        Args:
+            items: Itens a serem processados
+            fn: Função executada para cada item
+            progress_callback: Função chamada na thread do chamador a cada item
+                               concluído, recebendo o total concluído e o resultado
+
+        Returns:
+            Lista de FetchResult na mesma ordem dos itens de entrada
+        """
+        results = []
+        for completed, result in enumerate(self.iter_results(items, fn), start=1):
+            results.append(result)
+            if progress_callback:
+                progress_callback(completed, result)
+
+        results.sort(key=lambda r: r.index)
+        return results
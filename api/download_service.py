@@ -0,0 +1,190 @@
+# api/download_service.py
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import quote, urlparse, urlsplit
+
+from models.data_models import Job
+from api.job_service import JobService
+from api.file_service import FileService
+from utils import config, metrics
+
+# Intervalo de bytes pedido no cabeçalho Range (apenas um intervalo é suportado)
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _DownloadHandler(BaseHTTPRequestHandler):
+    """Serve os arquivos dos trabalhos concluídos direto do disco.
+
+    O conteúdo é enviado com sendfile (ou em blocos, onde não houver), então
+    a memória usada por download não depende do tamanho do arquivo.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def log_message(self, format, *args):
+        # Não polui a saída com um log por requisição
+        pass
+
+    def _serve(self, send_body: bool) -> None:
+        job = DownloadService.resolve_path(urlparse(self.path).path)
+        if job is None:
+            self.send_error(404, "Arquivo não encontrado")
+            return
+        if job.artifact:
+            FileService.get_artifact_store().touch(job.artifact)
+
+        path = job.result_path
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(404, "Arquivo não encontrado")
+            return
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            byte_range = DownloadService.parse_range(self.headers.get("Range"), size)
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            start, end = byte_range
+            length = end - start + 1 if size else 0
+            partial = self.headers.get("Range") is not None and (start, end) != (0, size - 1)
+
+            self.send_response(206 if partial else 200)
+            self.send_header("Content-Type", job.mime or "application/octet-stream")
+            self.send_header("Content-Length", str(length))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Disposition",
+                             f"attachment; filename*=UTF-8''{quote(job.result_name or os.path.basename(path))}")
+            self.send_header("Last-Modified", self.date_time_string(int(os.fstat(f.fileno()).st_mtime)))
+            if partial:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+
+            if not send_body or length == 0:
+                return
+
+            try:
+                with metrics.track_stage("download"):
+                    sent = self.connection.sendfile(f, start, length)
+                metrics.BYTES_WRITTEN.inc(sent, kind="download")
+            except (BrokenPipeError, ConnectionResetError):
+                # O navegador cancelou o download
+                metrics.FAILURES.inc(stage="download", kind="cancelled")
+
+
+class DownloadService:
+    """Servidor HTTP dos arquivos gerados pelos trabalhos.
+
+    Roda em uma thread do processo do Streamlit, em uma porta própria, e
+    atende apenas caminhos /download/<id do trabalho>, resolvidos pelo
+    JobService, de modo que nenhum outro arquivo do disco fica acessível.
+    """
+
+    _server: Optional[ThreadingHTTPServer] = None
+    _started = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def start_server() -> Optional[ThreadingHTTPServer]:
+        """Inicia o servidor de downloads (uma única vez por processo).
+
+        Returns:
+            Servidor em execução ou None se desativado ou se a porta estiver em uso
+        """
+        if config.DOWNLOAD_PORT <= 0:
+            return None
+
+        with DownloadService._lock:
+            if not DownloadService._started:
+                DownloadService._started = True
+                try:
+                    server = ThreadingHTTPServer((config.DOWNLOAD_ADDRESS, config.DOWNLOAD_PORT), _DownloadHandler)
+                except OSError as e:
+                    print(f"Não foi possível iniciar o servidor de downloads na porta {config.DOWNLOAD_PORT}: {str(e)}")
+                    return None
+                server.daemon_threads = True
+                thread = threading.Thread(target=server.serve_forever, name="download-server", daemon=True)
+                thread.start()
+                DownloadService._server = server
+            return DownloadService._server
+
+    @staticmethod
+    def is_available() -> bool:
+        """Indica se o servidor de downloads está em execução."""
+        return DownloadService._server is not None
+
+    @staticmethod
+    def url_for(job: Job, host: Optional[str] = None) -> str:
+        """Retorna o endereço de download do arquivo de um trabalho.
+
+        Args:
+            job: Trabalho concluído
+            host: Cabeçalho Host da requisição do navegador à interface; sem
+                TRANSCRIPTTUBE_DOWNLOAD_BASE_URL, o link usa o mesmo nome de
+                host na porta de downloads (padrão: localhost)
+        """
+        base_url = config.DOWNLOAD_BASE_URL
+        if not base_url:
+            hostname = (urlsplit(f"//{host}").hostname if host else None) or "localhost"
+            if ":" in hostname:
+                hostname = f"[{hostname}]"
+            base_url = f"http://{hostname}:{config.DOWNLOAD_PORT}"
+        return f"{base_url.rstrip('/')}/download/{job.id}"
+
+    @staticmethod
+    def resolve_path(path: str) -> Optional[Job]:
+        """Retorna o trabalho do caminho /download/<id> se o arquivo estiver disponível."""
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "download" or not re.fullmatch(r"[0-9a-f]{32}", parts[1]):
+            return None
+
+        job = JobService.get(parts[1])
+        if job is None or not job.result_path or not os.path.isfile(job.result_path):
+            return None
+        return job
+
+    @staticmethod
+    def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+        """Interpreta o cabeçalho Range.
+
+        Args:
+            header: Valor do cabeçalho (None para o arquivo inteiro)
+            size: Tamanho do arquivo
+
+        Returns:
+            Tupla (início, fim) inclusiva, ou None se o intervalo for inválido
+        """
+        if not header:
+            return 0, max(0, size - 1)
+
+        match = _RANGE_PATTERN.match(header.strip())
+        if not match or not (match.group(1) or match.group(2)):
+            # Múltiplos intervalos ou formato desconhecido: envia o arquivo inteiro
+            return 0, max(0, size - 1)
+
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # "bytes=-N": os últimos N bytes
+            start = max(0, size - int(last))
+            end = size - 1
+
+        if start >= size or start > end:
+            return None
+        return start, end
@@ -0,0 +1,234 @@
+# api/export_service.py
+import os
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from models.data_models import FetchResult, PlaylistExportResult, Video
+from api.transcript_service import TranscriptService
+from api.exporters import RenderPool, get_exporter
+from api.file_service import FileService, ZipStreamWriter
+from api.checkpoint import PlaylistCheckpoint
+from utils import config
+
+if TYPE_CHECKING:
+    from api.pdf_book import PDFBookWriter
+
+# Destino dos arquivos exportados: ZIP ou PDF combinado (mesma interface)
+OutputWriter = Union[ZipStreamWriter, "PDFBookWriter"]
+
+
+class ExportService:
+    @staticmethod
+    def export_playlist(videos: Iterable[Video], languages: List[str], zip_name: str,
+                        progress_callback: Optional[Callable[[int, FetchResult], None]] = None,
+                        render_workers: Optional[int] = None,
+                        export_format: str = "pdf",
+                        output_dir: Optional[str] = None,
+                        max_workers: Optional[int] = None,
+                        checkpoint: Optional[PlaylistCheckpoint] = None,
+                        combine: bool = False,
+                        title: str = "") -> PlaylistExportResult:
+        """Busca as transcrições e grava os arquivos direto em um ZIP, sem arquivos temporários.
+
+        Cada vídeo é enviado ao pool de renderização assim que sua transcrição
+        chega, e cada arquivo vai para o ZIP assim que fica pronto. A memória usada
+        fica limitada às buscas e renderizações em andamento e ao buffer de
+        reordenação do ZipStreamWriter.
+
+        Com um checkpoint, cada arquivo gerado também é salvo no manifesto do
+        trabalho; vídeos já concluídos em execuções anteriores entram no ZIP
+        a partir do disco, sem nova busca ou renderização.
+
+        Com `combine`, em vez do ZIP é gerado um único PDF (PDFBookWriter), com
+        um capítulo por vídeo e um sumário; a memória usada continua a mesma
+        qualquer que seja o tamanho da playlist.
+
+        Args:
+            videos: Vídeos da playlist, na ordem da playlist
+            languages: Lista de códigos de idioma para as transcrições
+            zip_name: Nome do arquivo ZIP (ou do PDF, com combine) a ser criado no diretório de saída
+            progress_callback: Função chamada a cada vídeo concluído, recebendo
+                               o total concluído e o FetchResult do vídeo
+            render_workers: Número de processos de renderização (padrão: núcleos disponíveis)
+            export_format: Formato dos arquivos (pdf, txt, srt, vtt, json ou md)
+            output_dir: Diretório onde o ZIP é criado (padrão: diretório de saída)
+            max_workers: Número máximo de buscas de transcrição simultâneas
+            checkpoint: Manifesto do trabalho, para retomar exportações interrompidas
+            combine: Gera um único PDF com todos os vídeos (apenas no formato pdf)
+            title: Título do PDF combinado (em geral, o título da playlist)
+
+        Returns:
+            PlaylistExportResult com o caminho do ZIP ou PDF (None se nenhum
+            arquivo foi gerado) e os vídeos que ficaram de fora; se a leitura
+            da playlist falhar no meio, `error` descreve a falha e o arquivo
+            traz apenas os vídeos lidos até então
+
+        Raises:
+            ValueError: Se combine for pedido com um formato diferente de pdf
+        """
+        exporter = get_exporter(export_format)
+        if combine and export_format != "pdf":
+            raise ValueError("O documento único está disponível apenas no formato PDF")
+        result = PlaylistExportResult()
+
+        # Posição na playlist de cada vídeo enviado para busca, e vídeos já
+        # concluídos no checkpoint; ambos são preenchidos na thread que
+        # enumera a playlist
+        positions: List[int] = []
+        resumed: Deque[Tuple[int, Video]] = deque()
+        resumed_lock = threading.Lock()
+
+        def pending_videos() -> Iterator[Video]:
+            try:
+                for position, video in enumerate(videos):
+                    if checkpoint is not None and checkpoint.is_done(video.id):
+                        with resumed_lock:
+                            resumed.append((position, video))
+                        continue
+                    positions.append(position)
+                    yield video
+            except Exception as e:
+                # Os vídeos já lidos continuam sendo exportados; o resultado
+                # fica marcado como parcial e o checkpoint é mantido
+                result.error = f"A playlist não foi lida até o fim: {str(e)}"
+
+        def write_rendered(pool: RenderPool, writer: OutputWriter, wait_all: bool = False) -> None:
+            for index, video, data, error in pool.completed(wait_all=wait_all):
+                filename = exporter.get_filename(video)
+                if data:
+                    # No PDF combinado, o nome do membro é o título do capítulo
+                    writer.add(index, video.title if combine else filename, data)
+                    result.exported += 1
+                    if checkpoint is not None:
+                        checkpoint.record(video.id, PlaylistCheckpoint.STATUS_DONE, filename,
+                                          video.language_used, data)
+                else:
+                    writer.skip(index)
+                    result.failed.append(video.id)
+                    if checkpoint is not None:
+                        checkpoint.record(video.id, PlaylistCheckpoint.STATUS_FAILED, filename,
+                                          video.language_used, error=error)
+
+        def write_resumed(writer: OutputWriter, completed: int) -> int:
+            while True:
+                with resumed_lock:
+                    if not resumed:
+                        return completed
+                    position, video = resumed.popleft()
+
+                entry = checkpoint.entries[video.id]
+                data = checkpoint.read_artifact(video.id)
+                result.total += 1
+                completed += 1
+                if data:
+                    name = video.title if combine else entry.get("filename") or exporter.get_filename(video)
+                    writer.add(position, name, data)
+                    result.exported += 1
+                else:
+                    writer.skip(position)
+                    result.failed.append(video.id)
+
+                if progress_callback:
+                    video.language_used = entry.get("language")
+                    progress_callback(completed, FetchResult(index=position, item=video, value=video))
+
+        fetch_results = TranscriptService.iter_transcripts(
+            pending_videos(), languages, max_workers=max_workers
+        )
+
+        completed = 0
+        with ExportService._open_writer(zip_name, output_dir, combine, title) as writer, \
+                RenderPool(exporter, render_workers) as pool:
+            for fetch_result in fetch_results:
+                completed = write_resumed(writer, completed)
+                result.total += 1
+                completed += 1
+                position = positions[fetch_result.index]
+
+                if fetch_result.success:
+                    pool.submit(position, fetch_result.value)
+                    # Libera a transcrição no processo principal; o pool usa sua própria cópia
+                    fetch_result.value.transcript = None
+                else:
+                    writer.skip(position)
+                    video_id = fetch_result.item.id
+                    if fetch_result.error:
+                        result.failed.append(video_id)
+                        status = PlaylistCheckpoint.STATUS_FAILED
+                    else:
+                        result.missing.append(video_id)
+                        status = PlaylistCheckpoint.STATUS_MISSING
+                    if checkpoint is not None:
+                        checkpoint.record(video_id, status, error=fetch_result.error)
+
+                write_rendered(pool, writer)
+
+                if progress_callback:
+                    progress_callback(completed, fetch_result)
+
+            completed = write_resumed(writer, completed)
+            write_rendered(pool, writer, wait_all=True)
+
+            result.bytes_written = writer.bytes_written
+            zip_path = writer.path if combine else writer.zip_path
+
+        if result.exported:
+            result.zip_path = zip_path
+        elif os.path.exists(zip_path):
+            os.remove(zip_path)
+
+        return result
+
+    @staticmethod
+    def _open_writer(name: str, output_dir: Optional[str], combine: bool, title: str) -> "OutputWriter":
+        """Abre o destino dos arquivos: o ZIP ou, com combine, o PDF combinado."""
+        if not combine:
+            return FileService.open_zip_stream(name, output_dir)
+
+        # Importado aqui, como o PDFService: só carrega o fpdf quando necessário
+        from api.pdf_book import PDFBookWriter
+        if output_dir is None:
+            output_dir = FileService.create_output_dir()
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+        return PDFBookWriter(os.path.join(output_dir, name), title)
+
+    @staticmethod
+    def export_playlist_job(playlist_id: str, videos: Iterable[Video], languages: List[str],
+                            zip_name: str, export_format: str = "pdf",
+                            resume: Optional[bool] = None, **options) -> PlaylistExportResult:
+        """Exporta uma playlist registrando o progresso em um checkpoint.
+
+        Uma nova execução da mesma playlist, com os mesmos idiomas e formato,
+        reaproveita os vídeos concluídos e tenta de novo apenas os que
+        faltaram ou falharam. O checkpoint é apagado quando nenhum vídeo
+        falhou temporariamente e a playlist foi lida até o fim.
+
+        Args:
+            playlist_id: ID da playlist do YouTube
+            videos: Vídeos da playlist, na ordem da playlist
+            languages: Lista de códigos de idioma para as transcrições
+            zip_name: Nome do arquivo ZIP a ser criado
+            export_format: Formato dos arquivos (pdf, txt, srt, vtt, json ou md)
+            resume: Usa o checkpoint (padrão: TRANSCRIPTTUBE_RESUME_JOBS)
+            **options: Demais argumentos de export_playlist
+
+        Returns:
+            PlaylistExportResult com os vídeos desta e das execuções anteriores
+        """
+        if not (config.RESUME_JOBS if resume is None else resume):
+            return ExportService.export_playlist(videos, languages, zip_name,
+                                                 export_format=export_format, **options)
+
+        checkpoint = PlaylistCheckpoint.open(playlist_id, languages, export_format)
+        try:
+            result = ExportService.export_playlist(videos, languages, zip_name,
+                                                   export_format=export_format,
+                                                   checkpoint=checkpoint, **options)
+        finally:
+            checkpoint.close()
+
+        if not result.failed and result.error is None:
+            checkpoint.remove()
+        return result
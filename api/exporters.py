@@ -0,0 +1,431 @@
+# api/exporters.py
+"""
+Exportadores de transcrições para diferentes formatos.
+
+Os formatos de texto (TXT, SRT, WebVTT, JSON e Markdown) são gerados em
+streaming diretamente da lista de segmentos, sem carregar o fpdf. O PDF é
+delegado ao PDFService, importado apenas quando necessário.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import replace
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+from models.data_models import TranscriptSegments, Video
+from api.file_service import FileService
+from utils import config, metrics
+from utils.disk_cache import DiskCache
+
+
+class TranscriptExporter:
+    """Interface base dos exportadores de transcrição."""
+    format = ""
+    label = ""
+    extension = ""
+    mime = ""
+    # Formatos limitados pela CPU são renderizados no pool de processos
+    cpu_bound = False
+    # Versão do formato gerado; incremente ao mudar a saída para invalidar o cache
+    version = 1
+
+    def get_filename(self, video: Video) -> str:
+        """Retorna o nome do arquivo exportado para o vídeo."""
+        return FileService.safe_filename(video.title, self.extension)
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        """Produz o conteúdo exportado em partes, segmento a segmento."""
+        raise NotImplementedError
+
+    def write(self, video: Video, stream: BinaryIO) -> None:
+        """Grava a transcrição exportada em um stream binário.
+
+        Args:
+            video: Vídeo com a transcrição
+            stream: Destino dos bytes (arquivo, buffer ou membro de ZIP)
+        """
+        writer = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=True)
+        try:
+            for chunk in self.iter_chunks(video):
+                writer.write(chunk)
+            writer.flush()
+        finally:
+            # Não fecha o stream do chamador
+            writer.detach()
+
+    def render(self, video: Video) -> Optional[bytes]:
+        """Gera a transcrição exportada em memória.
+
+        Returns:
+            Conteúdo em bytes ou None se o vídeo não tiver transcrição
+        """
+        if not video.transcript:
+            return None
+        return "".join(self.iter_chunks(video)).encode("utf-8")
+
+
+def _clean_text(text: str) -> str:
+    """Junta as quebras de linha internas de um segmento em espaços."""
+    return " ".join(text.split())
+
+
+def _caption_text(text: str) -> str:
+    """Texto de um cue de legenda sem linhas em branco, que encerrariam o cue antes da hora."""
+    return "\n".join(line for line in text.strip().splitlines() if line.strip())
+
+
+def _format_timestamp(seconds: float, separator: str) -> str:
+    """Formata segundos como HH:MM:SS<sep>mmm (SRT usa vírgula, WebVTT usa ponto)."""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
+
+
+class TextExporter(TranscriptExporter):
+    format = "txt"
+    label = "Texto (TXT)"
+    extension = "txt"
+    mime = "text/plain"
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        for item in video.transcript:
+            yield _clean_text(item.text) + "\n"
+
+
+class SRTExporter(TranscriptExporter):
+    format = "srt"
+    label = "Legendas (SRT)"
+    extension = "srt"
+    mime = "application/x-subrip"
+    # 2: sem linhas em branco dentro das legendas
+    version = 2
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        for number, item in enumerate(video.transcript, start=1):
+            start = _format_timestamp(item.start, ",")
+            end = _format_timestamp(item.start + item.duration, ",")
+            yield f"{number}\n{start} --> {end}\n{_caption_text(item.text)}\n\n"
+
+
+class WebVTTExporter(TranscriptExporter):
+    format = "vtt"
+    label = "Legendas (WebVTT)"
+    extension = "vtt"
+    mime = "text/vtt"
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        yield "WEBVTT\n\n"
+        for item in video.transcript:
+            start = _format_timestamp(item.start, ".")
+            end = _format_timestamp(item.start + item.duration, ".")
+            yield f"{start} --> {end}\n{_caption_text(item.text)}\n\n"
+
+
+class JSONExporter(TranscriptExporter):
+    format = "json"
+    label = "JSON"
+    extension = "json"
+    mime = "application/json"
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        header = {"id": video.id, "title": video.title, "language": video.language_used}
+        if video.channel:
+            header["channel"] = video.channel
+        if video.duration is not None:
+            header["duration"] = video.duration
+        # Abre o objeto e deixa a lista de segmentos para ser escrita em streaming
+        yield json.dumps(header, ensure_ascii=False)[:-1] + ', "segments": ['
+        for number, item in enumerate(video.transcript):
+            segment = {"text": item.text, "start": item.start, "duration": item.duration}
+            yield ("," if number else "") + json.dumps(segment, ensure_ascii=False)
+        yield "]}\n"
+
+
+class MarkdownExporter(TranscriptExporter):
+    format = "md"
+    label = "Markdown"
+    extension = "md"
+    mime = "text/markdown"
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        yield f"# {video.title}\n\n"
+        yield f"- **Video ID:** {video.id}\n"
+        if video.channel:
+            yield f"- **Canal:** {video.channel}\n"
+        if video.duration is not None:
+            yield f"- **Duração:** {_format_timestamp(video.duration, '.')[:8]}\n"
+        if video.language_used:
+            yield f"- **Idioma:** {video.language_used}\n"
+        yield "\n"
+        for item in video.transcript:
+            seconds = int(item.start)
+            timestamp = _format_timestamp(seconds, ".")[:8]
+            link = f"https://www.youtube.com/watch?v={video.id}&t={seconds}s"
+            yield f"[{timestamp}]({link}) {_clean_text(item.text)}  \n"
+
+
+class PDFExporter(TranscriptExporter):
+    format = "pdf"
+    label = "PDF"
+    extension = "pdf"
+    mime = "application/pdf"
+    cpu_bound = True
+    # 2: fontes Unicode (TrueType) no lugar da Arial
+    version = 2
+
+    def iter_chunks(self, video: Video) -> Iterator[str]:
+        raise NotImplementedError("O PDF é binário; use render() ou write()")
+
+    def render(self, video: Video) -> Optional[bytes]:
+        # Importa o fpdf apenas quando um PDF é realmente pedido
+        from api.pdf_service import PDFService
+        return PDFService.render_pdf(video)
+
+    def write(self, video: Video, stream: BinaryIO) -> None:
+        data = self.render(video)
+        if data:
+            stream.write(data)
+
+
+EXPORTERS: Dict[str, TranscriptExporter] = {
+    exporter.format: exporter
+    for exporter in (
+        PDFExporter(),
+        TextExporter(),
+        SRTExporter(),
+        WebVTTExporter(),
+        JSONExporter(),
+        MarkdownExporter(),
+    )
+}
+
+
+def get_exporter(export_format: str) -> TranscriptExporter:
+    """Retorna o exportador do formato informado.
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    try:
+        return EXPORTERS[export_format]
+    except KeyError:
+        raise ValueError(f"Formato de exportação não suportado: {export_format}")
+
+
+def available_formats() -> List[str]:
+    """Retorna os formatos de exportação suportados."""
+    return list(EXPORTERS)
+
+
+_render_cache: Optional[DiskCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> Optional[DiskCache]:
+    """Retorna o cache persistente de arquivos renderizados (ou None se desativado)."""
+    global _render_cache
+    if not config.RENDER_CACHE_ENABLED:
+        return None
+
+    with _render_cache_lock:
+        if _render_cache is None:
+            path = os.path.join(FileService.create_cache_dir(), "renders.sqlite3")
+            _render_cache = DiskCache(path, max_bytes=config.RENDER_CACHE_MAX_MB * 1024 * 1024)
+        return _render_cache
+
+
+def render_cache_key(exporter: TranscriptExporter, video: Video) -> str:
+    """Monta a chave do cache de renderização.
+
+    Além do vídeo, idioma, formato e versão do exportador, inclui um hash do
+    título, canal, duração e segmentos, para que dados atualizados no YouTube
+    não devolvam um arquivo antigo.
+    """
+    transcript = video.transcript
+    if not isinstance(transcript, TranscriptSegments):
+        transcript = TranscriptSegments.from_items(transcript or [])
+
+    content = hashlib.sha1(f"{video.title}|{video.channel}|{video.duration}".encode("utf-8"))
+    content.update(transcript.starts.tobytes())
+    content.update(transcript.durations.tobytes())
+    content.update(transcript.full_text.encode("utf-8"))
+    return f"render:{exporter.format}:v{exporter.version}:{video.id}:{video.language_used}:{content.hexdigest()}"
+
+
+def _render(exporter: TranscriptExporter, video: Video) -> Optional[bytes]:
+    """Renderiza o vídeo registrando a duração da etapa nas métricas."""
+    with metrics.track_stage(f"export_{exporter.format}"):
+        return exporter.render(video)
+
+
+def _cached_render(cache: Optional[DiskCache], key: Optional[str]) -> Optional[bytes]:
+    """Consulta o cache de renderização e registra o resultado nas métricas."""
+    if cache is None or key is None:
+        return None
+    data = cache.get(key)
+    metrics.CACHE_REQUESTS.inc(kind="render", result="hit" if data is not None else "miss")
+    return data
+
+
+def render_cached(exporter: TranscriptExporter, video: Video) -> Optional[bytes]:
+    """Renderiza o vídeo, reaproveitando o resultado de uma renderização anterior.
+
+    Args:
+        exporter: Exportador do formato desejado
+        video: Vídeo com a transcrição
+
+    Returns:
+        Conteúdo em bytes ou None se o vídeo não tiver transcrição
+    """
+    if not video.transcript:
+        return None
+
+    cache = get_render_cache()
+    key = render_cache_key(exporter, video) if cache is not None else None
+    data = _cached_render(cache, key)
+    if data is None:
+        data = _render(exporter, video)
+        if data and cache is not None:
+            cache.set(key, data)
+    return data
+
+
+def _render_worker(export_format: str, video: Video) -> Tuple[Optional[bytes], Dict]:
+    """Função executada nos processos do pool de renderização.
+
+    Devolve também as métricas acumuladas no processo, que são somadas às do
+    processo principal.
+    """
+    try:
+        return _render(get_exporter(export_format), video), metrics.REGISTRY.drain()
+    except Exception:
+        metrics.REGISTRY.drain()
+        raise
+
+
+class RenderPool:
+    """Renderiza transcrições em paralelo em um pool de processos.
+
+    O fpdf é puro Python e limitado pela CPU, então a renderização de várias
+    transcrições só escala entre núcleos usando processos. O número de
+    renderizações pendentes é limitado para não acumular transcrições e
+    arquivos em memória. Formatos de texto, ou um único worker, são
+    renderizados no próprio processo.
+    """
+
+    def __init__(self, exporter: TranscriptExporter, max_workers: Optional[int] = None):
+        self.exporter = exporter
+        self.max_workers = (max_workers or RenderPool.available_workers()) if exporter.cpu_bound else 1
+        self.max_pending = self.max_workers * 2
+        self._executor = None
+        self._cache = get_render_cache()
+        self._pending: Dict[Future, Tuple[int, Video, Optional[str]]] = {}
+        self._done: Deque[Tuple[int, Video, Optional[bytes], Optional[str]]] = deque()
+
+        if self.max_workers > 1:
+            # forkserver evita copiar threads e locks do processo principal (Streamlit, pool de buscas)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    @staticmethod
+    def available_workers() -> int:
+        """Retorna o número de processos de renderização a usar."""
+        if config.RENDER_WORKERS > 0:
+            return config.RENDER_WORKERS
+        if hasattr(os, "sched_getaffinity"):
+            return max(1, len(os.sched_getaffinity(0)))
+        return max(1, os.cpu_count() or 1)
+
+    def __enter__(self) -> "RenderPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _collect(self, futures) -> None:
+        for future in futures:
+            index, video, key = self._pending.pop(future)
+            try:
+                data, samples = future.result()
+                metrics.REGISTRY.merge(samples)
+                if data and key is not None:
+                    self._cache.set(key, data)
+                self._done.append((index, video, data, None))
+            except Exception as e:
+                metrics.FAILURES.inc(stage=f"export_{self.exporter.format}", kind=type(e).__name__)
+                print(f"Erro ao renderizar {self.exporter.format.upper()} do vídeo {video.id}: {str(e)}")
+                self._done.append((index, video, None, str(e)))
+
+    def submit(self, index: int, video: Video) -> None:
+        """Envia um vídeo para renderização.
+
+        Bloqueia enquanto houver renderizações pendentes demais.
+
+        Vídeos já renderizados antes (mesmo conteúdo, formato e versão) saem
+        do cache, sem ocupar o pool.
+
+        Args:
+            index: Posição do vídeo na playlist
+            video: Vídeo com a transcrição
+        """
+        key = render_cache_key(self.exporter, video) if self._cache is not None and video.transcript else None
+        data = _cached_render(self._cache, key)
+        if data is not None:
+            self._done.append((index, video, data, None))
+            return
+
+        if self._executor is None:
+            try:
+                data = _render(self.exporter, video)
+                if data and key is not None:
+                    self._cache.set(key, data)
+                self._done.append((index, video, data, None))
+            except Exception as e:
+                metrics.FAILURES.inc(stage=f"export_{self.exporter.format}", kind=type(e).__name__)
+                print(f"Erro ao renderizar {self.exporter.format.upper()} do vídeo {video.id}: {str(e)}")
+                self._done.append((index, video, None, str(e)))
+            return
+
+        while len(self._pending) >= self.max_pending:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+
+        # Envia uma cópia para que o chamador possa liberar a transcrição do original
+        future = self._executor.submit(_render_worker, self.exporter.format, replace(video))
+        self._pending[future] = (index, video, key)
+
+    def completed(self, wait_all: bool = False) -> Iterator[Tuple[int, Video, Optional[bytes], Optional[str]]]:
+        """Produz as renderizações concluídas até o momento.
+
+        Args:
+            wait_all: Se True, aguarda todas as renderizações pendentes
+
+        Yields:
+            Tuplas (índice, vídeo, bytes gerados ou None, erro ou None)
+        """
+        if wait_all and self._pending:
+            done, _ = wait(self._pending)
+        else:
+            done = [future for future in self._pending if future.done()]
+        self._collect(done)
+
+        while self._done:
+            yield self._done.popleft()
+
+    def close(self) -> None:
+        """Encerra o pool de processos."""
+        if self._executor is not None:
+            # Renderizações que ainda não começaram não são mais necessárias
+            # (cancel_futures do shutdown só existe a partir do Python 3.9)
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,7 +1,513 @@
 # api/file_service.py
+import hashlib
 import os
-import zipfile
-from typing import List
+import re
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from models.data_models import Artifact
+from utils import config, metrics
+
+
+class ZipStreamWriter:
+    """Escreve membros em um ZIP à medida que ficam prontos, sem arquivos temporários.
+
+    Os membros são identificados pela posição na playlist e gravados nessa
+    ordem. Membros que chegam fora de ordem ficam em um buffer limitado a
+    `max_buffer_bytes`; se o limite for ultrapassado, os mais antigos são
+    gravados imediatamente, de modo que a memória usada nunca passe do limite
+    (mais o maior membro individual).
+
+    Com compressão, cada membro é comprimido em um pool de threads assim que
+    chega (o zlib libera o GIL), e a gravação em ordem só espera pelo membro
+    seguinte. No modo "auto", uma amostra de cada membro é comprimida antes,
+    e os que quase não diminuem (como PDFs, cujo conteúdo já é comprimido)
+    são gravados sem compressão.
+
+    O arquivo é montado aqui mesmo (cabeçalhos locais, diretório central e,
+    quando necessário, os registros ZIP64), pois o zipfile só grava membros
+    comprimindo na thread que chama. Nomes repetidos recebem a posição do
+    vídeo na playlist como sufixo, decidido em `add`.
+    """
+
+    # Métodos de compressão do formato ZIP
+    STORED = 0
+    DEFLATED = 8
+    # Campos de 32 bits com este valor têm o valor real no registro ZIP64
+    ZIP64_LIMIT = 0xFFFFFFFF
+    ZIP64_COUNT_LIMIT = 0xFFFF
+    # Bit 11 das flags: nome do membro em UTF-8
+    UTF8_FLAG = 0x800
+
+    # No modo auto, membros cuja amostra diminui menos que isto não são comprimidos
+    AUTO_MIN_SAVING = 0.2
+    # Tamanho da amostra comprimida no modo auto, tirada do meio do membro
+    AUTO_SAMPLE_BYTES = 8 * 1024
+
+    def __init__(self, zip_path: str, max_buffer_bytes: Optional[int] = None,
+                 compression: Optional[str] = None, level: Optional[int] = None,
+                 workers: Optional[int] = None):
+        """Cria o arquivo ZIP.
+
+        Args:
+            zip_path: Caminho do arquivo ZIP
+            max_buffer_bytes: Memória máxima para reordenar os membros (padrão: TRANSCRIPTTUBE_ZIP_BUFFER_MB)
+            compression: "stored", "deflate" ou "auto" (padrão: TRANSCRIPTTUBE_ZIP_COMPRESSION)
+            level: Nível do deflate, de 1 a 9 (padrão: TRANSCRIPTTUBE_ZIP_COMPRESSION_LEVEL)
+            workers: Threads de compressão (padrão: TRANSCRIPTTUBE_ZIP_COMPRESSION_WORKERS)
+
+        Raises:
+            ValueError: Se o modo de compressão for desconhecido
+        """
+        self.zip_path = zip_path
+        self.max_buffer_bytes = (config.ZIP_BUFFER_MB * 1024 * 1024
+                                 if max_buffer_bytes is None else max_buffer_bytes)
+        self.compression = compression or config.ZIP_COMPRESSION
+        if self.compression not in ("stored", "deflate", "auto"):
+            raise ValueError(f"Compressão de ZIP desconhecida: {self.compression}")
+        self.level = config.ZIP_COMPRESSION_LEVEL if level is None else level
+        self.member_count = 0
+        self.bytes_written = 0
+        # Bytes gravados no ZIP depois da compressão
+        self.compressed_bytes = 0
+        self._fp = open(zip_path, "wb")
+        # Registros do diretório central de cada membro gravado
+        self._entries: List[bytes] = []
+        # Nome reservado -> posição na playlist do membro que o usa
+        self._names: Dict[str, int] = {}
+        self._pending: Dict[int, Optional[Tuple[str, int, Future]]] = {}
+        self._pending_bytes = 0
+        self._next_index = 0
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.compression != "stored":
+            workers = config.ZIP_COMPRESSION_WORKERS if workers is None else workers
+            self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                                thread_name_prefix="zip-compress")
+
+    def __enter__(self) -> "ZipStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _reserve_name(self, index: int, name: str) -> str:
+        """Reserva o nome do membro na posição `index`, evitando repetições no ZIP.
+
+        O nome sem sufixo fica com o vídeo de menor posição; os demais
+        vídeos com o mesmo título recebem a própria posição (a partir de 1)
+        como sufixo. Assim o nome de cada vídeo não depende da ordem em que as
+        transcrições ficam prontas, exceto se o membro que tinha o nome já
+        tiver sido gravado fora de ordem por falta de buffer.
+        """
+        holder = self._names.get(name)
+        if holder is None:
+            self._names[name] = index
+            return name
+
+        pending = self._pending.get(holder)
+        if holder > index and pending is not None:
+            # O nome passa para este vídeo; o que o tinha ainda não foi gravado
+            self._pending[holder] = (self._suffixed(holder, name),) + pending[1:]
+            self._names[name] = index
+            return name
+        return self._suffixed(index, name)
+
+    def _suffixed(self, index: int, name: str) -> str:
+        base, ext = os.path.splitext(name)
+        candidate = f"{base} ({index + 1}){ext}"
+        counter = 2
+        while candidate in self._names:
+            candidate = f"{base} ({index + 1}-{counter}){ext}"
+            counter += 1
+        self._names[candidate] = index
+        return candidate
+
+    def _worth_compressing(self, data: bytes) -> bool:
+        """Comprime uma amostra do membro para estimar o ganho do deflate."""
+        start = max(0, len(data) // 2 - self.AUTO_SAMPLE_BYTES // 2)
+        sample = data[start:start + self.AUTO_SAMPLE_BYTES]
+        if not sample:
+            return False
+        return len(zlib.compress(sample, 1)) < len(sample) * (1 - self.AUTO_MIN_SAVING)
+
+    def _compress(self, data: bytes) -> Tuple[int, int, int, bytes]:
+        """Prepara um membro para gravação (executado nas threads de compressão).
+
+        Returns:
+            Tupla (método de compressão, CRC-32, tamanho original, conteúdo gravado)
+        """
+        crc = zlib.crc32(data)
+        if self.compression == "stored" or (self.compression == "auto" and not self._worth_compressing(data)):
+            return self.STORED, crc, len(data), data
+
+        with metrics.track_stage("zip_compress"):
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+        if len(payload) >= len(data):
+            return self.STORED, crc, len(data), data
+        return self.DEFLATED, crc, len(data), payload
+
+    @staticmethod
+    def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+        """Converte o instante para a data e a hora do MS-DOS usadas no ZIP."""
+        t = time.localtime(timestamp)
+        year = min(max(t.tm_year, 1980), 2107)
+        date = (year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday
+        dos_time = t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+        return date, dos_time
+
+    def _write(self, name: str, member: Future) -> None:
+        """Grava um membro já comprimido no ZIP.
+
+        O cabeçalho local usa o CRC e os tamanhos calculados na thread de
+        compressão; o registro do diretório central fica em memória até `close`.
+        """
+        compress_type, crc, size, payload = member.result()
+        with metrics.track_stage("zip_write"):
+            offset = self._fp.tell()
+            filename = name.encode("utf-8")
+            flags = self.UTF8_FLAG if not name.isascii() else 0
+            date, dos_time = self._dos_datetime(time.time())
+
+            zip64 = size >= self.ZIP64_LIMIT or len(payload) >= self.ZIP64_LIMIT
+            if zip64:
+                extra = struct.pack("<HHQQ", 0x0001, 16, size, len(payload))
+                header_sizes = (self.ZIP64_LIMIT, self.ZIP64_LIMIT)
+            else:
+                extra = b""
+                header_sizes = (len(payload), size)
+            version = 45 if zip64 else 20
+            self._fp.write(struct.pack(
+                "<IHHHHHIIIHH", 0x04034B50, version, flags, compress_type, dos_time, date,
+                crc, header_sizes[0], header_sizes[1], len(filename), len(extra)
+            ) + filename + extra)
+            self._fp.write(payload)
+
+            # No diretório central, o registro ZIP64 traz só os campos que estouram
+            central_extra = [value for value in (size, len(payload), offset) if value >= self.ZIP64_LIMIT]
+            if central_extra:
+                extra = struct.pack(f"<HH{len(central_extra)}Q", 0x0001, 8 * len(central_extra), *central_extra)
+                version = 45
+            else:
+                extra = b""
+            self._entries.append(struct.pack(
+                "<IBBHHHHHIIIHHHHHII", 0x02014B50, version, 3, version, flags, compress_type,
+                dos_time, date, crc,
+                min(len(payload), self.ZIP64_LIMIT), min(size, self.ZIP64_LIMIT),
+                len(filename), len(extra), 0, 0, 0, 0o600 << 16, min(offset, self.ZIP64_LIMIT)
+            ) + filename + extra)
+
+        self.member_count += 1
+        self.bytes_written += size
+        self.compressed_bytes += len(payload)
+        metrics.BYTES_WRITTEN.inc(size, kind="zip")
+
+    def _write_central_directory(self) -> None:
+        """Grava o diretório central e o registro de fim do arquivo."""
+        start = self._fp.tell()
+        for entry in self._entries:
+            self._fp.write(entry)
+        end = self._fp.tell()
+        count = len(self._entries)
+        size = end - start
+
+        if count >= self.ZIP64_COUNT_LIMIT or size >= self.ZIP64_LIMIT or start >= self.ZIP64_LIMIT:
+            self._fp.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, size, start))
+            self._fp.write(struct.pack("<IIQI", 0x07064B50, 0, end, 1))
+        self._fp.write(struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0,
+            min(count, self.ZIP64_COUNT_LIMIT), min(count, self.ZIP64_COUNT_LIMIT),
+            min(size, self.ZIP64_LIMIT), min(start, self.ZIP64_LIMIT), 0
+        ))
+
+    def _flush_ready(self, wait: bool = False) -> None:
+        """Grava os membros pendentes que já estão na sequência correta.
+
+        Args:
+            wait: Espera a compressão dos membros seguintes em vez de parar
+                  no primeiro que ainda não terminou
+        """
+        while self._next_index in self._pending:
+            member = self._pending[self._next_index]
+            if member is not None and not wait and not member[2].done():
+                return
+            del self._pending[self._next_index]
+            self._next_index += 1
+            if member is not None:
+                name, size, future = member
+                self._pending_bytes -= size
+                self._write(name, future)
+
+    def _flush_overflow(self) -> None:
+        """Grava membros quando o buffer passa do limite.
+
+        Primeiro espera os membros que já estão na sequência; se ainda faltar
+        um anterior, grava os mais antigos fora de ordem.
+        """
+        while self._pending_bytes > self.max_buffer_bytes:
+            if self._next_index in self._pending:
+                self._flush_ready(wait=True)
+                continue
+            index = min(i for i, member in self._pending.items() if member is not None)
+            name, size, future = self._pending[index]
+            # Mantém a posição reservada para que a sequência continue avançando
+            self._pending[index] = None
+            self._pending_bytes -= size
+            self._write(name, future)
+
+    def add(self, index: int, name: str, data: bytes) -> None:
+        """Adiciona um membro ao ZIP.
+
+        Args:
+            index: Posição do item na playlist
+            name: Nome do arquivo dentro do ZIP
+            data: Conteúdo do arquivo
+        """
+        name = self._reserve_name(index, name)
+        if self._executor is not None:
+            future = self._executor.submit(self._compress, data)
+        else:
+            future = Future()
+            future.set_result(self._compress(data))
+        self._pending[index] = (name, len(data), future)
+        self._pending_bytes += len(data)
+        self._flush_ready()
+        self._flush_overflow()
+
+    def skip(self, index: int) -> None:
+        """Marca uma posição como sem arquivo (vídeo sem transcrição)."""
+        self._pending[index] = None
+        self._flush_ready()
+
+    def close(self) -> None:
+        """Grava os membros restantes e fecha o arquivo ZIP."""
+        if self._fp is None:
+            return
+        try:
+            for index in sorted(self._pending):
+                member = self._pending[index]
+                if member is not None:
+                    self._write(member[0], member[2])
+        finally:
+            # Após um erro, as compressões que ainda não começaram não são mais
+            # necessárias (cancel_futures do shutdown só existe a partir do Python 3.9)
+            for member in self._pending.values():
+                if member is not None:
+                    member[2].cancel()
+            self._pending.clear()
+            self._pending_bytes = 0
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            try:
+                self._write_central_directory()
+            finally:
+                self._fp.close()
+                self._fp = None
+
+
+class ArtifactStore:
+    """Armazena os arquivos gerados pelo hash SHA-256 do conteúdo.
+
+    Cada arquivo fica em `objects/<2 primeiros caracteres>/<hash><extensão>`,
+    então pedidos diferentes nunca sobrescrevem o arquivo um do outro e
+    conteúdos idênticos são guardados uma única vez. Um índice em SQLite
+    registra o tamanho, o último acesso e quantos trabalhos usam cada arquivo.
+
+    Quando o total passa de `max_bytes`, os arquivos menos usados recentemente
+    são removidos, começando pelos que nenhum trabalho usa e não foram
+    marcados para manter. `sweep()` remove também arquivos órfãos (sem
+    registro no índice) e arquivos sem uso mais antigos que `max_idle`.
+    """
+
+    # Arquivos sem registro mais novos que isto podem estar sendo gravados
+    ORPHAN_GRACE = 3600
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None, max_idle: Optional[float] = None):
+        """Abre (ou cria) o armazenamento no diretório informado.
+
+        Args:
+            directory: Diretório dos arquivos e do índice
+            max_bytes: Espaço máximo ocupado (None = ilimitado)
+            max_idle: Tempo sem acesso após o qual arquivos sem uso são removidos (None = nunca)
+        """
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        self.max_bytes = max_bytes
+        self.max_idle = max_idle
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), timeout=30,
+                                     check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "digest TEXT PRIMARY KEY, "
+                "path TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "refs INTEGER NOT NULL DEFAULT 0, "
+                "kept INTEGER NOT NULL DEFAULT 0, "
+                "accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_accessed ON artifacts (accessed_at)")
+            self._conn.commit()
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def put(self, source_path: str) -> Artifact:
+        """Move um arquivo gerado para o armazenamento e registra um uso.
+
+        Args:
+            source_path: Arquivo a ser guardado; é movido (ou removido, se o
+                mesmo conteúdo já estiver armazenado)
+
+        Returns:
+            Artifact com o caminho definitivo do arquivo
+        """
+        digest = self._hash_file(source_path)
+        size = os.path.getsize(source_path)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM artifacts WHERE digest = ?", (digest,)).fetchone()
+            if row is not None and os.path.exists(row[0]):
+                path = row[0]
+                os.remove(source_path)
+                self._conn.execute(
+                    "UPDATE artifacts SET refs = refs + 1, accessed_at = ? WHERE digest = ?", (now, digest)
+                )
+            else:
+                ext = os.path.splitext(source_path)[1]
+                path = os.path.join(self.objects_dir, digest[:2], digest + ext)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                shutil.move(source_path, path)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO artifacts (digest, path, size, refs, kept, accessed_at) "
+                    "VALUES (?, ?, ?, 1, 0, ?)",
+                    (digest, path, size, now)
+                )
+            self._evict(exclude=digest)
+            self._conn.commit()
+
+        metrics.BYTES_WRITTEN.inc(size, kind="artifact")
+        return self.get(digest)
+
+    def get(self, digest: str) -> Optional[Artifact]:
+        """Retorna o registro do arquivo ou None se não estiver armazenado."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, path, size, refs, kept, accessed_at FROM artifacts WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Artifact(digest=row[0], path=row[1], size=row[2], refs=row[3], kept=bool(row[4]),
+                        accessed_at=row[5])
+
+    def touch(self, digest: str) -> None:
+        """Registra um acesso ao arquivo (usado na ordem de remoção LRU)."""
+        with self._lock:
+            self._conn.execute("UPDATE artifacts SET accessed_at = ? WHERE digest = ?", (time.time(), digest))
+            self._conn.commit()
+
+    def keep(self, digest: str) -> None:
+        """Marca o arquivo para não ser removido por falta de uso (apenas pela cota)."""
+        with self._lock:
+            self._conn.execute("UPDATE artifacts SET kept = 1 WHERE digest = ?", (digest,))
+            self._conn.commit()
+
+    def release(self, digest: str) -> None:
+        """Registra que um trabalho deixou de usar o arquivo."""
+        with self._lock:
+            self._conn.execute("UPDATE artifacts SET refs = MAX(refs - 1, 0) WHERE digest = ?", (digest,))
+            self._conn.commit()
+
+    def total_size(self) -> int:
+        """Retorna o espaço ocupado pelos arquivos registrados, em bytes."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+
+    def _delete(self, digest: str, path: str) -> None:
+        self._conn.execute("DELETE FROM artifacts WHERE digest = ?", (digest,))
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Erro ao remover arquivo {path}: {str(e)}")
+
+    def _evict(self, exclude: Optional[str] = None) -> int:
+        """Remove os arquivos menos usados recentemente até caber na cota."""
+        if self.max_bytes is None:
+            return 0
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        # Primeiro os arquivos sem uso e não mantidos; depois os demais
+        rows = self._conn.execute(
+            "SELECT digest, path, size FROM artifacts "
+            "ORDER BY (refs > 0 OR kept) ASC, accessed_at ASC"
+        ).fetchall()
+        removed = 0
+        for digest, path, size in rows:
+            if total <= self.max_bytes:
+                break
+            if digest == exclude:
+                continue
+            self._delete(digest, path)
+            total -= size
+            removed += 1
+        return removed
+
+    def sweep(self) -> int:
+        """Remove registros sem arquivo, arquivos órfãos e arquivos sem uso antigos.
+
+        Returns:
+            Quantidade de arquivos e registros removidos
+        """
+        now = time.time()
+        removed = 0
+        with self._lock:
+            rows = self._conn.execute("SELECT digest, path, refs, kept, accessed_at FROM artifacts").fetchall()
+            known = set()
+            for digest, path, refs, kept, accessed_at in rows:
+                expired = (self.max_idle is not None and not refs and not kept
+                           and accessed_at < now - self.max_idle)
+                if expired or not os.path.exists(path):
+                    self._delete(digest, path)
+                    removed += 1
+                else:
+                    known.add(os.path.abspath(path))
+            removed += self._evict()
+            self._conn.commit()
+
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                path = os.path.abspath(os.path.join(root, name))
+                if path in known:
+                    continue
+                try:
+                    if os.path.getmtime(path) < now - self.ORPHAN_GRACE:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
 
 
 class FileService:
@@ -29,6 +535,87 @@ class FileService:
 
         return output_dir
 
+    @staticmethod
+    def safe_filename(title: str, extension: str) -> str:
+        """Monta um nome de arquivo seguro a partir de um título.
+
+        Args:
+            title: Título do vídeo ou playlist
+            extension: Extensão do arquivo, sem o ponto
+
+        Returns:
+            Nome de arquivo sem caracteres inválidos
+        """
+        # Sanitiza o título para usar como nome de arquivo
+        safe_title = re.sub(r'[\\/*?:"<>|]', "", title)
+        safe_title = safe_title[:100]  # Limita o tamanho do título
+        return f"{safe_title}.{extension}"
+
+    @staticmethod
+    def create_cache_dir() -> str:
+        """Cria e retorna o diretório dos caches persistentes.
+
+        Usa TRANSCRIPTTUBE_CACHE_DIR se definido; caso contrário, um
+        subdiretório .cache dentro do diretório de saída, de modo que o cache
+        fique no mesmo volume dos downloads.
+
+        Returns:
+            Caminho do diretório de cache
+        """
+        cache_dir = config.CACHE_DIR or os.path.join(FileService.create_output_dir(), ".cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
+    @staticmethod
+    def create_jobs_dir() -> str:
+        """Cria e retorna o diretório dos checkpoints de exportação de playlists.
+
+        Usa TRANSCRIPTTUBE_JOBS_DIR se definido; caso contrário, um
+        subdiretório .jobs dentro do diretório de saída.
+
+        Returns:
+            Caminho do diretório de trabalhos
+        """
+        jobs_dir = config.JOBS_DIR or os.path.join(FileService.create_output_dir(), ".jobs")
+        os.makedirs(jobs_dir, exist_ok=True)
+        return jobs_dir
+
+    _artifact_store: Optional[ArtifactStore] = None
+    _artifact_lock = threading.Lock()
+
+    @staticmethod
+    def get_artifact_store() -> ArtifactStore:
+        """Retorna o armazenamento dos arquivos gerados, criado sob demanda.
+
+        Usa TRANSCRIPTTUBE_ARTIFACTS_DIR se definido; caso contrário, um
+        subdiretório .artifacts dentro do diretório de saída. Na criação
+        inicia a limpeza periódica em segundo plano.
+
+        Returns:
+            ArtifactStore compartilhado pelo processo
+        """
+        with FileService._artifact_lock:
+            if FileService._artifact_store is None:
+                directory = config.ARTIFACTS_DIR or os.path.join(FileService.create_output_dir(), ".artifacts")
+                store = ArtifactStore(directory, max_bytes=config.ARTIFACT_QUOTA_MB * 1024 * 1024,
+                                      max_idle=config.JOB_RETENTION)
+                if config.ARTIFACT_SWEEP_INTERVAL > 0:
+                    thread = threading.Thread(target=FileService._sweep_loop, args=(store,),
+                                              name="artifact-sweep", daemon=True)
+                    thread.start()
+                FileService._artifact_store = store
+            return FileService._artifact_store
+
+    @staticmethod
+    def _sweep_loop(store: ArtifactStore) -> None:
+        """Executa a limpeza do armazenamento periodicamente."""
+        while True:
+            try:
+                store.sweep()
+            except Exception as e:
+                print(f"Erro na limpeza dos arquivos gerados: {str(e)}")
+            time.sleep(config.ARTIFACT_SWEEP_INTERVAL)
+
     @staticmethod
     def create_zip(files: List[str], zip_name: str) -> str:
         """Cria um arquivo ZIP contendo vários arquivos.
@@ -46,13 +633,32 @@ class FileService:
         # Caminho completo para o arquivo ZIP
         zip_path = os.path.join(output_dir, zip_name)
 
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            for file in files:
-                # Adiciona apenas o nome do arquivo no ZIP, não o caminho completo
-                zipf.write(file, os.path.basename(file))
+        # Comprime os arquivos em paralelo, com a compressão de TRANSCRIPTTUBE_ZIP_COMPRESSION
+        with metrics.track_stage("zip_build"), ZipStreamWriter(zip_path) as writer:
+            for index, file in enumerate(files):
+                with open(file, "rb") as f:
+                    # Adiciona apenas o nome do arquivo no ZIP, não o caminho completo
+                    writer.add(index, os.path.basename(file), f.read())
 
         return zip_path
 
+    @staticmethod
+    def open_zip_stream(zip_name: str, output_dir: Optional[str] = None) -> ZipStreamWriter:
+        """Abre um ZIP no diretório de saída para receber membros em memória.
+
+        Args:
+            zip_name: Nome do arquivo ZIP a ser criado
+            output_dir: Diretório de destino (padrão: diretório de saída da aplicação)
+
+        Returns:
+            ZipStreamWriter pronto para receber os arquivos
+        """
+        if output_dir is None:
+            output_dir = FileService.create_output_dir()
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+        return ZipStreamWriter(os.path.join(output_dir, zip_name))
+
     @staticmethod
     def cleanup_files(files: List[str]) -> None:
         """Remove arquivos temporários.
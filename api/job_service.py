@@ -0,0 +1,403 @@
+# api/job_service.py
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from models.data_models import Job
+from api.youtube_service import YouTubeService
+from api.transcript_service import TranscriptService
+from api.export_service import ExportService
+from api.exporters import get_exporter, render_cached
+from api.file_service import FileService
+from utils import config
+from utils.url_utils import extract_video_id
+
+# Nome dos diretórios temporários dos trabalhos (ID em hexadecimal)
+_JOB_DIR_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class JobStore:
+    """Armazena o estado dos trabalhos em SQLite.
+
+    Cada trabalho é guardado como JSON, de modo que qualquer sessão do
+    Streamlit (ou outro processo) consiga consultar o status e o progresso
+    apenas pelo ID.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, "
+                "status TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at)")
+            self._conn.commit()
+
+    def save(self, job: Job) -> None:
+        """Grava o estado atual do trabalho."""
+        job.updated_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, status, data, updated_at) VALUES (?, ?, ?, ?)",
+                (job.id, job.status, json.dumps(asdict(job), ensure_ascii=False), job.updated_at)
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Retorna o trabalho ou None se não existir."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return Job(**json.loads(row[0]))
+
+    def update(self, job_id: str, **fields) -> Optional[Job]:
+        """Altera campos do trabalho e grava o resultado."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        for name, value in fields.items():
+            setattr(job, name, value)
+        self.save(job)
+        return job
+
+    def list_by_status(self, statuses: List[str]) -> List[Job]:
+        """Retorna os trabalhos com algum dos status informados."""
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM jobs WHERE status IN ({placeholders})", statuses
+            ).fetchall()
+        return [Job(**json.loads(row[0])) for row in rows]
+
+    def list_older_than(self, timestamp: float) -> List[Job]:
+        """Retorna os trabalhos sem atualização desde o instante informado."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE updated_at < ?", (timestamp,)
+            ).fetchall()
+        return [Job(**json.loads(row[0])) for row in rows]
+
+    def delete(self, job_id: str) -> None:
+        """Remove o trabalho do armazenamento."""
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._conn.commit()
+
+
+class JobService:
+    """Fila de trabalhos de exportação executados fora da thread do Streamlit.
+
+    Os trabalhos são executados por um pool de threads compartilhado por todas
+    as sessões do processo. A interface apenas envia o trabalho e consulta o
+    JobStore, então recarregar a página ou interagir com os widgets não
+    interrompe o processamento. Pedidos idênticos enviados enquanto um
+    trabalho equivalente está em andamento recebem esse mesmo trabalho.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    _store: Optional[JobStore] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+
+    # Trabalho em andamento para cada combinação de URL, idiomas e formato
+    _active: Dict[Tuple, str] = {}
+
+    # Trabalhos compartilhados em que outra sessão pediu para manter os arquivos
+    _keep_requested: Set[str] = set()
+
+    @staticmethod
+    def get_store() -> JobStore:
+        """Retorna o armazenamento de trabalhos, criado sob demanda.
+
+        Trabalhos que estavam na fila ou em execução quando o processo anterior
+        terminou são marcados como falhos; o checkpoint das playlists permite
+        retomá-los enviando a mesma URL de novo.
+        """
+        with JobService._lock:
+            if JobService._store is None:
+                store = JobStore(os.path.join(FileService.create_jobs_dir(), "jobs.sqlite3"))
+                for job in store.list_by_status([JobService.STATUS_QUEUED, JobService.STATUS_RUNNING]):
+                    store.update(job.id, status=JobService.STATUS_FAILED,
+                                 error="Processamento interrompido pela reinicialização do servidor")
+                JobService._store = store
+            return JobService._store
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        with JobService._lock:
+            if JobService._executor is None:
+                JobService._executor = ThreadPoolExecutor(
+                    max_workers=max(1, config.JOB_WORKERS), thread_name_prefix="transcripttube-job"
+                )
+            return JobService._executor
+
+    @staticmethod
+    def submit(url: str, languages: List[str], export_format: str = "pdf",
+               keep_files: bool = False, combine: bool = False) -> Job:
+        """Coloca a exportação de um vídeo ou playlist na fila.
+
+        Args:
+            url: URL do vídeo ou playlist do YouTube
+            languages: Lista de códigos de idioma por ordem de preferência
+            export_format: Formato dos arquivos gerados
+            keep_files: Mantém os arquivos gerados após o prazo de retenção
+            combine: Exporta a playlist em um único PDF em vez de um ZIP
+
+        Returns:
+            Job criado, com status "queued", ou o trabalho idêntico já em andamento
+
+        Raises:
+            ValueError: Se a URL ou o formato forem inválidos
+        """
+        get_exporter(export_format)
+        if combine and export_format != "pdf":
+            raise ValueError("O documento único está disponível apenas no formato PDF")
+        extracted = extract_video_id(url)
+        if not extracted:
+            raise ValueError("URL inválida. Por favor, verifique e tente novamente.")
+
+        if isinstance(extracted, tuple) and extracted[1] == 'playlist':
+            kind, target_id = "playlist", extracted[0]
+        else:
+            kind, target_id = "video", extracted
+            # Um vídeo avulso já é um único documento
+            combine = False
+
+        JobService.prune()
+
+        store = JobService.get_store()
+        key = (kind, target_id, tuple(languages), export_format, combine)
+        with JobService._lock:
+            active_id = JobService._active.get(key)
+            active = store.get(active_id) if active_id else None
+            if active is not None and not active.finished:
+                if keep_files:
+                    # Aplicado ao final; o worker regrava o trabalho a cada progresso
+                    JobService._keep_requested.add(active_id)
+                    active.keep_files = True
+                return active
+
+            job = Job(
+                id=uuid.uuid4().hex,
+                url=url,
+                kind=kind,
+                target_id=target_id,
+                languages=list(languages),
+                export_format=export_format,
+                keep_files=keep_files,
+                combine=combine,
+                message="Aguardando na fila...",
+                created_at=time.time()
+            )
+            store.save(job)
+            JobService._active[key] = job.id
+
+        JobService._get_executor().submit(JobService._run, job.id, key)
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> Optional[Job]:
+        """Retorna o estado atual de um trabalho."""
+        return JobService.get_store().get(job_id)
+
+    @staticmethod
+    def result_dir(job: Job) -> str:
+        """Retorna o diretório de trabalho usado enquanto os arquivos são gerados."""
+        return os.path.join(FileService.create_output_dir(), job.id)
+
+    @staticmethod
+    def _run(job_id: str, key: Tuple) -> None:
+        """Executa um trabalho em uma thread do pool."""
+        try:
+            JobService._execute(job_id)
+        finally:
+            with JobService._lock:
+                if JobService._active.get(key) == job_id:
+                    del JobService._active[key]
+
+    @staticmethod
+    def _execute(job_id: str) -> None:
+        """Marca o trabalho como em execução e processa o vídeo ou a playlist."""
+        store = JobService.get_store()
+        job = store.update(job_id, status=JobService.STATUS_RUNNING, message="Processando...")
+        if job is None:
+            return
+
+        try:
+            os.makedirs(JobService.result_dir(job), exist_ok=True)
+            if job.kind == "playlist":
+                JobService._run_playlist(job)
+            else:
+                JobService._run_video(job)
+        except Exception as e:
+            print(f"Erro ao processar o trabalho {job.id}: {str(e)}")
+            job.status = JobService.STATUS_FAILED
+            job.error = str(e)
+
+        if job.status == JobService.STATUS_RUNNING:
+            job.status = JobService.STATUS_DONE
+        job.progress = 1.0
+        with JobService._lock:
+            if job.id in JobService._keep_requested:
+                JobService._keep_requested.discard(job.id)
+                job.keep_files = True
+
+        try:
+            JobService._store_result(job)
+        except OSError as e:
+            print(f"Erro ao guardar o arquivo do trabalho {job.id}: {str(e)}")
+            job.status = JobService.STATUS_FAILED
+            job.error = str(e)
+        store.save(job)
+
+    @staticmethod
+    def _store_result(job: Job) -> None:
+        """Move o arquivo gerado para o ArtifactStore e remove o diretório do trabalho."""
+        artifacts = FileService.get_artifact_store()
+        if job.status == JobService.STATUS_DONE and job.result_path:
+            artifact = artifacts.put(job.result_path)
+            job.artifact = artifact.digest
+            job.result_path = artifact.path
+            if job.keep_files:
+                artifacts.keep(artifact.digest)
+        shutil.rmtree(JobService.result_dir(job), ignore_errors=True)
+
+    @staticmethod
+    def _run_video(job: Job) -> None:
+        """Busca a transcrição de um vídeo e grava o arquivo exportado."""
+        store = JobService.get_store()
+        video = YouTubeService.get_video_details(job.target_id)
+        job.title = video.title
+        job.progress = 0.3
+        job.message = f"Obtendo transcrição para: {video.title}"
+        store.save(job)
+
+        video = TranscriptService.add_transcript_to_video(video, job.languages)
+        job.details["available_transcripts"] = [asdict(info) for info in video.available_transcripts]
+        job.details["language_used"] = video.language_used
+
+        if not video.transcript:
+            job.message = "Nenhuma transcrição disponível para este vídeo nos idiomas selecionados."
+            return
+
+        exporter = get_exporter(job.export_format)
+        job.progress = 0.8
+        job.message = f"Criando {exporter.label}..."
+        store.save(job)
+
+        path = os.path.join(JobService.result_dir(job), exporter.get_filename(video))
+        with open(path, "wb") as f:
+            f.write(render_cached(exporter, video))
+
+        job.result_path = path
+        job.result_name = os.path.basename(path)
+        job.mime = exporter.mime
+        job.message = "Processamento concluído!"
+
+    @staticmethod
+    def _run_playlist(job: Job) -> None:
+        """Exporta todos os vídeos de uma playlist para um ZIP (ou um único PDF)."""
+        store = JobService.get_store()
+        videos, playlist_title, estimated_count = YouTubeService.stream_playlist(job.target_id)
+        job.title = playlist_title
+        job.details["estimated_count"] = estimated_count
+        job.progress = 0.1
+        job.message = "Processando playlist..."
+        store.save(job)
+
+        def on_progress(completed, result):
+            if estimated_count:
+                job.progress = 0.1 + (0.8 * min(1.0, completed / estimated_count))
+                job.message = f"Processando ({completed}/{estimated_count}): {result.item.title}"
+            else:
+                job.message = f"Processando ({completed}): {result.item.title}"
+            store.save(job)
+
+        extension = "pdf" if job.combine else "zip"
+        output_name = FileService.safe_filename(f"{playlist_title[:50]}_transcricoes", extension)
+        export = ExportService.export_playlist_job(
+            job.target_id, videos, job.languages, output_name,
+            export_format=job.export_format,
+            progress_callback=on_progress,
+            output_dir=JobService.result_dir(job),
+            combine=job.combine,
+            title=playlist_title
+        )
+
+        job.details.update(total=export.total, exported=export.exported,
+                           missing=export.missing, failed=export.failed,
+                           incomplete=export.error)
+        if export.error and not export.zip_path:
+            job.status = JobService.STATUS_FAILED
+            job.error = export.error
+            return
+        if export.total == 0:
+            job.status = JobService.STATUS_FAILED
+            job.error = "Não foi possível encontrar vídeos na playlist ou a playlist está vazia."
+            return
+
+        if export.zip_path:
+            job.result_path = export.zip_path
+            job.result_name = os.path.basename(export.zip_path)
+            job.mime = "application/pdf" if job.combine else "application/zip"
+        job.message = "Processamento parcial: a playlist não foi lida até o fim." if export.error \
+            else "Processamento concluído!"
+
+    @staticmethod
+    def prune(max_age: Optional[float] = None) -> int:
+        """Remove trabalhos concluídos antigos e libera seus arquivos.
+
+        Os arquivos ficam no ArtifactStore, que os remove pela cota de espaço
+        ou por falta de uso; os de trabalhos com keep_files só saem pela cota.
+        Diretórios de trabalhos interrompidos também são removidos.
+
+        Args:
+            max_age: Idade máxima em segundos (padrão: TRANSCRIPTTUBE_JOB_RETENTION)
+
+        Returns:
+            Quantidade de trabalhos removidos
+        """
+        store = JobService.get_store()
+        max_age = config.JOB_RETENTION if max_age is None else max_age
+        removed = 0
+        for job in store.list_older_than(time.time() - max_age):
+            if not job.finished:
+                continue
+            if job.artifact:
+                FileService.get_artifact_store().release(job.artifact)
+            shutil.rmtree(JobService.result_dir(job), ignore_errors=True)
+            store.delete(job.id)
+            removed += 1
+
+        output_dir = FileService.create_output_dir()
+        for name in os.listdir(output_dir):
+            if not _JOB_DIR_PATTERN.fullmatch(name):
+                continue
+            job = store.get(name)
+            if job is None or job.finished:
+                shutil.rmtree(os.path.join(output_dir, name), ignore_errors=True)
+        return removed
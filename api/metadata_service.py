@@ -0,0 +1,232 @@
+# api/metadata_service.py
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pytube
+
+from models.data_models import VideoMetadata
+from api.file_service import FileService
+from api.transcript_service import TranscriptService
+from utils import config, metrics
+from utils.disk_cache import DiskCache
+
+
+class MetadataService:
+    """Resolve títulos, durações e canais dos vídeos.
+
+    As páginas de playlist que o pytube já baixa durante a enumeração trazem
+    esses dados para todos os vídeos; eles são guardados aqui à medida que
+    cada página chega (veja MetadataPlaylist). Para vídeos avulsos, os dados
+    vêm do oEmbed do YouTube, em paralelo quando há vários. Tudo fica em uma
+    memória LRU e em um cache persistente, de modo que o mesmo vídeo não
+    exige nova requisição.
+    """
+
+    OEMBED_URL = "https://www.youtube.com/oembed?format=json&url=https://www.youtube.com/watch?v={video_id}"
+    OEMBED_TIMEOUT = 10
+
+    # Quantidade de vídeos mantidos em memória
+    MEMORY_ENTRIES = 10000
+
+    _cache: Optional[DiskCache] = None
+    _cache_lock = threading.Lock()
+    _memory: "OrderedDict[str, VideoMetadata]" = OrderedDict()
+    _memory_lock = threading.Lock()
+
+    @staticmethod
+    def get_cache() -> Optional[DiskCache]:
+        """Retorna o cache persistente dos dados dos vídeos (ou None se desativado)."""
+        if not config.METADATA_CACHE_ENABLED:
+            return None
+
+        with MetadataService._cache_lock:
+            if MetadataService._cache is None:
+                path = os.path.join(FileService.create_cache_dir(), "metadata.sqlite3")
+                MetadataService._cache = DiskCache(path, ttl=config.METADATA_CACHE_TTL)
+            return MetadataService._cache
+
+    @staticmethod
+    def _key(video_id: str) -> str:
+        return f"metadata:{video_id}"
+
+    @staticmethod
+    def _remember_in_memory(metadata: VideoMetadata) -> None:
+        with MetadataService._memory_lock:
+            MetadataService._memory[metadata.video_id] = metadata
+            MetadataService._memory.move_to_end(metadata.video_id)
+            while len(MetadataService._memory) > MetadataService.MEMORY_ENTRIES:
+                MetadataService._memory.popitem(last=False)
+
+    @staticmethod
+    def remember(entries: Iterable[VideoMetadata]) -> None:
+        """Guarda os dados de vários vídeos na memória e no cache persistente.
+
+        Args:
+            entries: Dados dos vídeos (por exemplo, de uma página de playlist)
+        """
+        entries = list(entries)
+        for metadata in entries:
+            MetadataService._remember_in_memory(metadata)
+
+        cache = MetadataService.get_cache()
+        if cache is not None and entries:
+            cache.set_many({
+                MetadataService._key(metadata.video_id): json.dumps(asdict(metadata), ensure_ascii=False).encode("utf-8")
+                for metadata in entries
+            })
+
+    @staticmethod
+    def lookup(video_id: str) -> Optional[VideoMetadata]:
+        """Retorna os dados já conhecidos do vídeo, sem acessar a rede."""
+        with MetadataService._memory_lock:
+            metadata = MetadataService._memory.get(video_id)
+        if metadata is not None:
+            metrics.CACHE_REQUESTS.inc(kind="metadata", result="hit")
+            return metadata
+
+        cache = MetadataService.get_cache()
+        cached = cache.get_json(MetadataService._key(video_id)) if cache is not None else None
+        metrics.CACHE_REQUESTS.inc(kind="metadata", result="hit" if cached else "miss")
+        if not cached:
+            return None
+
+        metadata = VideoMetadata(**cached)
+        MetadataService._remember_in_memory(metadata)
+        return metadata
+
+    @staticmethod
+    def resolve(video_ids: List[str]) -> Dict[str, VideoMetadata]:
+        """Retorna os dados de vários vídeos, buscando os desconhecidos no oEmbed.
+
+        As buscas dos vídeos que não estão em memória nem no cache são feitas
+        em paralelo. Vídeos privados, removidos ou com falha na busca ficam
+        fora do resultado.
+
+        Args:
+            video_ids: IDs dos vídeos
+
+        Returns:
+            Dicionário do ID do vídeo para os dados encontrados
+        """
+        found: Dict[str, VideoMetadata] = {}
+        missing = []
+        for video_id in dict.fromkeys(video_ids):
+            metadata = MetadataService.lookup(video_id)
+            if metadata is not None:
+                found[video_id] = metadata
+            else:
+                missing.append(video_id)
+
+        if len(missing) == 1:
+            fetched = [MetadataService._fetch_oembed(missing[0])]
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), max(1, config.FETCH_MAX_WORKERS)),
+                                    thread_name_prefix="transcripttube-metadata") as executor:
+                fetched = list(executor.map(MetadataService._fetch_oembed, missing))
+        else:
+            fetched = []
+
+        fetched = [metadata for metadata in fetched if metadata is not None]
+        MetadataService.remember(fetched)
+        found.update((metadata.video_id, metadata) for metadata in fetched)
+        return found
+
+    @staticmethod
+    def _fetch_oembed(video_id: str) -> Optional[VideoMetadata]:
+        """Busca título e canal de um vídeo no oEmbed do YouTube."""
+        # Conta no limite de requisições por segundo do processo, como as transcrições
+        TranscriptService.rate_limiter.acquire()
+        request = urllib.request.Request(
+            MetadataService.OEMBED_URL.format(video_id=video_id),
+            headers={"User-Agent": "Mozilla/5.0"}
+        )
+        try:
+            with metrics.track_stage("metadata_fetch"), \
+                    urllib.request.urlopen(request, timeout=MetadataService.OEMBED_TIMEOUT) as response:
+                data = json.loads(response.read().decode("utf-8"))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            metrics.FAILURES.inc(stage="metadata_fetch", kind=type(e).__name__)
+            print(f"Não foi possível obter o título do vídeo {video_id}: {str(e)}")
+            return None
+
+        title = data.get("title")
+        if not title:
+            return None
+        return VideoMetadata(video_id=video_id, title=title, channel=data.get("author_name"))
+
+    @staticmethod
+    def parse_playlist_page(data: Any) -> List[VideoMetadata]:
+        """Extrai os dados dos vídeos de uma página (ou continuação) de playlist.
+
+        Args:
+            data: JSON da página já decodificado
+
+        Returns:
+            Dados de cada vídeo encontrado na página
+        """
+        entries = []
+        for renderer in _find_renderers(data, "playlistVideoRenderer"):
+            video_id = renderer.get("videoId")
+            title = _text(renderer.get("title"))
+            if not video_id or not title:
+                continue
+            try:
+                duration = int(renderer["lengthSeconds"])
+            except (KeyError, TypeError, ValueError):
+                duration = None
+            entries.append(VideoMetadata(
+                video_id=video_id,
+                title=title,
+                duration=duration,
+                channel=_text(renderer.get("shortBylineText"))
+            ))
+        return entries
+
+
+def _find_renderers(node: Any, name: str) -> Iterator[Dict]:
+    """Percorre o JSON e produz cada objeto com a chave `name`."""
+    if isinstance(node, dict):
+        if name in node:
+            yield node[name]
+            return
+        for value in node.values():
+            yield from _find_renderers(value, name)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _find_renderers(value, name)
+
+
+def _text(node: Any) -> Optional[str]:
+    """Lê um texto do YouTube, que vem como simpleText ou como lista de runs."""
+    if not isinstance(node, dict):
+        return None
+    if "simpleText" in node:
+        return node["simpleText"]
+    runs = node.get("runs") or []
+    text = "".join(run.get("text", "") for run in runs)
+    return text or None
+
+
+class MetadataPlaylist(pytube.Playlist):
+    """pytube.Playlist que guarda os dados dos vídeos de cada página carregada.
+
+    O pytube extrai apenas os IDs das páginas que baixa; aqui cada página é
+    também entregue ao MetadataService, sem nenhuma requisição extra.
+    """
+
+    def _extract_videos(self, raw_json: str):
+        videos_urls, continuation = super()._extract_videos(raw_json)
+        try:
+            MetadataService.remember(MetadataService.parse_playlist_page(json.loads(raw_json)))
+        except Exception as e:
+            # Os dados dos vídeos são opcionais; a enumeração continua sem eles
+            metrics.FAILURES.inc(stage="metadata_parse", kind=type(e).__name__)
+            print(f"Erro ao ler os dados dos vídeos da playlist: {str(e)}")
+        return videos_urls, continuation
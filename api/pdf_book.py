@@ -0,0 +1,469 @@
+# api/pdf_book.py
+import hashlib
+import re
+from array import array
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from api.pdf_fonts import PDFDocument, PDFFonts
+from api.pdf_service import PDFService
+from utils import metrics
+
+# Referência indireta a outro objeto ("12 0 R")
+_REFERENCE_PATTERN = re.compile(rb"(?<![\d.])(\d+)\s+(\d+)\s+R\b")
+_KIDS_PATTERN = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+_MEDIABOX_PATTERN = re.compile(rb"/MediaBox\s*\[[^\]]*\]")
+_PAGES_PATTERN = re.compile(rb"/Pages\s+(\d+)\s+\d+\s+R")
+_TRAILER_PATTERN = re.compile(rb"/(Root|Info)\s+(\d+)\s+\d+\s+R")
+_LENGTH_PATTERN = re.compile(rb"/Length\s+(\d+)(?:\s+\d+\s+R)?")
+# Delimitadores que interessam ao localizar o fim de um objeto: strings
+# literais, comentários, o início do stream e o fim do objeto
+_OBJECT_TOKENS = re.compile(rb"\(|%|(?<![A-Za-z])stream(?:\r\n|\n)|(?<![A-Za-z])endobj(?![A-Za-z])")
+# Objetos que descrevem fontes, comparados pelo conteúdo entre os capítulos
+_FONT_TYPE_PATTERN = re.compile(rb"/Type\s*/Font(?:Descriptor)?(?![A-Za-z])")
+
+# Tamanho da página A4 em pontos, usado se o capítulo não informar outro
+_DEFAULT_MEDIABOX = b"/MediaBox [0 0 595.28 841.89]"
+
+
+def _skip_string(data: bytes, start: int) -> int:
+    """Retorna a posição logo depois da string literal que começa em `start`.
+
+    Strings literais podem ter parênteses balanceados e caracteres escapados
+    com barra invertida, inclusive parênteses.
+    """
+    depth = 0
+    position = start
+    while position < len(data):
+        char = data[position]
+        if char == 0x5C:  # \
+            position += 2
+            continue
+        if char == 0x28:  # (
+            depth += 1
+        elif char == 0x29:  # )
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    raise ValueError("String PDF sem fechamento")
+
+
+def _sub_outside_strings(pattern: "re.Pattern", replace, data: bytes) -> bytes:
+    """Aplica `pattern.sub` apenas fora das strings literais."""
+    parts = []
+    position = 0
+    while True:
+        start = data.find(b"(", position)
+        if start < 0:
+            parts.append(pattern.sub(replace, data[position:]))
+            return b"".join(parts)
+        end = _skip_string(data, start)
+        parts.append(pattern.sub(replace, data[position:start]))
+        parts.append(data[start:end])
+        position = end
+
+
+def _search_outside_strings(pattern: "re.Pattern", data: bytes) -> List["re.Match"]:
+    """Retorna as ocorrências de `pattern` fora das strings literais."""
+    found = []
+    _sub_outside_strings(pattern, lambda match: found.append(match) or match.group(0), data)
+    return found
+
+
+class _ParsedPDF:
+    """Objetos de um PDF gerado pelo fpdf, localizados pela tabela xref.
+
+    Guarda apenas as posições de cada objeto no documento original; o
+    conteúdo é lido sob demanda ao copiar os objetos. O fim de cada objeto é
+    encontrado pelo /Length do stream, sem procurar palavras-chave dentro de
+    strings ou dos dados binários.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        # Número do objeto -> posições (início e fim) do dicionário e do stream
+        self._spans: Dict[int, Tuple[int, int, int, int]] = {}
+        startxref = data.rindex(b"startxref")
+        xref_offset = int(data[startxref + len(b"startxref"):].split()[0])
+        if not data.startswith(b"xref", xref_offset):
+            raise ValueError("PDF sem tabela xref")
+        trailer_offset = data.index(b"trailer", xref_offset)
+
+        # Subseções "primeiro quantidade" seguidas das entradas "posição geração n|f",
+        # com qualquer espaço ou quebra de linha entre os campos
+        tokens = data[xref_offset + len(b"xref"):trailer_offset].split()
+        self.offsets: Dict[int, int] = {}
+        position = 0
+        while position + 1 < len(tokens):
+            first, count = int(tokens[position]), int(tokens[position + 1])
+            position += 2
+            for i in range(count):
+                offset, _, kind = tokens[position:position + 3]
+                if kind == b"n":
+                    self.offsets[first + i] = int(offset)
+                position += 3
+
+        trailer = dict(_TRAILER_PATTERN.findall(data[trailer_offset:startxref]))
+        self.info = int(trailer[b"Info"]) if b"Info" in trailer else None
+        self.catalog = int(trailer[b"Root"])
+        self.pages_root = int(_PAGES_PATTERN.search(self.dictionary(self.catalog)).group(1))
+
+        root = self.dictionary(self.pages_root)
+        kids = _KIDS_PATTERN.search(root).group(1)
+        self.pages = [int(match.group(1)) for match in _REFERENCE_PATTERN.finditer(kids)]
+        mediabox = _MEDIABOX_PATTERN.search(root)
+        self.mediabox = mediabox.group(0) if mediabox else _DEFAULT_MEDIABOX
+
+    def object(self, number: int) -> Tuple[bytes, bytes]:
+        """Retorna o dicionário do objeto e o stream que vem depois dele (ou b"").
+
+        O stream inclui as palavras-chave "stream" e "endstream".
+        """
+        span = self._spans.get(number)
+        if span is None:
+            span = self._spans[number] = self._locate(number)
+        start, end, stream_start, stream_end = span
+        return self.data[start:end].strip(), self.data[stream_start:stream_end]
+
+    def _locate(self, number: int) -> Tuple[int, int, int, int]:
+        """Encontra o dicionário e o stream do objeto, pulando strings e dados binários."""
+        header = re.compile(rb"%d\s+\d+\s+obj" % number).match(self.data, self.offsets[number])
+        if header is None:
+            raise ValueError(f"Objeto {number} fora da posição indicada na xref")
+        position = header.end()
+        while True:
+            token = _OBJECT_TOKENS.search(self.data, position)
+            if token is None:
+                raise ValueError(f"Objeto {number} sem endobj")
+            if token.group(0) == b"(":
+                position = _skip_string(self.data, token.start())
+            elif token.group(0) == b"%":
+                position = self.data.find(b"\n", token.end()) + 1 or len(self.data)
+            elif token.group(0).startswith(b"stream"):
+                length = self._stream_length(number, self.data[header.end():token.start()])
+                end = self.data.index(b"endstream", token.end() + length) + len(b"endstream")
+                return header.end(), token.start(), token.start(), end
+            else:
+                return header.end(), token.start(), 0, 0
+
+    def _stream_length(self, number: int, dictionary: bytes) -> int:
+        """Lê o /Length do stream, direto no dicionário ou em outro objeto."""
+        found = _search_outside_strings(_LENGTH_PATTERN, dictionary)
+        if not found:
+            raise ValueError(f"Stream do objeto {number} sem /Length")
+        match = found[0]
+        if match.group(0).rstrip().endswith(b"R"):
+            return int(self.object(int(match.group(1)))[0])
+        return int(match.group(1))
+
+    def dictionary(self, number: int) -> bytes:
+        """Retorna apenas o dicionário do objeto (sem o stream, se houver)."""
+        return self.object(number)[0]
+
+    def references(self, number: int) -> List[int]:
+        """Números dos objetos referenciados pelo dicionário do objeto."""
+        return [int(match.group(1)) for match in _search_outside_strings(_REFERENCE_PATTERN, self.dictionary(number))]
+
+    def font_objects(self) -> List[int]:
+        """Objetos das fontes e tudo o que eles referenciam (descritores, arquivos, mapas)."""
+        pending = [number for number in self.offsets
+                   if _search_outside_strings(_FONT_TYPE_PATTERN, self.dictionary(number))]
+        found = set()
+        while pending:
+            number = pending.pop()
+            if number in found or number not in self.offsets:
+                continue
+            found.add(number)
+            pending.extend(self.references(number))
+        return sorted(found)
+
+
+def _pdf_text(text: str) -> bytes:
+    """Codifica um texto como string PDF em UTF-16 (títulos dos marcadores)."""
+    return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+class PDFBookWriter:
+    """Grava um único PDF com um capítulo por vídeo e um sumário no início.
+
+    O fpdf monta o documento inteiro em memória, então cada capítulo é
+    renderizado separadamente (como o PDF de um vídeo avulso) e seus objetos
+    são renumerados e copiados direto para o arquivo assim que o capítulo
+    chega. Fontes idênticas às de um capítulo anterior (comparadas pelo hash
+    do conteúdo) não são copiadas de novo. Como a ordem das páginas é definida pela árvore de páginas, gravada
+    no fechamento, os capítulos podem chegar fora de ordem sem ficar em
+    memória: de cada um restam só o título e os números dos objetos das
+    páginas. O sumário, com links e marcadores para cada capítulo, é gerado
+    no fechamento e colocado antes do primeiro capítulo.
+
+    Tem a mesma interface do ZipStreamWriter (add, skip, close), para ser
+    usado pelo ExportService no lugar do ZIP.
+    """
+
+    # Objetos reservados: a árvore de páginas e o catálogo são gravados no final
+    _PAGES_ROOT = 1
+    _CATALOG = 2
+
+    TOC_TITLE = "Sumário"
+    TOC_LINE_HEIGHT = 8
+
+    def __init__(self, path: str, title: str = ""):
+        self.path = path
+        self.title = title
+        self.member_count = 0
+        self.bytes_written = 0
+        # Posição de cada objeto no arquivo (índice = número do objeto - 1)
+        self._offsets = array("q", [0, 0])
+        # Índice na playlist -> (título, números dos objetos das páginas)
+        self._chapters: Dict[int, Tuple[str, array]] = {}
+        # Hash do conteúdo de cada objeto de fonte já gravado -> número do objeto
+        self._fonts: Dict[bytes, int] = {}
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self) -> "PDFBookWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def _write_chunked(self, parts: Iterable[bytes], size: int = 4096) -> None:
+        """Grava muitas partes pequenas em blocos, sem montar tudo em memória."""
+        chunk = []
+        for part in parts:
+            chunk.append(part)
+            if len(chunk) == size:
+                self._write(b"".join(chunk))
+                chunk = []
+        self._write(b"".join(chunk))
+
+    def _new_object(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets)
+
+    def _write_object(self, number: int, body: bytes) -> None:
+        self._offsets[number - 1] = self.bytes_written
+        self._write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _append_document(self, data: bytes, page_entries: Optional[Dict[int, bytes]] = None) -> array:
+        """Copia as páginas de um PDF do fpdf para o arquivo, renumerando os objetos.
+
+        Args:
+            data: PDF completo gerado pelo fpdf
+            page_entries: Entradas extras do dicionário de algumas páginas,
+                          pela posição da página no documento
+
+        Returns:
+            Números, no arquivo final, dos objetos das páginas, em ordem
+        """
+        document = _ParsedPDF(data)
+        skipped = {document.catalog, document.pages_root, document.info}
+        digests = self._font_digests(document)
+
+        # As fontes iguais às de capítulos anteriores apontam para os objetos já gravados
+        numbers = {document.pages_root: self._PAGES_ROOT}
+        shared: Dict[bytes, int] = {}
+        copied = []
+        for original in sorted(document.offsets):
+            if original in skipped:
+                continue
+            digest = digests.get(original)
+            existing = self._fonts.get(digest, shared.get(digest)) if digest else None
+            if existing is not None:
+                numbers[original] = existing
+                continue
+            numbers[original] = self._new_object()
+            if digest:
+                shared[digest] = numbers[original]
+            copied.append(original)
+
+        def renumber(match: "re.Match") -> bytes:
+            return b"%d 0 R" % numbers[int(match.group(1))]
+
+        page_positions = {number: position for position, number in enumerate(document.pages)}
+        for original in copied:
+            dictionary, stream = document.object(original)
+            dictionary = _sub_outside_strings(_REFERENCE_PATTERN, renumber, dictionary)
+            position = page_positions.get(original)
+            if position is not None:
+                # O tamanho da página fica na raiz de páginas do capítulo, que não é copiada
+                extra = b"" if b"/MediaBox" in dictionary else b"\n" + document.mediabox
+                if page_entries and position in page_entries:
+                    extra += b"\n" + page_entries[position]
+                if not dictionary.endswith(b">>"):
+                    raise ValueError(f"Página {original} sem dicionário")
+                dictionary = dictionary[:-2] + extra + b">>"
+            self._write_object(numbers[original], dictionary + (b"\n" + stream if stream else b""))
+
+        # Só depois de gravados os objetos podem ser usados por outros capítulos
+        self._fonts.update(shared)
+        return array("q", (numbers[page] for page in document.pages))
+
+    @staticmethod
+    def _font_digests(document: _ParsedPDF) -> Dict[int, bytes]:
+        """Calcula o hash do conteúdo de cada objeto de fonte do documento.
+
+        As referências entre os objetos entram pelo hash do objeto
+        referenciado, de modo que a mesma fonte (ou o mesmo subconjunto de
+        glifos) tem os mesmos hashes em qualquer capítulo.
+        """
+        fonts = set(document.font_objects())
+        digests: Dict[int, bytes] = {}
+
+        def digest(number: int, visiting: frozenset) -> bytes:
+            if number in digests:
+                return digests[number]
+            if number in visiting:
+                raise ValueError(f"Referência circular entre as fontes (objeto {number})")
+            dictionary, stream = document.object(number)
+            visiting = visiting | {number}
+            dictionary = _sub_outside_strings(
+                _REFERENCE_PATTERN,
+                lambda match: b"<%s>" % digest(int(match.group(1)), visiting)
+                if int(match.group(1)) in fonts else match.group(0),
+                dictionary
+            )
+            digests[number] = hashlib.sha256(dictionary + b"\0" + stream).hexdigest().encode("ascii")
+            return digests[number]
+
+        for number in fonts:
+            digest(number, frozenset())
+        return digests
+
+    def add(self, index: int, name: str, data: bytes) -> None:
+        """Acrescenta o PDF de um vídeo como capítulo.
+
+        Args:
+            index: Posição do vídeo na playlist (ordem do capítulo)
+            name: Título do capítulo no sumário
+            data: PDF do vídeo, gerado pelo PDFExporter
+        """
+        with metrics.track_stage("book_write"):
+            pages = self._append_document(data)
+        self._chapters[index] = (name, pages)
+        self.member_count += 1
+
+    def skip(self, index: int) -> None:
+        """Posição sem capítulo (vídeo sem transcrição); não ocupa páginas."""
+
+    def _render_toc(self, entries: List[Tuple[str, int, int]], toc_pages: int) -> Tuple[bytes, Dict[int, bytes]]:
+        """Gera as páginas do sumário.
+
+        Args:
+            entries: (título, objeto da primeira página, quantidade de páginas) de cada capítulo
+            toc_pages: Páginas do sumário, somadas aos números de página exibidos
+
+        Returns:
+            PDF do sumário e as anotações de link de cada página
+        """
+        pdf = PDFDocument()
+        pdf.set_auto_page_break(True, margin=20)
+        pdf.add_page()
+        if self.title:
+            font = PDFFonts.select(sample=self.title)
+            font.set(pdf, 'B', 16)
+            pdf.multi_cell(0, 10, txt=font.text(self.title), align='C')
+            pdf.ln(5)
+        font = PDFFonts.select(sample=self.TOC_TITLE)
+        font.set(pdf, 'B', 14)
+        pdf.cell(0, 10, txt=font.text(self.TOC_TITLE), ln=True)
+        pdf.ln(2)
+
+        font.set(pdf, size=11)
+        number_width = pdf.get_string_width("00000") + 2
+        title_width = PDFService.TEXT_WIDTH - number_width
+        scale = pdf.k
+        links: Dict[int, List[bytes]] = {}
+
+        page_number = toc_pages + 1
+        for title, target, page_count in entries:
+            # Cada título usa uma fonte com os caracteres da sua escrita
+            title_font = PDFFonts.select(sample=title)
+            title_font.set(pdf, size=11)
+            title = title_font.text(title)
+            if pdf.get_string_width(title) > title_width - 2:
+                while title and pdf.get_string_width(title + "...") > title_width - 2:
+                    title = title[:-1]
+                title += "..."
+
+            if pdf.get_y() + self.TOC_LINE_HEIGHT > pdf.page_break_trigger:
+                pdf.add_page()
+            x, y = pdf.get_x(), pdf.get_y()
+            pdf.cell(title_width, self.TOC_LINE_HEIGHT, txt=title)
+            font.set(pdf, size=11)
+            pdf.cell(number_width, self.TOC_LINE_HEIGHT, txt=str(page_number), ln=True, align='R')
+
+            rect = (x * scale, (pdf.h - y - self.TOC_LINE_HEIGHT) * scale,
+                    (x + PDFService.TEXT_WIDTH) * scale, (pdf.h - y) * scale)
+            links.setdefault(pdf.page - 1, []).append(
+                b"<</Type /Annot /Subtype /Link /Rect [%.2f %.2f %.2f %.2f] /Border [0 0 0] "
+                b"/Dest [%d 0 R /Fit]>>" % (rect + (target,))
+            )
+            page_number += page_count
+
+        data = pdf.output(dest='S').encode('latin-1')
+        annotations = {page: b"/Annots [" + b" ".join(items) + b"]" for page, items in links.items()}
+        return data, annotations
+
+    def close(self) -> None:
+        """Gera o sumário, grava a árvore de páginas, os marcadores e fecha o arquivo."""
+        if self._file is None:
+            return
+
+        chapters = [self._chapters[index] for index in sorted(self._chapters)]
+        self._chapters.clear()
+        entries = [(title, pages[0], len(pages)) for title, pages in chapters if len(pages)]
+
+        toc_pages = array("q")
+        if entries:
+            with metrics.track_stage("book_toc"):
+                # Os números de página dependem do tamanho do próprio sumário
+                data, _ = self._render_toc(entries, 1)
+                data, annotations = self._render_toc(entries, len(_ParsedPDF(data).pages))
+                toc_pages = self._append_document(data, annotations)
+
+        # Árvore de páginas: sumário e depois os capítulos, na ordem da playlist
+        page_count = len(toc_pages) + sum(len(pages) for _, pages in chapters)
+        self._offsets[self._PAGES_ROOT - 1] = self.bytes_written
+        self._write(b"%d 0 obj\n<</Type /Pages\n%s\n/Count %d\n/Kids [" %
+                    (self._PAGES_ROOT, _DEFAULT_MEDIABOX, page_count))
+        for pages in [toc_pages] + [pages for _, pages in chapters]:
+            self._write_chunked(b"%d 0 R " % number for number in pages)
+        self._write(b"]>>\nendobj\n")
+
+        # Marcadores (outline), um por capítulo
+        outlines = None
+        if entries:
+            outlines = self._new_object()
+            items = [self._new_object() for _ in entries]
+            self._write_object(outlines, b"<</Type /Outlines /First %d 0 R /Last %d 0 R /Count %d>>"
+                               % (items[0], items[-1], len(items)))
+            for position, ((title, target, _), number) in enumerate(zip(entries, items)):
+                links = b""
+                if position > 0:
+                    links += b" /Prev %d 0 R" % items[position - 1]
+                if position < len(items) - 1:
+                    links += b" /Next %d 0 R" % items[position + 1]
+                self._write_object(number, b"<</Title %s /Parent %d 0 R%s /Dest [%d 0 R /Fit]>>"
+                                   % (_pdf_text(title), outlines, links, target))
+
+        info = self._new_object()
+        self._write_object(info, b"<</Title %s /Producer (TranscriptTube)>>" % _pdf_text(self.title))
+        catalog = b"<</Type /Catalog /Pages %d 0 R" % self._PAGES_ROOT
+        if outlines is not None:
+            catalog += b" /Outlines %d 0 R /PageMode /UseOutlines" % outlines
+        self._write_object(self._CATALOG, catalog + b">>")
+
+        xref_offset = self.bytes_written
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self._offsets) + 1))
+        self._write_chunked(b"%010d 00000 n \n" % offset for offset in self._offsets)
+        self._write(b"trailer\n<</Size %d /Root %d 0 R /Info %d 0 R>>\nstartxref\n%d\n%%%%EOF\n"
+                    % (len(self._offsets) + 1, self._CATALOG, info, xref_offset))
+
+        metrics.BYTES_WRITTEN.inc(self.bytes_written, kind="book")
+        self._file.close()
+        self._file = None
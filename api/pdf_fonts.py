@@ -0,0 +1,355 @@
+# api/pdf_fonts.py
+import os
+import re
+import sys
+import threading
+import types
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import fpdf
+from fpdf import FPDF
+
+from utils import config, metrics
+
+
+# Pontuação tipográfica comum em títulos do YouTube, fora do latin-1 das fontes padrão
+_LATIN1_REPLACEMENTS = str.maketrans({
+    "\u2013": "-", "\u2014": "-", "\u2018": "'", "\u2019": "'",
+    "\u201c": '"', "\u201d": '"', "\u2026": "...", "\u2022": "*",
+})
+
+# Fontes TrueType conhecidas: arquivos regular, negrito e itálico (None = usa o regular)
+FONT_FILES: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {
+    "dejavusans": ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf", "DejaVuSans-Oblique.ttf"),
+    "droidsansfallback": ("DroidSansFallbackFull.ttf", None, None),
+    "lohitdevanagari": ("Lohit-Devanagari.ttf", None, None),
+    "notosansdevanagari": ("NotoSansDevanagari-Regular.ttf", "NotoSansDevanagari-Bold.ttf", None),
+}
+
+# Fonte preferida por idioma (parte principal do código, antes do "-"); se ela
+# não estiver instalada, vale a primeira fonte de FONT_FILES com os caracteres.
+# O fpdf 1.7.2 não faz shaping nem reordena texto da direita para a esquerda:
+# devanágari, árabe e hebraico saem com os glifos certos, mas sem ligaduras,
+# formas contextuais ou a ordem visual correta
+LANGUAGE_FONTS = {
+    "ja": "droidsansfallback",
+    "zh": "droidsansfallback",
+    "ko": "droidsansfallback",
+    "hi": "lohitdevanagari",
+    "mr": "lohitdevanagari",
+    "ne": "lohitdevanagari",
+}
+
+# Fonte usada nos demais idiomas (latim, cirílico, grego...)
+DEFAULT_FONT = "dejavusans"
+
+# PDFFonts.register e as classes abaixo dependem dos detalhes internos do
+# fpdf 1.7.2, a versão fixada em requirements.txt; com outra versão os PDFs
+# usam a Arial padrão
+FPDF_SUPPORTED = getattr(fpdf, "FPDF_VERSION", None) == "1.7.2"
+
+
+def _with_globals(function, **names):
+    """Cópia da função em que os nomes informados substituem os globais do módulo dela.
+
+    O fpdf usa o TTFontFile e o calcChecksum pelos nomes globais dos seus
+    módulos; assim as classes daqui trocam esses nomes sem alterar os
+    módulos do fpdf para o restante do processo.
+    """
+    copy = types.FunctionType(function.__code__, {**function.__globals__, **names},
+                              function.__name__, function.__defaults__, function.__closure__)
+    copy.__kwdefaults__ = function.__kwdefaults__
+    return copy
+
+
+class _GlyphSubset(list):
+    """Lista dos caracteres usados em uma fonte, sem repetições.
+
+    O fpdf acrescenta à lista do subconjunto cada caractere de cada texto
+    escrito, com repetições, e depois procura nela cada código da fonte
+    (até 65535) ao gravar as larguras; com uma transcrição longa isso leva
+    segundos. Aqui cada caractere entra uma única vez e a busca usa um set.
+    """
+
+    def __init__(self, codes=()):
+        super().__init__()
+        self._codes = set()
+        for code in codes:
+            self.append(code)
+
+    def append(self, code: int) -> None:
+        if code not in self._codes:
+            self._codes.add(code)
+            super().append(code)
+
+    def __contains__(self, code) -> bool:
+        return code in self._codes
+
+    def __delitem__(self, index) -> None:
+        removed = self[index]
+        super().__delitem__(index)
+        self._codes.difference_update(removed if isinstance(index, slice) else (removed,))
+
+
+def _checksum(data: bytes) -> Tuple[int, int]:
+    """Soma de verificação TrueType (palavras de 32 bits big-endian, módulo 2**32).
+
+    Mesmo resultado do calcChecksum do fpdf, que soma as palavras uma a uma
+    em Python e ocupa boa parte da gravação de cada subconjunto de fonte.
+    """
+    if len(data) % 4:
+        data += b"\0" * (4 - len(data) % 4)
+    words = array("I", data)
+    if sys.byteorder == "little":
+        words.byteswap()
+    total = sum(words) & 0xFFFFFFFF
+    return total >> 16, total & 0xFFFF
+
+
+if FPDF_SUPPORTED:
+    from fpdf.ttfonts import TTFontFile
+
+    class _CachedTTFontFile(TTFontFile):
+        """TTFontFile que lê a tabela cmap de cada arquivo uma única vez por processo.
+
+        O fpdf cria um TTFontFile a cada PDF gravado para extrair o subconjunto
+        de glifos usados, e ler o cmap de uma fonte CJK domina esse tempo. O
+        resultado da leitura não depende do documento, então é reaproveitado.
+        """
+
+        _cmaps: Dict[Tuple[str, int, str], Tuple[Dict, Dict, int]] = {}
+        _cmaps_lock = threading.Lock()
+
+        def _cached_cmap(self, kind: str, read, offset: int, glyphToChar: Dict, charToGlyph: Dict) -> None:
+            key = (os.path.abspath(self.filename), offset, kind)
+            with self._cmaps_lock:
+                cached = self._cmaps.get(key)
+            if cached is None:
+                read(offset, glyphToChar, charToGlyph)
+                cached = (dict(glyphToChar), dict(charToGlyph), self.maxUniChar)
+                with self._cmaps_lock:
+                    self._cmaps[key] = cached
+            else:
+                glyphToChar.update(cached[0])
+                charToGlyph.update(cached[1])
+                self.maxUniChar = cached[2]
+
+        def getCMAP4(self, unicode_cmap_offset, glyphToChar, charToGlyph):
+            self._cached_cmap("cmap4", super().getCMAP4, unicode_cmap_offset, glyphToChar, charToGlyph)
+
+        def getCMAP12(self, unicode_cmap_offset, glyphToChar, charToGlyph):
+            self._cached_cmap("cmap12", super().getCMAP12, unicode_cmap_offset, glyphToChar, charToGlyph)
+
+        # Mesmo endTTFile do fpdf, com a soma de verificação vetorizada
+        endTTFile = _with_globals(TTFontFile.endTTFile, calcChecksum=_checksum)
+
+
+class PDFDocument(FPDF):
+    """FPDF que grava os subconjuntos de fonte com o _CachedTTFontFile.
+
+    Os PDFs do TranscriptTube são criados com esta classe; o FPDF original
+    continua inalterado para quem mais o usar no processo.
+    """
+
+    if FPDF_SUPPORTED:
+        _putfonts = _with_globals(FPDF._putfonts, TTFontFile=_CachedTTFontFile)
+
+
+class PDFFont:
+    """Fonte escolhida para um trecho do documento.
+
+    Com uma fonte TrueType, o texto é escrito em Unicode e apenas os glifos
+    usados são embutidos no PDF. Sem as fontes instaladas, usa a Arial
+    padrão do PDF e adapta o texto ao latin-1.
+    """
+
+    def __init__(self, family: str, files: Optional[Dict[str, str]] = None):
+        self.family = family
+        # Estilo ("", "B" ou "I") -> arquivo TTF; vazio para a Arial
+        self.files = files or {}
+
+    @property
+    def unicode(self) -> bool:
+        return bool(self.files)
+
+    def set(self, pdf: FPDF, style: str = "", size: int = 12) -> None:
+        """Seleciona a fonte no documento (estilos ausentes usam o regular).
+
+        Cada estilo é registrado no documento no primeiro uso, para que só
+        os estilos realmente usados sejam embutidos.
+        """
+        if self.files:
+            if style not in self.files:
+                style = ""
+            PDFFonts.register(pdf, self.family, style, self.files[style])
+        pdf.set_font(self.family, style, size)
+
+    def text(self, text: str) -> str:
+        """Adapta o texto à fonte: inalterado em Unicode, latin-1 na Arial."""
+        if self.unicode:
+            return text
+        return text.translate(_LATIN1_REPLACEMENTS).encode("latin-1", "replace").decode("latin-1")
+
+    def covers(self, text: str) -> bool:
+        """Indica se a fonte tem glifos para todos os caracteres do texto."""
+        if not self.unicode:
+            return all(ord(char) < 256 for char in set(text))
+        widths = PDFFonts.load_metrics(self.files[""])["cw"]
+        return all(char.isspace() or (ord(char) < len(widths) and widths[ord(char)])
+                   for char in set(text))
+
+
+# Fonte padrão do PDF, usada quando nenhuma fonte TrueType está disponível
+CORE_FONT = PDFFont("arial")
+
+
+class PDFFonts:
+    """Fontes Unicode (TrueType) dos PDFs, carregadas uma vez por processo.
+
+    As métricas de cada arquivo (larguras dos caracteres, descritor) são
+    lidas na primeira vez em que a fonte é usada e ficam em memória; cada
+    documento só registra a fonte e acumula os caracteres usados, que o
+    fpdf embute como subconjunto ao gravar o PDF.
+    """
+
+    _metrics: Dict[str, Dict] = {}
+    _files: Optional[Dict[str, str]] = None
+    _lock = threading.Lock()
+    _warned = False
+    _unsupported_warned = False
+
+    @staticmethod
+    def find_file(filename: str) -> Optional[str]:
+        """Procura um arquivo de fonte nos diretórios de TRANSCRIPTTUBE_FONT_DIRS."""
+        with PDFFonts._lock:
+            if PDFFonts._files is None:
+                files = {}
+                for directory in config.FONT_DIRS:
+                    for root, _, names in os.walk(directory):
+                        for name in names:
+                            if name.lower().endswith(".ttf"):
+                                files.setdefault(name, os.path.join(root, name))
+                PDFFonts._files = files
+            return PDFFonts._files.get(filename)
+
+    @staticmethod
+    def get_font(family: str) -> Optional[PDFFont]:
+        """Retorna a família de FONT_FILES, se o arquivo regular estiver instalado."""
+        files = {}
+        for style, filename in zip(("", "B", "I"), FONT_FILES[family]):
+            path = PDFFonts.find_file(filename) if filename else None
+            if path is not None:
+                files[style] = path
+        return PDFFont(family, files) if "" in files else None
+
+    @staticmethod
+    def require(families: List[str]) -> None:
+        """Confirma que o arquivo regular de cada família está instalado.
+
+        Usado no build da imagem Docker, para que um pacote de fontes com
+        outros nomes de arquivo interrompa o build em vez de gerar PDFs com "?".
+
+        Raises:
+            RuntimeError: Se alguma família não for encontrada em TRANSCRIPTTUBE_FONT_DIRS
+        """
+        missing = [FONT_FILES[family][0] for family in families if PDFFonts.get_font(family) is None]
+        if missing:
+            raise RuntimeError(f"Fontes não encontradas em {os.pathsep.join(config.FONT_DIRS)}: "
+                               f"{', '.join(missing)}")
+
+    @staticmethod
+    def load_metrics(path: str) -> Dict:
+        """Lê (ou retorna do cache do processo) as métricas de um arquivo TTF."""
+        with PDFFonts._lock:
+            font = PDFFonts._metrics.get(path)
+        if font is not None:
+            return font
+
+        with metrics.track_stage("font_load"):
+            ttf = TTFontFile()
+            ttf.getMetrics(path)
+        font = {
+            "name": re.sub("[ ()]", "", ttf.fullName),
+            "desc": {
+                "Ascent": int(round(ttf.ascent, 0)),
+                "Descent": int(round(ttf.descent, 0)),
+                "CapHeight": int(round(ttf.capHeight, 0)),
+                "Flags": ttf.flags,
+                "FontBBox": "[%s %s %s %s]" % tuple(int(round(value, 0)) for value in ttf.bbox),
+                "ItalicAngle": int(ttf.italicAngle),
+                "StemV": int(round(ttf.stemV, 0)),
+                "MissingWidth": int(round(ttf.defaultWidth, 0)),
+            },
+            "up": round(ttf.underlinePosition),
+            "ut": round(ttf.underlineThickness),
+            "cw": ttf.charWidths,
+            "originalsize": os.stat(path).st_size,
+        }
+        with PDFFonts._lock:
+            return PDFFonts._metrics.setdefault(path, font)
+
+    @staticmethod
+    def register(pdf: FPDF, family: str, style: str, path: str) -> None:
+        """Registra uma fonte TTF no documento, como o add_font(uni=True) do fpdf.
+
+        As métricas vêm do cache do processo, em vez de um arquivo .pkl ao
+        lado da fonte (que não pode ser gravado em /usr/share/fonts).
+        """
+        fontkey = family + style
+        if fontkey in pdf.fonts:
+            return
+        font = PDFFonts.load_metrics(path)
+        pdf.fonts[fontkey] = {
+            "i": len(pdf.fonts) + 1, "type": "TTF",
+            "name": font["name"], "desc": font["desc"],
+            "up": font["up"], "ut": font["ut"], "cw": font["cw"],
+            "ttffile": path, "fontkey": fontkey,
+            "subset": _GlyphSubset(range(0, 57 if hasattr(pdf, "str_alias_nb_pages") else 32)),
+            "unifilename": None,
+        }
+        pdf.font_files[fontkey] = {"length1": font["originalsize"], "type": "TTF", "ttffile": path}
+
+    @staticmethod
+    def select(language: Optional[str] = None, sample: str = "") -> PDFFont:
+        """Escolhe a fonte para um texto.
+
+        Textos que cabem no latin-1 usam a Arial padrão do PDF, que não
+        precisa ser embutida. Os demais usam a fonte do idioma se ela tiver
+        todos os caracteres do exemplo; senão, a primeira fonte instalada que
+        os tenha (um título em japonês em uma transcrição em inglês, por
+        exemplo). Sem nenhuma fonte TrueType instalada, com
+        TRANSCRIPTTUBE_UNICODE_FONTS desativado ou com outra versão do fpdf,
+        usa a Arial.
+
+        Args:
+            language: Código do idioma do texto
+            sample: Texto (ou parte dele) que será escrito com a fonte
+
+        Returns:
+            Fonte escolhida (selecionada no documento com PDFFont.set)
+        """
+        if not config.UNICODE_FONTS_ENABLED or CORE_FONT.covers(sample):
+            return CORE_FONT
+        if not FPDF_SUPPORTED:
+            if not PDFFonts._unsupported_warned:
+                PDFFonts._unsupported_warned = True
+                print(f"As fontes Unicode dos PDFs requerem o fpdf 1.7.2 (instalado: {fpdf.FPDF_VERSION}); "
+                      f"usando Arial (apenas caracteres latinos)")
+            return CORE_FONT
+
+        preferred = LANGUAGE_FONTS.get((language or "").split("-")[0].lower(), DEFAULT_FONT)
+        first = None
+        for family in [preferred] + [family for family in FONT_FILES if family != preferred]:
+            font = PDFFonts.get_font(family)
+            if font is None:
+                continue
+            if font.covers(sample):
+                return font
+            first = first or font
+
+        if first is None and not PDFFonts._warned:
+            PDFFonts._warned = True
+            print(f"Nenhuma fonte Unicode encontrada em {os.pathsep.join(config.FONT_DIRS)}; "
+                  f"usando Arial (apenas caracteres latinos)")
+        return first or CORE_FONT
@@ -1,12 +1,17 @@
 # api/pdf_service.py
 from fpdf import FPDF
-import re
 import os
 from typing import List, Optional
-from models.data_models import Video
+from models.data_models import TranscriptSegments, Video
+from api.file_service import FileService
+from api.pdf_fonts import PDFDocument, PDFFonts
+from utils import metrics
 
 
 class PDFService:
+    # Largura útil do texto: largura da página menos margens
+    TEXT_WIDTH = 180
+
     @staticmethod
     def create_output_dir() -> str:
         """Cria e retorna o diretório de saída para os arquivos PDF.
@@ -32,75 +37,159 @@ class PDFService:
         return output_dir
 
     @staticmethod
-    def create_pdf(video: Video) -> Optional[str]:
-        """Cria um arquivo PDF com a transcrição.
+    def get_filename(video: Video, extension: str = "pdf") -> str:
+        """Retorna o nome de arquivo (sem diretório) para a transcrição do vídeo.
 
         Args:
-            video: Objeto Video contendo a transcrição
+            video: Objeto Video
+            extension: Extensão do arquivo, sem o ponto
 
         Returns:
-            Caminho do arquivo PDF criado ou None se falhar
+            Nome de arquivo baseado no título sanitizado
         """
-        if not video.transcript:
-            return None
+        return FileService.safe_filename(video.title, extension)
 
-        # Cria o diretório de saída
-        output_dir = PDFService.create_output_dir()
+    @staticmethod
+    def _wrap_text(pdf: FPDF, text: str, max_width: float) -> List[str]:
+        """Quebra o texto em linhas que caibam na largura informada.
 
-        # Sanitiza o título para usar como nome de arquivo
-        safe_title = re.sub(r'[\\/*?:"<>|]', "", video.title)
-        safe_title = safe_title[:100]  # Limita o tamanho do título
+        Faz uma única passada pelas palavras, medindo cada palavra distinta
+        apenas uma vez e somando as larguras, em vez de medir a linha inteira
+        a cada palavra. O custo cresce de forma linear com o tamanho do texto.
+
+        Args:
+            pdf: Documento com a fonte atual já definida
+            text: Texto a ser quebrado
+            max_width: Largura máxima de cada linha
+
+        Returns:
+            Lista de linhas
+        """
+        space_width = pdf.get_string_width(" ")
+        word_widths = {}
 
-        pdf = FPDF()
+        lines = []
+        current_words = []
+        current_width = 0.0
+
+        for word in text.split():
+            width = word_widths.get(word)
+            if width is None:
+                width = word_widths[word] = pdf.get_string_width(word)
+
+            if not current_words:
+                current_words.append(word)
+                current_width = width
+            elif current_width + space_width + width < max_width:
+                current_words.append(word)
+                current_width += space_width + width
+            else:
+                lines.append(" ".join(current_words))
+                current_words = [word]
+                current_width = width
+
+        if current_words:
+            lines.append(" ".join(current_words))
+
+        return lines
+
+    @staticmethod
+    def _build_pdf(video: Video) -> FPDF:
+        """Monta o documento PDF da transcrição em memória."""
+        pdf = PDFDocument()
         pdf.add_page()
-        pdf.set_font("Arial", size=12)
+
+        if isinstance(video.transcript, TranscriptSegments):
+            # Usa o buffer de texto já existente, sem reconstruí-lo
+            full_text = video.transcript.full_text
+        else:
+            full_text = " ".join(item.text for item in video.transcript)
+
+        # Fontes com os caracteres do idioma; o título pode usar outra escrita
+        language = getattr(video, 'language_used', None)
+        channel = getattr(video, 'channel', None) or ""
+        header_font = PDFFonts.select(language, video.title[:70] + channel)
+        body_font = PDFFonts.select(language, full_text)
 
         # Adiciona o título
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(200, 10, txt=video.title[:70], ln=True, align='C')
+        header_font.set(pdf, 'B', 16)
+        pdf.cell(200, 10, txt=header_font.text(video.title[:70]), ln=True, align='C')
         pdf.ln(10)
 
-        # Adiciona o ID do vídeo e o idioma utilizado
-        pdf.set_font("Arial", 'I', 10)
+        # Adiciona o ID do vídeo, o canal e o idioma utilizado
+        header_font.set(pdf, 'I', 10)
         pdf.cell(200, 10, txt=f"Video ID: {video.id}", ln=True, align='L')
-        if hasattr(video, 'language_used') and video.language_used:
-            pdf.cell(200, 10, txt=f"Idioma: {video.language_used}", ln=True, align='L')
+        if channel:
+            pdf.cell(200, 10, txt=f"Canal: {header_font.text(channel)}", ln=True, align='L')
+        if language:
+            pdf.cell(200, 10, txt=f"Idioma: {language}", ln=True, align='L')
         pdf.ln(5)
 
         # Adiciona a transcrição
-        pdf.set_font("Arial", size=12)
-
-        full_text = ""
-        for item in video.transcript:
-            full_text += item.text + " "
-
-        # Quebra o texto em linhas para caber na página
-        lines = []
-        words = full_text.split()
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            if pdf.get_string_width(test_line) < 180:  # Largura da página menos margens
-                current_line = test_line
+        body_font.set(pdf, size=12)
+
+        # Quebra o texto em linhas para caber na página. As linhas com mais de
+        # uma palavra já cabem na largura e vão direto para cell, sem que o
+        # multi_cell meça cada caractere de novo; só uma palavra mais longa
+        # que a linha precisa ser quebrada por ele
+        for line in PDFService._wrap_text(pdf, body_font.text(full_text), PDFService.TEXT_WIDTH):
+            if " " in line or pdf.get_string_width(line) < PDFService.TEXT_WIDTH:
+                pdf.cell(0, 10, txt=line, ln=1)
             else:
-                lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
-
-        for line in lines:
-            pdf.multi_cell(0, 10, txt=line)
+                pdf.multi_cell(0, 10, txt=line)
 
         # Adiciona informações de rodapé
         pdf.set_y(-30)
-        pdf.set_font("Arial", 'I', 8)
+        body_font.set(pdf, 'I', 8)
         pdf.cell(0, 10, txt="Gerado por TranscriptTube - https://github.com/israelermel/TranscriptTube", border=0, ln=0,
                  align='C')
 
+        return pdf
+
+    @staticmethod
+    def render_pdf(video: Video) -> Optional[bytes]:
+        """Gera o PDF da transcrição diretamente em memória.
+
+        Args:
+            video: Objeto Video contendo a transcrição
+
+        Returns:
+            Conteúdo do PDF em bytes ou None se o vídeo não tiver transcrição
+        """
+        if not video.transcript:
+            return None
+
+        with metrics.track_stage("pdf_layout"):
+            pdf = PDFService._build_pdf(video)
+        with metrics.track_stage("pdf_write"):
+            # O fpdf retorna o documento como str codificada em latin-1
+            data = pdf.output(dest='S').encode('latin-1')
+        metrics.BYTES_WRITTEN.inc(len(data), kind="pdf")
+        return data
+
+    @staticmethod
+    def create_pdf(video: Video) -> Optional[str]:
+        """Cria um arquivo PDF com a transcrição.
+
+        Args:
+            video: Objeto Video contendo a transcrição
+
+        Returns:
+            Caminho do arquivo PDF criado ou None se falhar
+        """
+        # Importado aqui: o módulo de exportadores importa o PDFService sob demanda
+        from api.exporters import get_exporter, render_cached
+        data = render_cached(get_exporter("pdf"), video)
+        if data is None:
+            return None
+
+        # Cria o diretório de saída
+        output_dir = PDFService.create_output_dir()
+
         # Gera o arquivo com caminho completo
-        filename = os.path.join(output_dir, f"{safe_title}.pdf")
-        pdf.output(filename)
+        filename = os.path.join(output_dir, PDFService.get_filename(video))
+        with open(filename, "wb") as f:
+            f.write(data)
+
+        return filename
 
-        return filename
\ No newline at end of file
@@ -0,0 +1,372 @@
+# api/search_service.py
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from models.data_models import SearchHit, SearchResult, TranscriptSegments, Video
+from api.file_service import FileService
+from utils import config, metrics
+
+# Transcrição aguardando indexação: (ID do vídeo, idioma, título, segmentos)
+IndexEntry = Tuple[str, str, str, TranscriptSegments]
+
+
+class SearchIndex:
+    """Índice de busca de texto completo das transcrições em SQLite FTS5.
+
+    Cada segmento é uma linha da tabela FTS5, com o ID do vídeo, o idioma e o
+    instante de início em colunas não indexadas. Os segmentos de uma
+    transcrição recebem rowids consecutivos, registrados na tabela videos, de
+    modo que regravar uma transcrição remove apenas esse intervalo. Uma
+    transcrição já indexada só é regravada se o conteúdo mudar.
+    """
+
+    def __init__(self, path: str):
+        """Abre (ou cria) o índice no caminho informado.
+
+        Raises:
+            sqlite3.OperationalError: Se o SQLite não tiver suporte a FTS5
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS videos ("
+                "video_id TEXT NOT NULL, "
+                "language TEXT NOT NULL, "
+                "title TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL, "
+                "first_rowid INTEGER NOT NULL, "
+                "segment_count INTEGER NOT NULL, "
+                "indexed_at REAL NOT NULL, "
+                "PRIMARY KEY (video_id, language))"
+            )
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5("
+                "text, video_id UNINDEXED, language UNINDEXED, start UNINDEXED, "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _fingerprint(segments: TranscriptSegments) -> str:
+        content = hashlib.sha1(segments.starts.tobytes())
+        content.update(segments.full_text.encode("utf-8"))
+        return content.hexdigest()
+
+    def add(self, entries: List[IndexEntry]) -> int:
+        """Indexa várias transcrições em uma única transação.
+
+        Args:
+            entries: Tuplas (ID do vídeo, idioma, título, segmentos)
+
+        Returns:
+            Quantidade de transcrições (re)indexadas
+        """
+        now = time.time()
+        with self._lock:
+            # A CLI e a interface web compartilham o índice: o próximo rowid só
+            # é lido depois de obter o bloqueio de escrita do banco
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                indexed = self._add_locked(entries, now)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return indexed
+
+    def _add_locked(self, entries: List[IndexEntry], now: float) -> int:
+        """Grava as transcrições dentro da transação aberta por `add`."""
+        indexed = 0
+        for video_id, language, title, segments in entries:
+            fingerprint = self._fingerprint(segments)
+            row = self._conn.execute(
+                "SELECT fingerprint, title, first_rowid, segment_count FROM videos "
+                "WHERE video_id = ? AND language = ?",
+                (video_id, language)
+            ).fetchone()
+            if row is not None and row[0] == fingerprint:
+                if row[1] != title:
+                    self._conn.execute(
+                        "UPDATE videos SET title = ? WHERE video_id = ? AND language = ?",
+                        (title, video_id, language)
+                    )
+                continue
+
+            if row is not None:
+                self._conn.execute("DELETE FROM segments WHERE rowid BETWEEN ? AND ?",
+                                   (row[2], row[2] + row[3] - 1))
+
+            last = self._conn.execute("SELECT rowid FROM segments ORDER BY rowid DESC LIMIT 1").fetchone()
+            first_rowid = (last[0] if last else 0) + 1
+            self._conn.executemany(
+                "INSERT INTO segments (rowid, text, video_id, language, start) VALUES (?, ?, ?, ?, ?)",
+                ((first_rowid + i, segments.text_at(i), video_id, language, segments.starts[i])
+                 for i in range(len(segments)))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos "
+                "(video_id, language, title, fingerprint, first_rowid, segment_count, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, language, title, fingerprint, first_rowid, len(segments), now)
+            )
+            indexed += 1
+        return indexed
+
+    def search(self, match: str, limit: int, language: Optional[str] = None,
+               hits_per_video: Optional[int] = None) -> List[tuple]:
+        """Executa a consulta FTS5 e retorna os segmentos mais relevantes.
+
+        A relevância (bm25) é calculada sobre todos os segmentos que casam, e
+        não apenas sobre os mais recentes.
+
+        Args:
+            match: Consulta FTS5
+            limit: Número máximo de segmentos retornados
+            language: Restringe a busca a um idioma (opcional)
+            hits_per_video: Se informado, retorna no máximo essa quantidade de
+                segmentos por transcrição, agrupados por transcrição na ordem
+                do seu segmento mais relevante
+
+        Returns:
+            Tuplas (ID do vídeo, idioma, título, início, trecho destacado)
+        """
+        # O FTS5 ordena por rank internamente, então o trecho destacado só é
+        # calculado para os segmentos de cada página
+        sql = ("SELECT video_id, language, start, snippet(segments, 0, '**', '**', '…', 16) "
+               "FROM segments WHERE segments MATCH ?")
+        params: list = [match]
+        if language:
+            sql += " AND language = ?"
+            params.append(language)
+        sql += " ORDER BY rank LIMIT ? OFFSET ?"
+
+        with self._lock:
+            if not hits_per_video:
+                rows = self._conn.execute(sql, params + [limit, 0]).fetchall()
+            else:
+                rows = self._group_hits(sql, params, limit, hits_per_video)
+            return self._with_titles(rows)
+
+    def _group_hits(self, sql: str, params: list, limit: int, hits_per_video: int) -> List[tuple]:
+        """Lê os segmentos por relevância, em páginas crescentes, até preencher os vídeos.
+
+        Cada página é um "ORDER BY rank LIMIT", que o FTS5 resolve sem ordenar
+        todos os segmentos que casam; quase sempre a primeira basta.
+        """
+        max_videos = max(1, limit // hits_per_video)
+        groups = {}
+        offset = 0
+        page = limit
+        while True:
+            rows = self._conn.execute(sql, params + [page, offset]).fetchall()
+            for row in rows:
+                hits = groups.get((row[0], row[1]))
+                if hits is None:
+                    if len(groups) >= max_videos:
+                        continue
+                    hits = groups[(row[0], row[1])] = []
+                if len(hits) < hits_per_video:
+                    hits.append(row)
+            if len(rows) < page or len(groups) >= max_videos:
+                break
+            offset += page
+            page *= 2
+        return [row for hits in groups.values() for row in hits]
+
+    def _with_titles(self, rows: List[tuple]) -> List[tuple]:
+        """Acrescenta o título da transcrição a cada segmento."""
+        titles = {}
+        for video_id, language, _, _ in rows:
+            if (video_id, language) not in titles:
+                found = self._conn.execute(
+                    "SELECT title FROM videos WHERE video_id = ? AND language = ?", (video_id, language)
+                ).fetchone()
+                titles[(video_id, language)] = found[0] if found else video_id
+        return [(video_id, language, titles[(video_id, language)], start, snippet)
+                for video_id, language, start, snippet in rows]
+
+    def count(self) -> Tuple[int, int]:
+        """Retorna a quantidade de transcrições e de segmentos indexados."""
+        with self._lock:
+            videos = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            segments = self._conn.execute("SELECT COALESCE(SUM(segment_count), 0) FROM videos").fetchone()[0]
+        return videos, segments
+
+
+class SearchService:
+    """Busca nas transcrições já obtidas, sem baixá-las de novo.
+
+    O TranscriptService entrega cada transcrição resolvida a `index_video`,
+    que apenas a coloca em uma fila; uma thread grava as transcrições no
+    índice em lotes, sem atrasar as buscas no YouTube. Com a fila cheia,
+    `index_video` espera no máximo PUT_TIMEOUT por espaço e depois enfileira
+    a transcrição mesmo assim, então nenhuma transcrição deixa de ser indexada.
+    """
+
+    # Transcrições na fila a partir das quais quem enfileira espera pela gravação
+    QUEUE_SIZE = 64
+    # Espera máxima (s) por espaço na fila antes de enfileirar além do limite
+    PUT_TIMEOUT = 0.05
+    # Transcrições gravadas por transação
+    BATCH_SIZE = 32
+
+    _index: Optional[SearchIndex] = None
+    _unavailable = False
+    _lock = threading.Lock()
+    _pending: Deque[IndexEntry] = deque()
+    # Transcrições retiradas da fila cuja gravação ainda não terminou
+    _writing = 0
+    _pending_changed = threading.Condition()
+    _writer: Optional[threading.Thread] = None
+
+    @staticmethod
+    def get_index() -> Optional[SearchIndex]:
+        """Retorna o índice de busca (ou None se desativado ou sem suporte a FTS5)."""
+        if not config.SEARCH_INDEX_ENABLED:
+            return None
+
+        with SearchService._lock:
+            if SearchService._index is None and not SearchService._unavailable:
+                path = os.path.join(FileService.create_cache_dir(), "search.sqlite3")
+                try:
+                    SearchService._index = SearchIndex(path)
+                except sqlite3.OperationalError as e:
+                    print(f"Índice de busca indisponível (o SQLite precisa de FTS5): {str(e)}")
+                    SearchService._unavailable = True
+            return SearchService._index
+
+    @staticmethod
+    def _start_writer() -> None:
+        with SearchService._lock:
+            if SearchService._writer is None:
+                SearchService._writer = threading.Thread(target=SearchService._write_loop,
+                                                         name="search-index", daemon=True)
+                SearchService._writer.start()
+                # Grava o que ainda estiver na fila ao encerrar (por exemplo, na CLI)
+                atexit.register(SearchService.flush)
+
+    @staticmethod
+    def index_video(video: Video) -> None:
+        """Coloca a transcrição do vídeo na fila de indexação.
+
+        Espera no máximo PUT_TIMEOUT se a gravação estiver atrasada.
+
+        Args:
+            video: Vídeo com a transcrição e o idioma utilizado
+        """
+        if not video.transcript or not video.language_used or SearchService.get_index() is None:
+            return
+        segments = video.transcript
+        if not isinstance(segments, TranscriptSegments):
+            segments = TranscriptSegments.from_items(segments)
+
+        SearchService._start_writer()
+        pending = SearchService._pending
+        with SearchService._pending_changed:
+            if len(pending) >= SearchService.QUEUE_SIZE:
+                SearchService._pending_changed.wait_for(lambda: len(pending) < SearchService.QUEUE_SIZE,
+                                                        timeout=SearchService.PUT_TIMEOUT)
+            # Mesmo sem espaço a transcrição entra na fila: a gravação atrasada
+            # não segura a busca da transcrição nem faz a indexação se perder
+            pending.append((video.id, video.language_used, video.title, segments))
+            SearchService._pending_changed.notify_all()
+
+    @staticmethod
+    def _write_loop() -> None:
+        """Grava as transcrições da fila no índice, em lotes."""
+        pending = SearchService._pending
+        while True:
+            with SearchService._pending_changed:
+                SearchService._pending_changed.wait_for(lambda: pending)
+                batch = [pending.popleft() for _ in range(min(len(pending), SearchService.BATCH_SIZE))]
+                SearchService._writing = len(batch)
+                SearchService._pending_changed.notify_all()
+            try:
+                with metrics.track_stage("search_index"):
+                    SearchService.get_index().add(batch)
+            except Exception as e:
+                metrics.FAILURES.inc(stage="search_index", kind=type(e).__name__)
+                print(f"Erro ao indexar transcrições: {str(e)}")
+            finally:
+                with SearchService._pending_changed:
+                    SearchService._writing = 0
+                    SearchService._pending_changed.notify_all()
+
+    @staticmethod
+    def flush() -> None:
+        """Aguarda a gravação de todas as transcrições enfileiradas."""
+        if SearchService._writer is None:
+            return
+        with SearchService._pending_changed:
+            SearchService._pending_changed.wait_for(
+                lambda: not SearchService._pending and not SearchService._writing)
+
+    @staticmethod
+    def deep_link(video_id: str, start: float) -> str:
+        """Retorna o link do vídeo no instante informado."""
+        return f"https://www.youtube.com/watch?v={video_id}&t={int(start)}s"
+
+    @staticmethod
+    def _build_match(query: str) -> Optional[str]:
+        """Converte o texto digitado em uma consulta FTS5 segura.
+
+        Cada palavra vira um termo entre aspas (todas precisam aparecer no
+        segmento); a última também casa como prefixo.
+        """
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        if not terms:
+            return None
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    @staticmethod
+    def search(query: str, limit: int = 20, hits_per_video: int = 3,
+               language: Optional[str] = None) -> List[SearchResult]:
+        """Busca os vídeos cujas transcrições contêm o texto informado.
+
+        Args:
+            query: Palavras buscadas
+            limit: Número máximo de vídeos retornados
+            hits_per_video: Número máximo de trechos por vídeo
+            language: Restringe a busca a um idioma (opcional)
+
+        Returns:
+            Vídeos por relevância, cada um com os trechos e links para o momento do vídeo
+        """
+        index = SearchService.get_index()
+        match = SearchService._build_match(query)
+        if index is None or match is None:
+            return []
+
+        with metrics.track_stage("search_query"):
+            # Os segmentos chegam agrupados por vídeo, já na ordem de relevância
+            rows = index.search(match, limit * hits_per_video, language, hits_per_video)
+
+        results: List[SearchResult] = []
+        by_video = {}
+        for video_id, video_language, title, start, snippet in rows:
+            key = (video_id, video_language)
+            result = by_video.get(key)
+            if result is None:
+                if len(results) >= limit:
+                    continue
+                result = by_video[key] = SearchResult(video_id=video_id, title=title, language=video_language)
+                results.append(result)
+            if len(result.hits) < hits_per_video:
+                result.hits.append(SearchHit(start=start, snippet=snippet,
+                                             url=SearchService.deep_link(video_id, start)))
+        return results
@@ -1,35 +1,374 @@
 # api/transcript_service.py
+import os
+import threading
+import time
+from dataclasses import asdict
 from youtube_transcript_api import YouTubeTranscriptApi, _errors
-from typing import List, Optional
-from models.data_models import TranscriptItem, Video, Playlist
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from models.data_models import FetchResult, TranscriptInfo, TranscriptResolution, TranscriptSegments, Video, Playlist
+from api.concurrent_fetcher import ConcurrentFetcher
+from api.file_service import FileService
+from api.search_service import SearchService
+from utils import config
+from utils.disk_cache import DiskCache
+from utils.single_flight import SingleFlight
+from utils.rate_limiter import AdaptiveLimiter, TokenBucket
+from utils.retry import CircuitBreaker, RetryPolicy
+from utils import metrics
 
 
 class TranscriptService:
+    # Idiomas usados quando o usuário não informa nenhuma preferência
+    DEFAULT_LANGUAGES = ['pt', 'en']
+
+    # Classes de falha ao obter transcrições
+    FAILURE_PERMANENT = "permanent"
+    FAILURE_TRANSIENT = "transient"
+
+    # Erros que não mudam ao tentar novamente (vídeo sem legendas, removido etc.)
+    PERMANENT_ERRORS = (
+        _errors.NoTranscriptFound,
+        _errors.NoTranscriptAvailable,
+        _errors.TranscriptsDisabled,
+        _errors.VideoUnavailable,
+        _errors.InvalidVideoId,
+    )
+
+    # Cache persistente de transcrições, criado sob demanda
+    _cache: Optional[DiskCache] = None
+    _cache_lock = threading.Lock()
+
+    # Limite de requisições por segundo, novas tentativas, pausa após limitação
+    # repetida e controle de concorrência, compartilhados por todas as buscas
+    # do processo (trabalhos, sessões e CLI)
+    rate_limiter = TokenBucket(config.FETCH_REQUESTS_PER_SECOND, config.FETCH_BURST)
+    retry_policy = RetryPolicy(config.RETRY_MAX_ATTEMPTS, config.RETRY_BASE_DELAY, config.RETRY_MAX_DELAY)
+    circuit_breaker = CircuitBreaker(config.CIRCUIT_BREAKER_THRESHOLD, config.CIRCUIT_BREAKER_COOLDOWN)
+    concurrency = AdaptiveLimiter(
+        config.ADAPTIVE_MIN_CONCURRENCY,
+        config.ADAPTIVE_MAX_CONCURRENCY,
+        initial_limit=config.FETCH_MAX_WORKERS
+    )
+
+    # Agrupa buscas simultâneas do mesmo vídeo e idiomas (várias sessões pedindo a mesma playlist)
+    _in_flight = SingleFlight()
+
     @staticmethod
-    def get_transcript(video_id: str, languages: List[str] = None) -> Optional[List[dict]]:
-        """Obtém a transcrição do vídeo usando a API de transcrição do YouTube.
+    def get_cache() -> Optional[DiskCache]:
+        """Retorna o cache persistente de transcrições (ou None se desativado).
+
+        O cache fica em um arquivo SQLite no diretório de cache, de modo que
+        é compartilhado entre sessões e processos da mesma instalação.
+        """
+        if not config.TRANSCRIPT_CACHE_ENABLED:
+            return None
+
+        with TranscriptService._cache_lock:
+            if TranscriptService._cache is None:
+                path = os.path.join(FileService.create_cache_dir(), "transcripts.sqlite3")
+                TranscriptService._cache = DiskCache(
+                    path,
+                    ttl=config.TRANSCRIPT_CACHE_TTL,
+                    max_bytes=config.TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024
+                )
+            return TranscriptService._cache
+
+    @staticmethod
+    def _listing_key(video_id: str) -> str:
+        return f"listing:{video_id}"
+
+    @staticmethod
+    def _transcript_key(video_id: str, language_code: str) -> str:
+        return f"transcript:{video_id}:{language_code}"
+
+    @staticmethod
+    def _failure_key(video_id: str, languages: Optional[List[str]] = None) -> str:
+        if languages:
+            return f"failure:{video_id}:{','.join(languages)}"
+        return f"failure:{video_id}"
+
+    @staticmethod
+    def classify_error(error: Exception) -> str:
+        """Classifica um erro como falha permanente ou transitória.
+
+        Falhas permanentes (sem transcrição, legendas desativadas, vídeo
+        indisponível) não mudam ao tentar novamente; as demais (rede,
+        limitação de requisições) podem ser repetidas.
+
+        Args:
+            error: Exceção lançada ao obter a transcrição
+
+        Returns:
+            FAILURE_PERMANENT ou FAILURE_TRANSIENT
+        """
+        if isinstance(error, TranscriptService.PERMANENT_ERRORS):
+            return TranscriptService.FAILURE_PERMANENT
+        return TranscriptService.FAILURE_TRANSIENT
+
+    @staticmethod
+    def is_throttling(error: Exception) -> bool:
+        """Indica se o erro é uma recusa por excesso de requisições (HTTP 429)."""
+        if isinstance(error, _errors.TooManyRequests):
+            return True
+        response = getattr(error, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return True
+        # YouTubeRequestFailed traz a mensagem do HTTPError ("429 Client Error: Too Many Requests")
+        return "Too Many Requests" in str(error)
+
+    @staticmethod
+    def _call_upstream(fn: Callable[[], Any], stage: str = "upstream") -> Any:
+        """Executa uma requisição ao YouTube com novas tentativas e controle de carga.
+
+        Cada tentativa consome um token do limite de requisições por segundo
+        do processo. Falhas transitórias são repetidas com backoff exponencial e jitter.
+        Cada resposta ajusta o limite adaptativo de requisições simultâneas, e
+        falhas de limitação consecutivas abrem o circuit breaker, pausando
+        todas as buscas. Falhas permanentes (sem legendas, vídeo removido) são
+        respostas válidas do servidor e não são repetidas.
+
+        Args:
+            fn: Função sem argumentos que faz a requisição
+            stage: Nome da etapa nas métricas (transcript_list, transcript_fetch)
+
+        Raises:
+            Exception: O erro da última tentativa, se todas falharem
+        """
+        policy = TranscriptService.retry_policy
+        breaker = TranscriptService.circuit_breaker
+        limiter = TranscriptService.concurrency
+
+        attempt = 0
+        while True:
+            probe = breaker.before_call()
+            try:
+                TranscriptService.rate_limiter.acquire()
+                limiter.acquire()
+                try:
+                    with metrics.track_stage(stage):
+                        result = fn()
+                except Exception as e:
+                    kind = TranscriptService.classify_error(e)
+                    transient = kind == TranscriptService.FAILURE_TRANSIENT
+                    throttled = transient and TranscriptService.is_throttling(e)
+                    limiter.release(success=not transient)
+                    metrics.FAILURES.inc(stage=stage, kind="throttled" if throttled else kind)
+                    if not transient:
+                        breaker.record_success()
+                        TranscriptService._update_load_metrics()
+                        raise
+                    if throttled:
+                        breaker.record_failure()
+                    TranscriptService._update_load_metrics()
+                    if not policy.should_retry(attempt):
+                        raise
+                    delay = policy.delay(attempt)
+                    metrics.RETRIES.inc(reason="throttled" if throttled else "transient")
+                    print(f"Falha temporária ao acessar o YouTube ({type(e).__name__}); "
+                          f"tentativa {attempt + 2} de {policy.max_attempts} em {delay:.1f}s")
+                except BaseException:
+                    # Interrompida (KeyboardInterrupt, SystemExit): só devolve a vaga
+                    limiter.release(success=None)
+                    raise
+                else:
+                    limiter.release(success=True)
+                    breaker.record_success()
+                    TranscriptService._update_load_metrics()
+                    return result
+            finally:
+                # Uma chamada de teste que falhou por outro motivo (rede, 5xx) ou
+                # foi interrompida não pode deixar as demais esperando para sempre
+                breaker.release_probe(probe)
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _update_load_metrics() -> None:
+        """Publica o limite de concorrência e o estado do circuit breaker."""
+        metrics.UPSTREAM_CONCURRENCY.set(TranscriptService.concurrency.limit)
+        metrics.CIRCUIT_OPEN.set(0 if TranscriptService.circuit_breaker.state == CircuitBreaker.CLOSED else 1)
+
+    @staticmethod
+    def _remember_failure(cache: Optional[DiskCache], resolution: TranscriptResolution,
+                          languages: Optional[List[str]] = None) -> None:
+        """Guarda uma falha permanente no cache com o TTL de falhas."""
+        if cache is None or resolution.failure_kind != TranscriptService.FAILURE_PERMANENT:
+            return
+
+        cache.set_json(
+            TranscriptService._failure_key(resolution.video_id, languages),
+            {
+                'error': resolution.error,
+                'available_transcripts': [asdict(info) for info in resolution.available_transcripts]
+            },
+            ttl=config.NEGATIVE_CACHE_TTL
+        )
+
+    @staticmethod
+    def _cached_failure(cache: DiskCache, video_id: str, languages: List[str]) -> Optional[TranscriptResolution]:
+        """Retorna a falha permanente conhecida para o vídeo, se houver."""
+        failure = (cache.get_json(TranscriptService._failure_key(video_id))
+                   or cache.get_json(TranscriptService._failure_key(video_id, languages)))
+        if failure is None:
+            return None
+
+        return TranscriptResolution(
+            video_id=video_id,
+            available_transcripts=[TranscriptInfo(**info) for info in failure['available_transcripts']],
+            error=failure['error'],
+            failure_kind=TranscriptService.FAILURE_PERMANENT
+        )
+
+    @staticmethod
+    def _build_transcript_infos(transcript_list) -> List[TranscriptInfo]:
+        """Converte a listagem da API em objetos TranscriptInfo."""
+        return [
+            TranscriptInfo(
+                language_code=transcript.language_code,
+                language=transcript.language,
+                is_generated=transcript.is_generated,
+                is_translatable=transcript.is_translatable
+            )
+            for transcript in transcript_list
+        ]
+
+    @staticmethod
+    def _choose_language(available_transcripts: List[TranscriptInfo], languages: List[str]) -> Optional[str]:
+        """Escolhe o primeiro idioma da preferência que esteja disponível."""
+        available_codes = {info.language_code for info in available_transcripts}
+        for language in languages:
+            if language in available_codes:
+                return language
+        return None
+
+    @staticmethod
+    def _resolve_from_cache(cache: DiskCache, video_id: str, languages: List[str]) -> Optional[TranscriptResolution]:
+        """Tenta resolver a transcrição apenas com dados do cache.
+
+        Returns:
+            TranscriptResolution completa ou None se faltar algum dado no cache
+        """
+        listing = cache.get_json(TranscriptService._listing_key(video_id))
+        if listing is None:
+            return None
+
+        available_transcripts = [TranscriptInfo(**info) for info in listing]
+        resolution = TranscriptResolution(video_id=video_id, available_transcripts=available_transcripts)
+
+        language = TranscriptService._choose_language(available_transcripts, languages)
+        if language is None:
+            return None
+
+        transcript = cache.get_json(TranscriptService._transcript_key(video_id, language))
+        if transcript is None:
+            return None
+
+        resolution.transcript = transcript
+        resolution.language_used = language
+        return resolution
+
+    @staticmethod
+    def resolve_transcript(video_id: str, languages: List[str] = None) -> TranscriptResolution:
+        """Resolve a transcrição de um vídeo com uma única listagem.
+
+        Obtém a lista de transcrições uma só vez, escolhe o melhor idioma
+        segundo a ordem de preferência e baixa apenas essa transcrição.
+        Quando a listagem e a transcrição estão no cache persistente, nenhuma
+        requisição de rede é feita. Falhas permanentes também ficam em cache
+        (com TTL próprio, menor), para que execuções seguintes as ignorem.
 
         Args:
             video_id: ID do vídeo do YouTube
-            languages: Lista de códigos de idioma para tentar obter a transcrição,
-                       por ordem de preferência
+            languages: Lista de códigos de idioma por ordem de preferência
 
         Returns:
-            Lista de segmentos de transcrição ou None se não encontrar
+            TranscriptResolution com os idiomas disponíveis, a transcrição
+            escolhida e o idioma utilizado
         """
         if languages is None or len(languages) == 0:
             # Padrão: tenta primeiro português, depois inglês
-            languages = ['pt', 'en']
+            languages = TranscriptService.DEFAULT_LANGUAGES
+
+        # Chamadores simultâneos com o mesmo vídeo e idiomas compartilham uma única busca
+        return TranscriptService._in_flight.do(
+            (video_id, tuple(languages)),
+            lambda: TranscriptService._resolve_transcript(video_id, languages)
+        )
+
+    @staticmethod
+    def _resolve_transcript(video_id: str, languages: List[str]) -> TranscriptResolution:
+        """Resolve a transcrição consultando o cache e, se necessário, a rede."""
+        cache = TranscriptService.get_cache()
+        if cache is not None:
+            cached = TranscriptService._resolve_from_cache(cache, video_id, languages)
+            if cached is not None:
+                metrics.CACHE_REQUESTS.inc(kind="transcript", result="hit")
+                return cached
+
+            failure = TranscriptService._cached_failure(cache, video_id, languages)
+            if failure is not None:
+                metrics.CACHE_REQUESTS.inc(kind="failure", result="hit")
+                return failure
+
+            metrics.CACHE_REQUESTS.inc(kind="transcript", result="miss")
+
+        try:
+            transcript_list = TranscriptService._call_upstream(
+                lambda: YouTubeTranscriptApi.list_transcripts(video_id), "transcript_list"
+            )
+        except Exception as e:
+            print(f"Erro ao listar transcrições disponíveis: {str(e)}")
+            resolution = TranscriptResolution(
+                video_id=video_id,
+                error=str(e),
+                failure_kind=TranscriptService.classify_error(e)
+            )
+            TranscriptService._remember_failure(cache, resolution)
+            return resolution
+
+        available_transcripts = TranscriptService._build_transcript_infos(transcript_list)
+        resolution = TranscriptResolution(video_id=video_id, available_transcripts=available_transcripts)
+        if cache is not None:
+            cache.set_json(TranscriptService._listing_key(video_id), [asdict(info) for info in available_transcripts])
 
         try:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-            return transcript
-        except _errors.NoTranscriptFound:
+            transcript = transcript_list.find_transcript(languages)
+            resolution.transcript = TranscriptService._call_upstream(transcript.fetch, "transcript_fetch")
+            resolution.language_used = transcript.language_code
+        except _errors.NoTranscriptFound as e:
             print(f"Nenhuma transcrição encontrada para o vídeo ID: {video_id} nos idiomas: {languages}")
-            return None
+            resolution.error = str(e)
+            resolution.failure_kind = TranscriptService.FAILURE_PERMANENT
+            # A falha depende dos idiomas pedidos, então a chave inclui a preferência
+            TranscriptService._remember_failure(cache, resolution, languages)
         except Exception as e:
             print(f"Erro ao obter transcrição: {str(e)}")
-            return None
+            resolution.error = str(e)
+            resolution.failure_kind = TranscriptService.classify_error(e)
+            TranscriptService._remember_failure(cache, resolution)
+
+        if cache is not None and resolution.transcript:
+            cache.set_json(
+                TranscriptService._transcript_key(video_id, resolution.language_used),
+                resolution.transcript
+            )
+
+        return resolution
+
+    @staticmethod
+    def get_transcript(video_id: str, languages: List[str] = None) -> Optional[List[dict]]:
+        """Obtém a transcrição do vídeo usando a API de transcrição do YouTube.
+
+        Args:
+            video_id: ID do vídeo do YouTube
+            languages: Lista de códigos de idioma para tentar obter a transcrição,
+                       por ordem de preferência
+
+        Returns:
+            Lista de segmentos de transcrição ou None se não encontrar
+        """
+        return TranscriptService.resolve_transcript(video_id, languages).transcript
 
     @staticmethod
     def list_available_transcripts(video_id: str) -> List[dict]:
@@ -41,18 +380,22 @@ class TranscriptService:
         Returns:
             Lista de dicionários com informações das transcrições disponíveis
         """
+        cache = TranscriptService.get_cache()
+        if cache is not None:
+            listing = cache.get_json(TranscriptService._listing_key(video_id))
+            if listing is not None:
+                return listing
+
         try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-
-            available_transcripts = []
-            for transcript in transcript_list:
-                transcript_info = {
-                    'language_code': transcript.language_code,
-                    'language': transcript.language,
-                    'is_generated': transcript.is_generated,
-                    'is_translatable': transcript.is_translatable
-                }
-                available_transcripts.append(transcript_info)
+            transcript_list = TranscriptService._call_upstream(
+                lambda: YouTubeTranscriptApi.list_transcripts(video_id), "transcript_list"
+            )
+            available_transcripts = [
+                asdict(info) for info in TranscriptService._build_transcript_infos(transcript_list)
+            ]
+
+            if cache is not None:
+                cache.set_json(TranscriptService._listing_key(video_id), available_transcripts)
 
             return available_transcripts
         except Exception as e:
@@ -63,6 +406,9 @@ class TranscriptService:
     def add_transcript_to_video(video: Video, languages: List[str] = None) -> Video:
         """Adiciona a transcrição ao objeto de vídeo.
 
+        Também preenche os idiomas disponíveis e o idioma efetivamente usado,
+        tudo a partir de uma única listagem de transcrições.
+
         Args:
             video: Objeto Video a ser atualizado
             languages: Lista de códigos de idioma para tentar obter a transcrição
@@ -70,26 +416,99 @@ class TranscriptService:
         Returns:
             Objeto Video atualizado com a transcrição
         """
-        raw_transcript = TranscriptService.get_transcript(video.id, languages)
-        if raw_transcript:
-            transcript_items = [
-                TranscriptItem(text=item['text'], start=item['start'], duration=item['duration'])
-                for item in raw_transcript
-            ]
-            video.transcript = transcript_items
+        resolution = TranscriptService.resolve_transcript(video.id, languages)
+        return TranscriptService._apply_resolution(video, resolution)
+
+    @staticmethod
+    def _apply_resolution(video: Video, resolution: TranscriptResolution) -> Video:
+        """Copia o resultado de uma resolução para o objeto de vídeo."""
+        video.available_transcripts = resolution.available_transcripts
+        if resolution.transcript:
+            video.transcript = TranscriptSegments.from_raw(resolution.transcript)
+            video.language_used = resolution.language_used
+            metrics.VIDEOS_PROCESSED.inc(result="ok")
+            # Atualiza o índice de busca (em segundo plano; ignora transcrições já indexadas)
+            SearchService.index_video(video)
+        elif resolution.failure_kind == TranscriptService.FAILURE_TRANSIENT:
+            metrics.VIDEOS_PROCESSED.inc(result="failed")
+        else:
+            metrics.VIDEOS_PROCESSED.inc(result="missing")
         return video
 
     @staticmethod
-    def add_transcripts_to_playlist(playlist: Playlist, languages: List[str] = None) -> Playlist:
+    def _fetch_video(video: Video, languages: List[str] = None) -> Optional[Video]:
+        """Resolve a transcrição de um vídeo dentro de um worker do pool.
+
+        Returns:
+            O vídeo atualizado ou None se não houver transcrição
+
+        Raises:
+            RuntimeError: Em falhas transitórias, para que sejam reportadas
+        """
+        resolution = TranscriptService.resolve_transcript(video.id, languages)
+        video = TranscriptService._apply_resolution(video, resolution)
+        if resolution.failure_kind == TranscriptService.FAILURE_TRANSIENT:
+            raise RuntimeError(resolution.error)
+        return video if video.transcript else None
+
+    @staticmethod
+    def iter_transcripts(videos: Iterable[Video], languages: List[str] = None,
+                         max_workers: Optional[int] = None) -> Iterator[FetchResult]:
+        """Busca as transcrições em paralelo e produz cada resultado assim que termina.
+
+        Args:
+            videos: Vídeos a serem atualizados (pode ser um gerador)
+            languages: Lista de códigos de idioma para tentar obter as transcrições
+            max_workers: Número máximo de buscas simultâneas
+
+        Yields:
+            FetchResult de cada vídeo, na ordem de conclusão
+        """
+        fetcher = ConcurrentFetcher(max_workers=max_workers)
+        return fetcher.iter_results(videos, lambda video: TranscriptService._fetch_video(video, languages))
+
+    @staticmethod
+    def fetch_transcripts(videos: List[Video], languages: List[str] = None,
+                          max_workers: Optional[int] = None,
+                          progress_callback: Optional[Callable[[int, FetchResult], None]] = None
+                          ) -> List[FetchResult]:
+        """Busca as transcrições de vários vídeos em paralelo.
+
+        As requisições são distribuídas entre um pool limitado de workers e
+        respeitam o limite de requisições por segundo do processo.
+
+        Args:
+            videos: Lista de vídeos a serem atualizados
+            languages: Lista de códigos de idioma para tentar obter as transcrições
+            max_workers: Número máximo de buscas simultâneas
+            progress_callback: Função chamada a cada vídeo concluído, recebendo
+                               o total concluído e o FetchResult do vídeo
+
+        Returns:
+            Lista de FetchResult na ordem da lista de vídeos; o `value` de cada
+            resultado é o próprio vídeo quando a transcrição foi obtida, e o
+            `error` é preenchido apenas em falhas transitórias
+        """
+        fetcher = ConcurrentFetcher(max_workers=max_workers)
+        return fetcher.run(
+            videos,
+            lambda video: TranscriptService._fetch_video(video, languages),
+            progress_callback=progress_callback
+        )
+
+    @staticmethod
+    def add_transcripts_to_playlist(playlist: Playlist, languages: List[str] = None,
+                                    progress_callback: Optional[Callable[[int, FetchResult], None]] = None
+                                    ) -> Playlist:
         """Adiciona transcrições a todos os vídeos na playlist.
 
         Args:
             playlist: Objeto Playlist a ser atualizado
             languages: Lista de códigos de idioma para tentar obter as transcrições
+            progress_callback: Função chamada a cada vídeo concluído (opcional)
 
         Returns:
             Objeto Playlist atualizado com transcrições
         """
-        for i, video in enumerate(playlist.videos):
-            playlist.videos[i] = TranscriptService.add_transcript_to_video(video, languages)
-        return playlist
\ No newline at end of file
+        TranscriptService.fetch_transcripts(playlist.videos, languages, progress_callback=progress_callback)
+        return playlist
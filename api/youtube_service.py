@@ -1,33 +1,145 @@
-import pytube
-from typing import List, Tuple, Optional
-from models.data_models import Video, Playlist
+import time
+from typing import Iterator, List, Tuple, Optional
+from models.data_models import Video, VideoMetadata, Playlist
+from api.metadata_service import MetadataPlaylist, MetadataService
 from utils.url_utils import extract_video_id
+from utils.single_flight import SingleFlight
+from utils import metrics
 
 
 class YouTubeService:
+    # Agrupa enumerações simultâneas da mesma playlist
+    _in_flight = SingleFlight()
+
+    # Classe usada para carregar playlists; guarda os dados dos vídeos de cada página
+    playlist_class = MetadataPlaylist
+
     @staticmethod
     def get_video_title(video_id: str) -> str:
-        """Obtém o título do vídeo."""
-        return f"Video_{video_id}"
+        """Obtém o título do vídeo (ou Video_<id> se não for possível obtê-lo)."""
+        return YouTubeService.get_video_details(video_id).title
 
     @staticmethod
-    def get_video_details(video_id: str) -> Video:
-        """Retorna o objeto Video com o título."""
-        title = YouTubeService.get_video_title(video_id)
-        return Video(id=video_id, title=title)
+    def _video_from_metadata(video_id: str, metadata: Optional[VideoMetadata]) -> Video:
+        if metadata is None:
+            return Video(id=video_id, title=f"Video_{video_id}")
+        return Video(id=video_id, title=metadata.title, duration=metadata.duration, channel=metadata.channel)
 
     @staticmethod
-    def get_playlist_videos(playlist_id: str) -> Tuple[List[str], str]:
-        """Obtém todos os vídeos de uma playlist."""
-        try:
-            playlist = pytube.Playlist(f'https://www.youtube.com/playlist?list={playlist_id}')
-            video_ids = []
+    def get_video_details(video_id: str, resolve: bool = True) -> Video:
+        """Retorna o objeto Video com o título, a duração e o canal.
+
+        Args:
+            video_id: ID do vídeo
+            resolve: Se False, usa apenas os dados já conhecidos (páginas de
+                playlist e cache), sem requisições
 
-            for url in playlist.video_urls:
+        Returns:
+            Video com os dados encontrados ou com o título Video_<id>
+        """
+        if resolve:
+            metadata = MetadataService.resolve([video_id]).get(video_id)
+        else:
+            metadata = MetadataService.lookup(video_id)
+        return YouTubeService._video_from_metadata(video_id, metadata)
+
+    @staticmethod
+    def get_videos_details(video_ids: List[str]) -> List[Video]:
+        """Retorna os objetos Video de vários vídeos, buscando os dados em paralelo."""
+        found = MetadataService.resolve(video_ids)
+        return [YouTubeService._video_from_metadata(video_id, found.get(video_id)) for video_id in video_ids]
+
+    @staticmethod
+    def _iter_video_ids(playlist: MetadataPlaylist) -> Iterator[str]:
+        """Produz os IDs dos vídeos à medida que cada página da playlist chega.
+
+        O tempo gasto esperando as páginas (sem contar o processamento do
+        consumidor) é registrado na etapa playlist_enumeration.
+
+        Raises:
+            Exception: O erro que interrompeu a leitura das páginas, depois
+                dos IDs já produzidos, para que o chamador saiba que a
+                playlist não foi lida até o fim
+        """
+        waited = 0.0
+        try:
+            urls = playlist.url_generator()
+            while True:
+                started = time.perf_counter()
+                url = next(urls, None)
+                waited += time.perf_counter() - started
+                if url is None:
+                    break
                 video_id = extract_video_id(url)
                 if video_id and not isinstance(video_id, tuple):
-                    video_ids.append(video_id)
+                    yield video_id
+        except Exception as e:
+            metrics.FAILURES.inc(stage="playlist_enumeration", kind=type(e).__name__)
+            print(f"Erro ao processar playlist: {str(e)}")
+            raise
+        finally:
+            metrics.STAGE_SECONDS.observe(waited, stage="playlist_enumeration")
+
+    @staticmethod
+    def iter_playlist_video_ids(playlist_id: str) -> Iterator[str]:
+        """Produz os IDs dos vídeos de uma playlist sob demanda, página a página."""
+        playlist = YouTubeService.playlist_class(f'https://www.youtube.com/playlist?list={playlist_id}')
+        return YouTubeService._iter_video_ids(playlist)
 
+    @staticmethod
+    def stream_playlist(playlist_id: str) -> Tuple[Iterator[Video], str, Optional[int]]:
+        """Abre uma playlist sem enumerar todos os vídeos antecipadamente.
+
+        Apenas a primeira página é carregada aqui (ela traz o título e a
+        contagem de vídeos); as páginas seguintes são buscadas conforme o
+        iterador é consumido, para que as transcrições comecem a ser
+        processadas enquanto a enumeração continua.
+
+        Args:
+            playlist_id: ID da playlist do YouTube
+
+        Returns:
+            Tupla com o iterador de vídeos, o título da playlist e a
+            quantidade estimada de vídeos (None se desconhecida)
+        """
+        try:
+            with metrics.track_stage("playlist_first_page"):
+                playlist = YouTubeService.playlist_class(f'https://www.youtube.com/playlist?list={playlist_id}')
+                title = playlist.title
+        except Exception as e:
+            metrics.FAILURES.inc(stage="playlist_first_page", kind=type(e).__name__)
+            print(f"Erro ao processar playlist: {str(e)}")
+            return iter([]), f"Playlist_{playlist_id}", 0
+
+        try:
+            estimated_count = playlist.length
+        except Exception:
+            estimated_count = None
+
+        # Os dados de cada vídeo chegam na mesma página que o seu ID
+        videos = (YouTubeService.get_video_details(video_id, resolve=False)
+                  for video_id in YouTubeService._iter_video_ids(playlist))
+        return videos, title, estimated_count
+
+    @staticmethod
+    def get_playlist_videos(playlist_id: str) -> Tuple[List[str], str]:
+        """Obtém todos os vídeos de uma playlist.
+
+        Chamadores simultâneos da mesma playlist compartilham uma única enumeração.
+        """
+        video_ids, title = YouTubeService._in_flight.do(
+            ("playlist", playlist_id),
+            lambda: YouTubeService._enumerate_playlist(playlist_id)
+        )
+        # Cada chamador recebe sua própria lista
+        return list(video_ids), title
+
+    @staticmethod
+    def _enumerate_playlist(playlist_id: str) -> Tuple[List[str], str]:
+        """Percorre todas as páginas da playlist e retorna os IDs e o título."""
+        try:
+            playlist = YouTubeService.playlist_class(f'https://www.youtube.com/playlist?list={playlist_id}')
+            video_ids = list(YouTubeService._iter_video_ids(playlist))
             return video_ids, playlist.title
         except Exception as e:
             print(f"Erro ao processar playlist: {str(e)}")
@@ -40,7 +152,7 @@ class YouTubeService:
 
         videos = []
         for video_id in video_ids:
-            video = YouTubeService.get_video_details(video_id)
+            video = YouTubeService.get_video_details(video_id, resolve=False)
             videos.append(video)
 
         return Playlist(id=playlist_id, title=playlist_title, videos=videos)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Benchmark dos exportadores de transcrição.
+
+Compara a vazão (segmentos e megabytes por segundo) e o tamanho do arquivo
+gerado por cada formato com o caminho do PDF, para a mesma transcrição
+sintética.
+
+Uso:
+    python benchmarks/bench_exporters.py [--segments 4000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.exporters import EXPORTERS  # noqa: E402
+from bench_pdf_layout import make_video  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    video = make_video(args.segments)
+    results = {}
+
+    for export_format, exporter in EXPORTERS.items():
+        best = float("inf")
+        size = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            data = exporter.render(video)
+            best = min(best, time.perf_counter() - start)
+            size = len(data)
+        results[export_format] = (best, size)
+
+    pdf_time = results["pdf"][0]
+    print(f"{'formato':>8} {'tempo (ms)':>11} {'segm./s':>10} {'MB/s':>8} {'tamanho (KB)':>13} {'vs PDF':>7}")
+    for export_format, (elapsed, size) in results.items():
+        print(f"{export_format:>8} {elapsed * 1e3:>11.2f} {args.segments / elapsed:>10.0f} "
+              f"{size / elapsed / 1e6:>8.1f} {size / 1024:>13.1f} {pdf_time / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark do layout de texto do PDFService.
+
+Mede o tempo de renderização do PDF para transcrições de tamanhos crescentes
+e mostra o tempo por segmento, que deve permanecer aproximadamente constante
+(crescimento linear). Também compara a quebra de linhas atual com o algoritmo
+anterior, que media a linha inteira a cada palavra.
+
+Uso:
+    python benchmarks/bench_pdf_layout.py [--sizes 500 1000 2000 4000 8000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpdf import FPDF  # noqa: E402
+from api.pdf_service import PDFService  # noqa: E402
+from models.data_models import TranscriptItem, TranscriptSegments, Video  # noqa: E402
+
+WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this have from "
+    "or one had by word but not what all were we when your can said there use an each which she "
+    "do how their if will up other about out many then them these so some her would make like him "
+    "transcription lecture university algorithm distributed performance measurement throughput"
+).split()
+
+
+def make_video(segments: int, seed: int = 42) -> Video:
+    """Cria um vídeo sintético com o número de segmentos informado."""
+    rng = random.Random(seed)
+    transcript = TranscriptSegments.from_items(
+        TranscriptItem(
+            text=" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))),
+            start=i * 3.0,
+            duration=3.0
+        )
+        for i in range(segments)
+    )
+    return Video(id=f"bench{segments}", title=f"Benchmark {segments}", transcript=transcript,
+                 language_used="en")
+
+
+def legacy_wrap(pdf: FPDF, text: str, max_width: float) -> list:
+    """Algoritmo anterior: mede a linha acumulada a cada palavra."""
+    lines = []
+    current_line = ""
+    for word in text.split():
+        test_line = current_line + " " + word if current_line else word
+        if pdf.get_string_width(test_line) < max_width:
+            current_line = test_line
+        else:
+            lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'segmentos':>10} {'render (s)':>11} {'us/segm.':>9} {'wrap (ms)':>10} {'legado (ms)':>12}")
+    for size in args.sizes:
+        video = make_video(size)
+        text = " ".join(item.text for item in video.transcript)
+
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+
+        render = best_of(lambda: PDFService.render_pdf(video), args.repeat)
+        wrap = best_of(lambda: PDFService._wrap_text(pdf, text, PDFService.TEXT_WIDTH), args.repeat)
+        legacy = best_of(lambda: legacy_wrap(pdf, text, PDFService.TEXT_WIDTH), args.repeat)
+
+        print(f"{size:>10} {render:>11.3f} {render / size * 1e6:>9.1f} {wrap * 1e3:>10.1f} {legacy * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
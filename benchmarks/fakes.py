@@ -0,0 +1,219 @@
+"""
+Substitutos offline do YouTubeTranscriptApi, das playlists e do oEmbed.
+
+Geram transcrições, playlists e dados de vídeos sintéticos, determinísticas para cada ID de
+vídeo, com tamanho, mistura de idiomas e latência configuráveis, para que os
+benchmarks rodem sem rede e produzam resultados comparáveis entre commits.
+
+Uso:
+    backend = FakeTranscriptBackend(segments=400, latency=0.05)
+    with install(backend, make_playlist_class(size=200)):
+        ...  # YouTubeService e TranscriptService usam os substitutos
+"""
+import random
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from youtube_transcript_api import YouTubeTranscriptApi, _errors
+
+from models.data_models import VideoMetadata
+from api.metadata_service import MetadataService
+from api.youtube_service import YouTubeService
+from utils import config
+
+WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this have from "
+    "or one had by word but not what all were we when your can said there use an each which she "
+    "do how their if will up other about out many then them these so some her would make like him "
+    "transcription lecture university algorithm distributed performance measurement throughput"
+).split()
+
+LANGUAGE_NAMES = {"en": "English", "pt": "Português", "es": "Español", "de": "Deutsch", "ja": "日本語"}
+
+
+def _rng(*parts) -> random.Random:
+    """Gerador determinístico a partir das partes (estável entre execuções)."""
+    return random.Random(zlib.crc32("|".join(str(part) for part in parts).encode("utf-8")))
+
+
+class FakeTranscript:
+    """Imita youtube_transcript_api.Transcript."""
+
+    def __init__(self, backend: "FakeTranscriptBackend", video_id: str, language_code: str, is_generated: bool):
+        self._backend = backend
+        self.video_id = video_id
+        self.language_code = language_code
+        self.language = LANGUAGE_NAMES.get(language_code, language_code)
+        self.is_generated = is_generated
+        self.is_translatable = True
+
+    def fetch(self) -> List[dict]:
+        self._backend.fetches += 1
+        self._backend.wait()
+        return self._backend.make_segments(self.video_id, self.language_code)
+
+
+class FakeTranscriptList:
+    """Imita youtube_transcript_api.TranscriptList."""
+
+    def __init__(self, video_id: str, transcripts: List[FakeTranscript]):
+        self.video_id = video_id
+        self._transcripts = transcripts
+
+    def __iter__(self) -> Iterator[FakeTranscript]:
+        return iter(self._transcripts)
+
+    def find_transcript(self, language_codes: Sequence[str]) -> FakeTranscript:
+        for code in language_codes:
+            for transcript in self._transcripts:
+                if transcript.language_code == code:
+                    return transcript
+        raise _errors.NoTranscriptFound(self.video_id, language_codes, self)
+
+
+class FakeTranscriptBackend:
+    """Servidor de transcrições sintéticas.
+
+    Args:
+        segments: Número de segmentos de cada transcrição
+        words_per_segment: Intervalo (mínimo, máximo) de palavras por segmento
+        languages: Idiomas possíveis; cada vídeo recebe um subconjunto
+        languages_per_video: Quantos idiomas cada vídeo tem
+        generated_ratio: Fração de transcrições geradas automaticamente
+        missing_ratio: Fração de vídeos sem legendas (TranscriptsDisabled)
+        latency: Latência simulada de cada requisição, em segundos
+        seed: Semente dos dados sintéticos
+    """
+
+    def __init__(self, segments: int = 400, words_per_segment: Tuple[int, int] = (6, 14),
+                 languages: Sequence[str] = ("en", "pt", "es"), languages_per_video: int = 2,
+                 generated_ratio: float = 0.5, missing_ratio: float = 0.0,
+                 latency: float = 0.0, seed: int = 42):
+        self.segments = segments
+        self.words_per_segment = words_per_segment
+        self.languages = list(languages)
+        self.languages_per_video = max(1, min(languages_per_video, len(self.languages)))
+        self.generated_ratio = generated_ratio
+        self.missing_ratio = missing_ratio
+        self.latency = latency
+        self.seed = seed
+        self.listings = 0
+        self.fetches = 0
+        self.metadata_fetches = 0
+
+    def wait(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def make_segments(self, video_id: str, language_code: str) -> List[dict]:
+        """Gera a transcrição sintética de um vídeo e idioma."""
+        rng = _rng(self.seed, video_id, language_code)
+        low, high = self.words_per_segment
+        return [
+            {
+                "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))),
+                "start": i * 3.0,
+                "duration": 3.0,
+            }
+            for i in range(self.segments)
+        ]
+
+    def fetch_metadata(self, video_id: str) -> Optional[VideoMetadata]:
+        """Substitui a busca de título e canal no oEmbed."""
+        self.metadata_fetches += 1
+        self.wait()
+        return make_metadata(video_id)
+
+    def list_transcripts(self, video_id: str) -> FakeTranscriptList:
+        """Substitui YouTubeTranscriptApi.list_transcripts."""
+        self.listings += 1
+        self.wait()
+
+        rng = _rng(self.seed, video_id)
+        if rng.random() < self.missing_ratio:
+            raise _errors.TranscriptsDisabled(video_id)
+
+        # O primeiro idioma da lista está sempre presente, para que a
+        # preferência padrão do benchmark encontre uma transcrição
+        codes = [self.languages[0]] + rng.sample(self.languages[1:], self.languages_per_video - 1)
+        transcripts = [FakeTranscript(self, video_id, code, rng.random() < self.generated_ratio) for code in codes]
+        return FakeTranscriptList(video_id, transcripts)
+
+
+def make_metadata(video_id: str) -> VideoMetadata:
+    """Dados sintéticos de um vídeo (título, duração e canal)."""
+    rng = _rng("metadata", video_id)
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize()
+    return VideoMetadata(video_id=video_id, title=f"{title} ({video_id})",
+                         duration=rng.randint(60, 3600), channel=f"Canal {rng.randint(1, 20)}")
+
+
+def make_playlist_class(size: int, page_size: int = 100, page_latency: float = 0.0,
+                        title: str = "Benchmark playlist"):
+    """Cria uma classe que imita a playlist do pytube com `size` vídeos.
+
+    Como MetadataPlaylist, entrega ao MetadataService os dados dos vídeos de
+    cada página carregada.
+
+    Args:
+        size: Número de vídeos da playlist
+        page_size: Vídeos por página (o YouTube usa 100)
+        page_latency: Latência simulada de cada página, em segundos
+        title: Título da playlist
+    """
+
+    class FakePlaylist:
+        def __init__(self, url: str, *args, **kwargs):
+            self.playlist_url = url
+            self.title = title
+            self.length = size
+
+        def url_generator(self) -> Iterator[str]:
+            for page_start in range(0, size, page_size):
+                if page_latency > 0:
+                    time.sleep(page_latency)
+                page = [f"bench{i:06d}" for i in range(page_start, min(size, page_start + page_size))]
+                MetadataService.remember(make_metadata(video_id) for video_id in page)
+                for video_id in page:
+                    yield f"https://www.youtube.com/watch?v={video_id}"
+
+        @property
+        def video_urls(self) -> List[str]:
+            return list(self.url_generator())
+
+    return FakePlaylist
+
+
+@contextmanager
+def install(backend: FakeTranscriptBackend, playlist_class: Optional[type] = None,
+            disable_cache: bool = True) -> Iterator[FakeTranscriptBackend]:
+    """Substitui as APIs do YouTube pelos falsos durante o bloco.
+
+    Args:
+        backend: Servidor de transcrições sintéticas
+        playlist_class: Classe usada no lugar de MetadataPlaylist (opcional)
+        disable_cache: Desativa os caches persistentes (transcrições, dados dos
+            vídeos e arquivos renderizados) e o índice de busca, para medir o
+            caminho completo; False os ativa
+    """
+    patches: Dict[Tuple[object, str], object] = {
+        (YouTubeTranscriptApi, "list_transcripts"): staticmethod(backend.list_transcripts),
+        (MetadataService, "_fetch_oembed"): staticmethod(backend.fetch_metadata),
+    }
+    if playlist_class is not None:
+        patches[(YouTubeService, "playlist_class")] = playlist_class
+    patches[(config, "TRANSCRIPT_CACHE_ENABLED")] = not disable_cache
+    patches[(config, "RENDER_CACHE_ENABLED")] = not disable_cache
+    patches[(config, "METADATA_CACHE_ENABLED")] = not disable_cache
+    patches[(config, "SEARCH_INDEX_ENABLED")] = not disable_cache
+
+    originals = {target: target[0].__dict__[target[1]] for target in patches}
+    try:
+        for (owner, name), value in patches.items():
+            setattr(owner, name, value)
+        yield backend
+    finally:
+        for (owner, name), value in originals.items():
+            setattr(owner, name, value)
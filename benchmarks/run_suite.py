@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+"""
+Suíte de benchmarks offline do TranscriptTube.
+
+Usa os substitutos de benchmarks/fakes.py no lugar do YouTube, então roda
+sem rede e com dados determinísticos. Mede:
+
+- single_video: tempo ponta a ponta de um vídeo (listagem, transcrição, PDF)
+- pdf_render: tempo de renderização do PDF em função do tamanho da transcrição
+- pdf_render_unicode: o mesmo em cirílico, com fonte TrueType embutida (apenas
+  se houver uma fonte Unicode instalada)
+- zip_build: tempo de exportação de uma playlist para ZIP em função do tamanho
+- zip_build_cached: a mesma exportação repetida, com os caches de transcrições
+  e de arquivos renderizados já preenchidos (playlist popular baixada de novo)
+- book_build: a playlist exportada em um único PDF com sumário; a memória de
+  pico deve ficar praticamente constante com o tamanho da playlist
+- search: consultas ao índice de busca em função do número de transcrições
+- zip_compress: tempo de montagem e tamanho do ZIP em cada modo e nível de
+  compressão, com arquivos já renderizados, para escolher entre CPU e banda
+- memória de pico (tracemalloc) de cada caso, medida em uma execução separada
+
+Os resultados podem ser gravados em JSON, junto com o commit e a máquina,
+e comparados com uma execução anterior para verificar regressões.
+
+Uso:
+    python benchmarks/run_suite.py --output resultados.json
+    python benchmarks/run_suite.py --compare resultados.json [--quick]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fakes import FakeTranscriptBackend, install, make_playlist_class  # noqa: E402
+from api.youtube_service import YouTubeService  # noqa: E402
+from api.transcript_service import TranscriptService  # noqa: E402
+from api.export_service import ExportService  # noqa: E402
+from api.exporters import get_exporter  # noqa: E402
+from api.search_service import SearchIndex, SearchService  # noqa: E402
+from api.pdf_fonts import PDFFonts  # noqa: E402
+from api.file_service import ZipStreamWriter  # noqa: E402
+from models.data_models import TranscriptSegments, Video  # noqa: E402
+from utils import config  # noqa: E402
+
+
+def measure(fn: Callable[[], None], repeat: int) -> Dict[str, float]:
+    """Executa `fn` várias vezes e retorna os tempos e a memória de pico."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    # Memória medida à parte: o tracemalloc deixa a execução mais lenta
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "peak_kb": peak / 1024,
+    }
+
+
+def bench_single_video(backend: FakeTranscriptBackend, export_format: str) -> Callable[[], None]:
+    exporter = get_exporter(export_format)
+    counter = [0]
+
+    def run():
+        # Um ID novo a cada execução, para não reaproveitar buscas anteriores
+        counter[0] += 1
+        video = YouTubeService.get_video_details(f"single{counter[0]:05d}")
+        video = TranscriptService.add_transcript_to_video(video, ["en"])
+        assert exporter.render(video)
+
+    return run
+
+
+# Transliteração das palavras sintéticas, para medir o PDF com fonte TrueType
+CYRILLIC = str.maketrans("abcdefghijklmnopqrstuvwxyz", "абцдефгхийклмнопярстувшхыз")
+
+
+def bench_pdf_render(segments: int, language: str = "en") -> Callable[[], None]:
+    backend = FakeTranscriptBackend(segments=segments)
+    raw = backend.make_segments("render", language)
+    if language == "ru":
+        for segment in raw:
+            segment["text"] = segment["text"].translate(CYRILLIC)
+    video = Video(id="render", title=f"Benchmark {segments}", language_used=language,
+                  transcript=TranscriptSegments.from_raw(raw))
+    exporter = get_exporter("pdf")
+
+    def run():
+        assert exporter.render(video)
+
+    return run
+
+
+def bench_zip_build(size: int, export_format: str, render_workers: int, output_dir: str,
+                    combine: bool = False) -> Callable[[], None]:
+    def run():
+        videos, title, _ = YouTubeService.stream_playlist("benchmark")
+        result = ExportService.export_playlist(
+            videos, ["en"], "benchmark.pdf" if combine else "benchmark.zip",
+            export_format=export_format,
+            render_workers=render_workers,
+            output_dir=output_dir,
+            combine=combine,
+            title=title
+        )
+        assert result.exported == size, result
+        os.remove(result.zip_path)
+
+    return run
+
+
+SEARCH_QUERIES = ("throughput", "distributed performance", "lectu", "algorithm measurement university")
+
+
+ZIP_COMPRESSION_CASES = (("stored", 6), ("auto", 6), ("deflate", 1), ("deflate", 6), ("deflate", 9))
+
+
+def bench_zip_compression(members: int, export_format: str, compression: str, level: int,
+                          output_dir: str) -> Callable[[], None]:
+    """Grava `members` arquivos já renderizados em um ZIP com a compressão informada."""
+    backend = FakeTranscriptBackend(segments=400)
+    exporter = get_exporter(export_format)
+    files = []
+    for i in range(members):
+        video_id = f"zip{i:05d}"
+        video = Video(id=video_id, title=video_id, language_used="en",
+                      transcript=TranscriptSegments.from_raw(backend.make_segments(video_id, "en")))
+        files.append((exporter.get_filename(video), exporter.render(video)))
+    zip_path = os.path.join(output_dir, f"compress_{compression}{level}.zip")
+
+    def run():
+        with ZipStreamWriter(zip_path, compression=compression, level=level) as writer:
+            for index, (name, data) in enumerate(files):
+                writer.add(index, name, data)
+
+    run.zip_path = zip_path
+    return run
+
+
+def bench_search(transcripts: int, output_dir: str) -> Callable[[], None]:
+    """Indexa `transcripts` transcrições sintéticas e mede um conjunto de consultas."""
+    backend = FakeTranscriptBackend(segments=400)
+    index = SearchIndex(os.path.join(output_dir, f"search_{transcripts}.sqlite3"))
+    batch = []
+    for i in range(transcripts):
+        video_id = f"search{i:06d}"
+        batch.append((video_id, "en", video_id,
+                      TranscriptSegments.from_raw(backend.make_segments(video_id, "en"))))
+        if len(batch) == SearchService.BATCH_SIZE:
+            index.add(batch)
+            batch = []
+    index.add(batch)
+
+    def run():
+        for query in SEARCH_QUERIES:
+            index.search(SearchService._build_match(query), 60, hits_per_video=3)
+
+    return run
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]] = None) -> None:
+    header = f"{'caso':<34} {'mediana (ms)':>13} {'mínimo (ms)':>12} {'pico (KB)':>11} {'arquivo (KB)':>13}"
+    if baseline:
+        header += f" {'Δ tempo':>9} {'Δ memória':>10}"
+    print(header)
+
+    for name, result in results.items():
+        line = f"{name:<34} {result['median_s'] * 1e3:>13.1f} {result['min_s'] * 1e3:>12.1f} {result['peak_kb']:>11.0f}"
+        line += f" {result['size_kb']:>13.0f}" if "size_kb" in result else f" {'':>13}"
+        previous = (baseline or {}).get(name)
+        if previous:
+            time_delta = (result["median_s"] / previous["median_s"] - 1) * 100
+            memory_delta = (result["peak_kb"] / previous["peak_kb"] - 1) * 100 if previous["peak_kb"] else 0.0
+            line += f" {time_delta:>+8.1f}% {memory_delta:>+9.1f}%"
+        elif baseline:
+            line += f" {'novo':>9} {'':>10}"
+        print(line)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Tamanhos menores, para uma verificação rápida")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Latência simulada de cada requisição ao YouTube, em segundos")
+    parser.add_argument("--render-sizes", type=int, nargs="+", default=None,
+                        help="Segmentos por transcrição no benchmark de renderização")
+    parser.add_argument("--playlist-sizes", type=int, nargs="+", default=None,
+                        help="Vídeos por playlist no benchmark do ZIP")
+    parser.add_argument("--search-sizes", type=int, nargs="+", default=None,
+                        help="Transcrições indexadas no benchmark de busca")
+    parser.add_argument("--zip-members", type=int, default=None,
+                        help="Arquivos por ZIP no benchmark de compressão")
+    parser.add_argument("--format", dest="export_format", default="pdf")
+    parser.add_argument("--render-workers", type=int, default=1,
+                        help="Processos de renderização no benchmark do ZIP (1 = no próprio processo)")
+    parser.add_argument("--output", help="Grava os resultados em JSON")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+
+    render_sizes = args.render_sizes or ([200, 1000] if args.quick else [200, 1000, 4000, 8000])
+    playlist_sizes = args.playlist_sizes or ([10, 50] if args.quick else [10, 50, 200])
+    search_sizes = args.search_sizes or ([200] if args.quick else [200, 2000])
+    zip_members = args.zip_members or (50 if args.quick else 200)
+    repeat = 2 if args.quick else args.repeat
+
+    results: Dict[str, Dict[str, float]] = {}
+    backend = FakeTranscriptBackend(segments=400, latency=args.latency)
+
+    with tempfile.TemporaryDirectory() as output_dir, install(backend):
+        # Caches persistentes em um diretório descartável, começando vazios
+        config.CACHE_DIR = os.path.join(output_dir, "cache")
+        # Sem limite de requisições por segundo: o YouTube falso não limita, e a
+        # latência simulada já representa o custo de cada requisição
+        TranscriptService.rate_limiter.set_rate(1e9)
+
+        results[f"single_video/{args.export_format}"] = measure(
+            bench_single_video(backend, args.export_format), repeat)
+
+        for segments in render_sizes:
+            results[f"pdf_render/segments={segments}"] = measure(bench_pdf_render(segments), repeat)
+
+        if PDFFonts.select("ru", "тест").unicode:
+            for segments in render_sizes:
+                results[f"pdf_render_unicode/segments={segments}"] = measure(
+                    bench_pdf_render(segments, "ru"), repeat)
+
+        for size in playlist_sizes:
+            # Sem latência, para medir o pipeline local (transcrição → arquivo → ZIP)
+            playlist_backend = FakeTranscriptBackend(segments=400, latency=0.0)
+            with install(playlist_backend, make_playlist_class(size)):
+                results[f"zip_build/{args.export_format}/videos={size}"] = measure(
+                    bench_zip_build(size, args.export_format, args.render_workers, output_dir), repeat)
+
+            with install(playlist_backend, make_playlist_class(size), disable_cache=False):
+                run = bench_zip_build(size, args.export_format, args.render_workers, output_dir)
+                run()  # Preenche os caches
+                results[f"zip_build_cached/{args.export_format}/videos={size}"] = measure(run, repeat)
+
+            with install(playlist_backend, make_playlist_class(size)):
+                results[f"book_build/videos={size}"] = measure(
+                    bench_zip_build(size, "pdf", args.render_workers, output_dir, combine=True), repeat)
+
+        for size in search_sizes:
+            results[f"search/transcripts={size}"] = measure(bench_search(size, output_dir), repeat)
+
+        # PDFs já vêm comprimidos; TXT mostra o ganho em formatos de texto
+        for export_format in ("pdf", "txt"):
+            for compression, level in ZIP_COMPRESSION_CASES:
+                run = bench_zip_compression(zip_members, export_format, compression, level, output_dir)
+                name = f"zip_compress/{export_format}/{compression}" + (f"-{level}" if compression == "deflate" else "")
+                results[name] = measure(run, repeat)
+                results[name]["size_kb"] = os.path.getsize(run.zip_path) / 1024
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        "parameters": {
+            "repeat": repeat,
+            "latency": args.latency,
+            "export_format": args.export_format,
+            "render_workers": args.render_workers,
+        },
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        baseline = previous["results"]
+        print(f"Comparando {report['revision']} com {previous.get('revision', '?')}")
+
+    print_results(results, baseline)
+    if report["max_rss_kb"]:
+        print(f"\nRSS máximo do processo: {report['max_rss_kb'] / 1024:.1f} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
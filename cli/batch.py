@@ -0,0 +1,208 @@
+# cli/batch.py
+"""
+Processamento em lote de vídeos e playlists pela linha de comando.
+
+Usa diretamente os serviços da pasta api/, sem importar o Streamlit, para
+que possa ser executado em tarefas agendadas (cron) com inicialização rápida.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from api.youtube_service import YouTubeService
+from api.transcript_service import TranscriptService
+from api.export_service import ExportService
+from api.exporters import available_formats, get_exporter, render_cached
+from api.file_service import FileService
+from utils.url_utils import extract_video_id
+from utils import config, metrics
+
+
+def read_urls(urls: List[str], url_file: Optional[str]) -> List[str]:
+    """Junta as URLs dos argumentos com as de um arquivo (uma por linha).
+
+    Linhas vazias e linhas iniciadas por # são ignoradas. Use "-" para ler
+    da entrada padrão.
+    """
+    collected = list(urls)
+    if url_file:
+        if url_file == "-":
+            lines = sys.stdin.readlines()
+        else:
+            with open(url_file, encoding="utf-8") as f:
+                lines = f.readlines()
+
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                collected.append(line)
+    return collected
+
+
+def process_videos(items: List[Dict], languages: List[str], export_format: str, output_dir: str,
+                   max_workers: Optional[int]) -> None:
+    """Busca as transcrições dos vídeos avulsos em paralelo e grava um arquivo por vídeo."""
+    exporter = get_exporter(export_format)
+    videos = YouTubeService.get_videos_details([item["id"] for item in items])
+
+    for result in TranscriptService.iter_transcripts(videos, languages, max_workers=max_workers):
+        item = items[result.index]
+        if result.error:
+            item.update(status="failed", error=result.error)
+            continue
+        if not result.success:
+            item.update(status="missing", error="Nenhuma transcrição nos idiomas selecionados")
+            continue
+
+        video = result.value
+        path = os.path.join(output_dir, exporter.get_filename(video))
+        try:
+            with open(path, "wb") as f:
+                f.write(render_cached(exporter, video))
+        except Exception as e:
+            item.update(status="failed", error=str(e))
+            continue
+
+        item.update(status="ok", language=video.language_used, output=path, bytes=os.path.getsize(path))
+
+
+def process_playlist(item: Dict, languages: List[str], export_format: str, output_dir: str,
+                     max_workers: Optional[int], render_workers: Optional[int], resume: Optional[bool] = None,
+                     combine: bool = False) -> None:
+    """Exporta todos os vídeos de uma playlist para um ZIP no diretório de saída.
+
+    Com `combine`, gera um único PDF com sumário no lugar do ZIP. Execuções
+    interrompidas são retomadas a partir do checkpoint da playlist.
+    """
+    videos, playlist_title, _ = YouTubeService.stream_playlist(item["id"])
+    item["title"] = playlist_title
+
+    output_name = FileService.safe_filename(f"{playlist_title[:50]}_transcricoes", "pdf" if combine else "zip")
+    export = ExportService.export_playlist_job(
+        item["id"], videos, languages, output_name,
+        export_format=export_format,
+        resume=resume,
+        render_workers=render_workers,
+        output_dir=output_dir,
+        max_workers=max_workers,
+        combine=combine,
+        title=playlist_title
+    )
+
+    if export.total == 0:
+        item.update(status="missing", error="Playlist vazia ou não encontrada")
+        return
+
+    if export.error:
+        # Playlist lida só em parte: o checkpoint foi mantido para a próxima execução
+        item.update(status="partial" if export.zip_path else "failed", error=export.error)
+    else:
+        item.update(status="ok" if export.zip_path else "missing")
+    item.update(
+        output=export.zip_path,
+        bytes=export.bytes_written,
+        total=export.total,
+        exported=export.exported,
+        missing=export.missing,
+        failed=export.failed
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="run_cli.py",
+        description="Baixa transcrições de vídeos e playlists do YouTube em lote."
+    )
+    parser.add_argument("urls", nargs="*", help="URLs de vídeos ou playlists do YouTube")
+    parser.add_argument("-f", "--file", help="Arquivo com uma URL por linha (use - para a entrada padrão)")
+    parser.add_argument("-l", "--languages", nargs="+", default=TranscriptService.DEFAULT_LANGUAGES,
+                        help="Códigos de idioma por ordem de preferência (padrão: pt en)")
+    parser.add_argument("--format", dest="export_format", default="pdf", choices=available_formats(),
+                        help="Formato dos arquivos gerados (padrão: pdf)")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="Diretório de destino (padrão: diretório de downloads)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de transcrições buscadas em paralelo")
+    parser.add_argument("--requests-per-second", type=float, default=None,
+                        help="Limite de requisições por segundo ao YouTube")
+    parser.add_argument("--render-workers", type=int, default=None,
+                        help="Processos usados para renderizar PDFs")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="Expõe métricas no formato do Prometheus nesta porta durante a execução")
+    parser.add_argument("--no-resume", dest="resume", action="store_false", default=None,
+                        help="Ignora o checkpoint e processa as playlists desde o início")
+    parser.add_argument("--combine", action="store_true",
+                        help="Gera um único PDF com sumário por playlist, em vez de um ZIP (apenas --format pdf)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Executa o processamento em lote e imprime um resumo em JSON.
+
+    Returns:
+        Código de saída: 0 se todas as URLs geraram arquivos, 1 caso
+        contrário e 2 para erros de uso
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    urls = read_urls(args.urls, args.file)
+    if not urls:
+        parser.error("informe ao menos uma URL ou um arquivo com --file")
+    if args.combine and args.export_format != "pdf":
+        parser.error("--combine está disponível apenas com --format pdf")
+
+    metrics.start_server(args.metrics_port, config.METRICS_ADDRESS)
+    if args.requests_per_second:
+        # Vale para todas as requisições deste processo
+        TranscriptService.rate_limiter.set_rate(args.requests_per_second)
+
+    output_dir = args.output_dir or FileService.create_output_dir()
+    os.makedirs(output_dir, exist_ok=True)
+
+    started = time.time()
+    items = []
+    for url in urls:
+        extracted = extract_video_id(url)
+        if isinstance(extracted, tuple) and extracted[1] == 'playlist':
+            items.append({"url": url, "type": "playlist", "id": extracted[0]})
+        elif extracted:
+            items.append({"url": url, "type": "video", "id": extracted})
+        else:
+            items.append({"url": url, "type": "unknown", "status": "invalid", "error": "URL inválida"})
+
+    # As mensagens de diagnóstico dos serviços vão para stderr, mantendo
+    # stdout reservado para o resumo em JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        videos = [item for item in items if item["type"] == "video"]
+        if videos:
+            process_videos(videos, args.languages, args.export_format, output_dir,
+                           args.workers)
+
+        for item in items:
+            if item["type"] != "playlist":
+                continue
+            try:
+                process_playlist(item, args.languages, args.export_format, output_dir,
+                                 args.workers, args.render_workers,
+                                 args.resume, args.combine)
+            except Exception as e:
+                item.update(status="failed", error=str(e))
+
+    summary = {
+        "output_dir": os.path.abspath(output_dir),
+        "format": args.export_format,
+        "languages": args.languages,
+        "elapsed_seconds": round(time.time() - started, 3),
+        "ok": sum(1 for item in items if item.get("status") == "ok"),
+        "errors": sum(1 for item in items if item.get("status") != "ok"),
+        "items": items,
+    }
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+    return 0 if summary["errors"] == 0 else 1
@@ -1,6 +1,7 @@
 # models/data_models.py
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import Any, Iterable, Iterator, List, Optional, Dict, Union
 
 
 @dataclass
@@ -11,6 +12,91 @@ class TranscriptItem:
     duration: float
 
 
+class TranscriptSegments:
+    """Representação compacta dos segmentos de uma transcrição.
+
+    Em vez de um objeto TranscriptItem por segmento, guarda os inícios e as
+    durações em arrays tipados e todos os textos em uma única string, unidos
+    por espaço, com os deslocamentos de cada segmento. Continua suportando
+    iteração, indexação e len() como uma lista de TranscriptItem.
+    """
+    __slots__ = ("starts", "durations", "_offsets", "_text")
+
+    # Separador entre os textos dos segmentos no buffer
+    SEPARATOR = " "
+
+    def __init__(self, starts: array = None, durations: array = None, offsets: array = None, text: str = ""):
+        self.starts = starts if starts is not None else array('d')
+        self.durations = durations if durations is not None else array('d')
+        # offsets[i] é o início do texto i; o último elemento marca o fim do buffer
+        self._offsets = offsets if offsets is not None else array('q', [0])
+        self._text = text
+
+    @classmethod
+    def from_raw(cls, raw_transcript: Iterable[dict]) -> "TranscriptSegments":
+        """Cria os segmentos a partir da lista de dicionários da API."""
+        return cls._build((item['text'], item['start'], item['duration']) for item in raw_transcript)
+
+    @classmethod
+    def from_items(cls, items: Iterable[TranscriptItem]) -> "TranscriptSegments":
+        """Cria os segmentos a partir de objetos TranscriptItem."""
+        return cls._build((item.text, item.start, item.duration) for item in items)
+
+    @classmethod
+    def _build(cls, segments: Iterable[tuple]) -> "TranscriptSegments":
+        starts = array('d')
+        durations = array('d')
+        offsets = array('q')
+        texts = []
+        position = 0
+
+        for text, start, duration in segments:
+            offsets.append(position)
+            starts.append(float(start))
+            durations.append(float(duration))
+            texts.append(text)
+            position += len(text) + len(cls.SEPARATOR)
+
+        offsets.append(position)
+        return cls(starts, durations, offsets, cls.SEPARATOR.join(texts))
+
+    @property
+    def full_text(self) -> str:
+        """Texto completo da transcrição, sem cópia: é o próprio buffer interno."""
+        return self._text
+
+    def text_at(self, index: int) -> str:
+        """Retorna o texto do segmento na posição informada."""
+        start = self._offsets[index]
+        end = self._offsets[index + 1] - len(self.SEPARATOR)
+        return self._text[start:end]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TranscriptItem, List[TranscriptItem]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice do segmento fora do intervalo")
+        return TranscriptItem(text=self.text_at(index), start=self.starts[index], duration=self.durations[index])
+
+    def __iter__(self) -> Iterator[TranscriptItem]:
+        for index in range(len(self)):
+            yield TranscriptItem(text=self.text_at(index), start=self.starts[index], duration=self.durations[index])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TranscriptSegments):
+            return (self.starts == other.starts and self.durations == other.durations
+                    and self._offsets == other._offsets and self._text == other._text)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TranscriptSegments({len(self)} segmentos, {len(self._text)} caracteres)"
+
+
 @dataclass
 class TranscriptInfo:
     """Informações sobre uma transcrição disponível."""
@@ -20,14 +106,40 @@ class TranscriptInfo:
     is_translatable: bool
 
 
+@dataclass
+class TranscriptResolution:
+    """Resultado da resolução de transcrição de um vídeo em uma única consulta.
+
+    Reúne as transcrições disponíveis, o idioma escolhido segundo a ordem de
+    preferência do usuário e os segmentos baixados desse idioma.
+    """
+    video_id: str
+    available_transcripts: List[TranscriptInfo] = field(default_factory=list)
+    transcript: Optional[List[dict]] = None
+    language_used: Optional[str] = None
+    error: Optional[str] = None
+    failure_kind: Optional[str] = None  # "permanent" ou "transient" quando houver falha
+
+
 @dataclass
 class Video:
     """Representa um vídeo do YouTube com sua transcrição."""
     id: str
     title: str
-    transcript: Optional[List[TranscriptItem]] = None
+    transcript: Optional[TranscriptSegments] = None
     available_transcripts: List[TranscriptInfo] = field(default_factory=list)
     language_used: Optional[str] = None  # Armazena qual idioma foi usado na transcrição final
+    duration: Optional[int] = None  # Duração em segundos, quando conhecida
+    channel: Optional[str] = None
+
+
+@dataclass
+class VideoMetadata:
+    """Título, duração e canal de um vídeo, obtidos da playlist ou do oEmbed."""
+    video_id: str
+    title: str
+    duration: Optional[int] = None
+    channel: Optional[str] = None
 
 
 @dataclass
@@ -62,4 +174,88 @@ class Playlist:
                     languages[video.language_used] += 1
                 else:
                     languages[video.language_used] = 1
-        return languages
\ No newline at end of file
+        return languages
+
+
+@dataclass
+class FetchResult:
+    """Resultado da busca de um item executada pelo ConcurrentFetcher."""
+    index: int  # Posição do item na sequência original (ordem da playlist)
+    item: Any
+    value: Any = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Indica se a busca terminou sem erro e retornou algum valor."""
+        return self.error is None and self.value is not None
+
+
+@dataclass
+class Artifact:
+    """Arquivo gerado guardado no ArtifactStore, identificado pelo hash do conteúdo."""
+    digest: str
+    path: str
+    size: int
+    refs: int = 0
+    kept: bool = False
+    accessed_at: float = 0.0
+
+
+@dataclass
+class SearchHit:
+    """Trecho de transcrição encontrado na busca, com link para o momento do vídeo."""
+    start: float
+    snippet: str
+    url: str
+
+
+@dataclass
+class SearchResult:
+    """Vídeo encontrado na busca, com os trechos mais relevantes."""
+    video_id: str
+    title: str
+    language: str
+    hits: List[SearchHit] = field(default_factory=list)
+
+
+@dataclass
+class PlaylistExportResult:
+    """Resumo da exportação das transcrições de uma playlist para ZIP."""
+    zip_path: Optional[str] = None
+    total: int = 0
+    exported: int = 0
+    missing: List[str] = field(default_factory=list)  # IDs de vídeos sem transcrição
+    failed: List[str] = field(default_factory=list)  # IDs de vídeos com falha transitória
+    bytes_written: int = 0
+    error: Optional[str] = None  # Erro que interrompeu a leitura da playlist (resultado parcial)
+
+
+@dataclass
+class Job:
+    """Trabalho de exportação executado em segundo plano pelo JobService."""
+    id: str
+    url: str
+    kind: str  # "video" ou "playlist"
+    target_id: str  # ID do vídeo ou da playlist
+    languages: List[str]
+    export_format: str
+    keep_files: bool = False
+    combine: bool = False  # Playlist em um único PDF, com sumário
+    status: str = "queued"  # queued, running, done ou failed
+    progress: float = 0.0
+    message: str = ""
+    title: str = ""
+    result_path: Optional[str] = None
+    result_name: Optional[str] = None
+    mime: Optional[str] = None
+    artifact: Optional[str] = None  # Hash do arquivo no ArtifactStore
+    error: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        """Indica se o trabalho terminou, com ou sem sucesso."""
+        return self.status in ("done", "failed")
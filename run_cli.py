@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+"""
+Script de linha de comando para o TranscriptTube.
+Processa vídeos e playlists em lote sem iniciar o Streamlit, ideal para tarefas agendadas.
+
+Exemplos:
+    python run_cli.py https://www.youtube.com/watch?v=ID -o saida/
+    python run_cli.py --file urls.txt --format srt --workers 8
+"""
+import os
+import sys
+
+# Adiciona o diretório raiz ao sys.path para permitir importações
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from cli.batch import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Os módulos do projeto são importados a partir da raiz (api, utils, models...),
+# e os substitutos do YouTube vêm da suíte de benchmarks
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Diretórios de cache, trabalhos e arquivos isolados por teste, sem limite de requisições."""
+    from api.transcript_service import TranscriptService
+    from utils import config
+    from utils.rate_limiter import TokenBucket
+
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(config, "ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(TranscriptService, "rate_limiter", TokenBucket(1e9, 1))
+    return tmp_path
@@ -0,0 +1,37 @@
+# tests/test_checkpoint.py
+from api.checkpoint import PlaylistCheckpoint
+
+
+def test_reopened_checkpoint_resumes_finished_videos(tmp_path):
+    with PlaylistCheckpoint.open("PLx", ["pt", "en"], "pdf", jobs_dir=str(tmp_path)) as checkpoint:
+        checkpoint.record("a", PlaylistCheckpoint.STATUS_DONE, filename="a.pdf", language="pt", data=b"%PDF-a")
+        checkpoint.record("b", PlaylistCheckpoint.STATUS_FAILED, error="tempo esgotado")
+        checkpoint.record("c", PlaylistCheckpoint.STATUS_MISSING)
+
+    with PlaylistCheckpoint.open("PLx", ["pt", "en"], "pdf", jobs_dir=str(tmp_path)) as checkpoint:
+        assert checkpoint.is_done("a")
+        assert checkpoint.read_artifact("a") == b"%PDF-a"
+        assert not checkpoint.is_done("b")
+        assert checkpoint.summary() == {"done": 1, "missing": 1, "failed": 1}
+
+
+def test_other_languages_or_formats_use_another_checkpoint(tmp_path):
+    with PlaylistCheckpoint.open("PLx", ["pt"], "pdf", jobs_dir=str(tmp_path)) as checkpoint:
+        checkpoint.record("a", PlaylistCheckpoint.STATUS_DONE, data=b"1")
+    for languages, export_format in ((["en"], "pdf"), (["pt"], "txt")):
+        with PlaylistCheckpoint.open("PLx", languages, export_format, jobs_dir=str(tmp_path)) as checkpoint:
+            assert not checkpoint.is_done("a")
+
+
+def test_interrupted_line_and_missing_artifact_are_retried(tmp_path):
+    with PlaylistCheckpoint(str(tmp_path)) as checkpoint:
+        checkpoint.record("a", PlaylistCheckpoint.STATUS_DONE, data=b"1")
+        checkpoint.record("b", PlaylistCheckpoint.STATUS_DONE, data=b"2")
+    (tmp_path / "b.bin").unlink()
+    with open(tmp_path / PlaylistCheckpoint.MANIFEST_NAME, "a", encoding="utf-8") as f:
+        f.write('{"video_id": "c", "status": "do')
+
+    with PlaylistCheckpoint(str(tmp_path)) as checkpoint:
+        assert checkpoint.is_done("a")
+        assert not checkpoint.is_done("b")
+        assert "c" not in checkpoint.entries
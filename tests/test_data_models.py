@@ -0,0 +1,36 @@
+# tests/test_data_models.py
+import pickle
+
+import pytest
+
+from models.data_models import TranscriptItem, TranscriptSegments
+
+RAW = [
+    {"text": "Olá, mundo", "start": 0.0, "duration": 1.5},
+    {"text": "", "start": 1.5, "duration": 0.5},
+    {"text": "texto  com espaços ", "start": 2.0, "duration": 2.25},
+    {"text": "日本語のテキスト", "start": 4.25, "duration": 3.0},
+]
+
+
+def test_segments_round_trip_the_api_items():
+    segments = TranscriptSegments.from_raw(RAW)
+    assert len(segments) == len(RAW)
+    assert [{"text": item.text, "start": item.start, "duration": item.duration} for item in segments] == RAW
+    assert TranscriptSegments.from_items(segments) == segments
+    assert segments.full_text == " ".join(item["text"] for item in RAW)
+
+
+def test_segments_index_like_a_list():
+    segments = TranscriptSegments.from_raw(RAW)
+    assert segments[-1] == TranscriptItem(text="日本語のテキスト", start=4.25, duration=3.0)
+    assert segments[1:3] == [TranscriptItem("", 1.5, 0.5), TranscriptItem("texto  com espaços ", 2.0, 2.25)]
+    with pytest.raises(IndexError):
+        segments[len(RAW)]
+    assert list(TranscriptSegments()) == []
+
+
+def test_segments_survive_pickling():
+    # Os vídeos são enviados assim aos processos de renderização
+    segments = TranscriptSegments.from_raw(RAW)
+    assert pickle.loads(pickle.dumps(segments)) == segments
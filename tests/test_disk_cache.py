@@ -0,0 +1,68 @@
+# tests/test_disk_cache.py
+import time
+
+from utils.disk_cache import DiskCache
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttl=0.05)
+    cache.set("a", b"1")
+    cache.set("b", b"2", ttl=60)
+    assert cache.get("a") == b"1"
+
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_eviction_counts_hits_not_yet_written(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=30)
+    for key in "abc":
+        cache.set(key, b"x" * 10)
+        time.sleep(0.01)
+
+    # O acesso fica em memória (lote), mas precisa valer na ordem de remoção
+    assert cache.get("a") == b"x" * 10
+    cache.set("d", b"x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] == 30
+
+
+def test_hits_do_not_write_until_the_batch_fills(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.TOUCH_BATCH = 2
+    cache.set_many({"a": b"1", "b": b"2"})
+    stored = cache._conn.execute("SELECT accessed_at FROM entries WHERE key = 'a'").fetchone()[0]
+    time.sleep(0.01)
+
+    cache.get("a")
+    cache.get("a")
+    assert cache._conn.execute("SELECT accessed_at FROM entries WHERE key = 'a'").fetchone()[0] == stored
+    cache.get("b")
+    assert cache._conn.execute("SELECT accessed_at FROM entries WHERE key = 'a'").fetchone()[0] > stored
+
+
+def test_running_total_follows_replacements_and_deletes(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("a", b"x" * 10)
+    cache.set("a", b"x" * 4)
+    cache.set_many({"b": b"x" * 6, "a": b"x" * 2})
+    cache.delete("b")
+    assert cache._total == cache.stats()["bytes"] == 2
+
+
+def test_total_is_resynced_with_other_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = DiskCache(path, max_bytes=100)
+    other = DiskCache(path)
+    other.set("grande", b"x" * 90)
+
+    first.MAINTENANCE_WRITES = 1
+    first.set("pequeno", b"x" * 20)
+    # O total recalculado inclui a entrada do outro processo e dispara a remoção LRU
+    assert first.get("grande") is None
+    assert first.stats()["bytes"] == 20
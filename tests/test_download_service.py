@@ -0,0 +1,94 @@
+# tests/test_download_service.py
+import http.client
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from api.download_service import DownloadService, _DownloadHandler
+from api.job_service import JobService
+from models.data_models import Job
+from utils import config
+
+JOB = Job(id="0" * 32, url="https://youtu.be/x", kind="video", target_id="x", languages=["en"], export_format="pdf")
+
+
+def test_links_use_the_host_of_the_interface(monkeypatch):
+    monkeypatch.setattr(config, "DOWNLOAD_BASE_URL", "")
+    monkeypatch.setattr(config, "DOWNLOAD_PORT", 8502)
+    assert DownloadService.url_for(JOB, "servidor.lan:8501") == f"http://servidor.lan:8502/download/{JOB.id}"
+    assert DownloadService.url_for(JOB, "[::1]:8501") == f"http://[::1]:8502/download/{JOB.id}"
+    assert DownloadService.url_for(JOB) == f"http://localhost:8502/download/{JOB.id}"
+
+
+def test_base_url_overrides_the_host(monkeypatch):
+    monkeypatch.setattr(config, "DOWNLOAD_BASE_URL", "https://exemplo.com/arquivos/")
+    assert DownloadService.url_for(JOB, "servidor.lan:8501") == f"https://exemplo.com/arquivos/download/{JOB.id}"
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-5", (95, 99)),
+    ("bytes=50-500", (50, 99)),
+    ("bytes=0-1,5-6", (0, 99)),
+    ("bytes=100-", None),
+    ("bytes=20-10", None),
+])
+def test_parse_range(header, expected):
+    assert DownloadService.parse_range(header, 100) == expected
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    path = tmp_path / "arquivo.zip"
+    path.write_bytes(bytes(range(256)) * 4)
+    job = Job(id="1" * 32, url="", kind="playlist", target_id="PLx", languages=["en"], export_format="pdf",
+              result_path=str(path), result_name="transcrições.zip", mime="application/zip")
+    # Só o armazenamento de trabalhos é trocado: o caminho passa pela validação real
+    monkeypatch.setattr(JobService, "get", staticmethod(lambda job_id: job if job_id == job.id else None))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _DownloadHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1], job, path.read_bytes()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(port, job, headers=None, path=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("GET", path or f"/download/{job.id}", headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_server_sends_whole_file_and_ranges(server):
+    port, job, content = server
+
+    response, body = request(port, job)
+    assert response.status == 200
+    assert body == content
+    assert response.getheader("Accept-Ranges") == "bytes"
+    assert response.getheader("Content-Type") == "application/zip"
+
+    response, body = request(port, job, {"Range": "bytes=100-199"})
+    assert response.status == 206
+    assert response.getheader("Content-Range") == f"bytes 100-199/{len(content)}"
+    assert body == content[100:200]
+
+    response, _ = request(port, job, {"Range": f"bytes={len(content)}-"})
+    assert response.status == 416
+    assert response.getheader("Content-Range") == f"bytes */{len(content)}"
+
+
+BAD_PATHS = ["/download/../../etc/passwd", "/download/" + "g" * 32, "/outro/" + "1" * 32,
+             "/download/" + "1" * 32 + "/extra", "/download/" + "2" * 32, "/download/%2e%2e/" + "1" * 32]
+
+
+@pytest.mark.parametrize("path", BAD_PATHS)
+def test_server_rejects_paths_that_are_not_job_ids(server, path):
+    port, job, _ = server
+    response, _ = request(port, job, path=path)
+    assert response.status == 404
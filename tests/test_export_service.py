@@ -0,0 +1,75 @@
+# tests/test_export_service.py
+import os
+import zipfile
+
+from fakes import FakeTranscriptBackend, install, make_playlist_class
+
+from api.checkpoint import PlaylistCheckpoint
+from api.export_service import ExportService
+from api.youtube_service import YouTubeService
+
+
+def _broken_playlist_class(size: int, fail_after: int):
+    """Playlist falsa cuja leitura das páginas falha depois de `fail_after` vídeos."""
+    base = make_playlist_class(size)
+
+    class BrokenPlaylist(base):
+        def url_generator(self):
+            for count, url in enumerate(super().url_generator()):
+                if count == fail_after:
+                    raise ConnectionError("página seguinte indisponível")
+                yield url
+
+    return BrokenPlaylist
+
+
+def _export(workdir, playlist_class):
+    with install(FakeTranscriptBackend(segments=20, missing_ratio=0.0), playlist_class):
+        videos, title, _ = YouTubeService.stream_playlist("PLtest")
+        return ExportService.export_playlist_job(
+            "PLtest", videos, ["en"], "out.zip", export_format="txt",
+            output_dir=str(workdir / "out"), render_workers=1
+        )
+
+
+def test_export_writes_every_video(workdir):
+    result = _export(workdir, make_playlist_class(6))
+    assert result.error is None
+    assert result.exported == 6
+    with zipfile.ZipFile(result.zip_path) as zipf:
+        assert zipf.testzip() is None
+        assert len(zipf.namelist()) == 6
+
+
+def test_enumeration_error_keeps_checkpoint_and_resumes(workdir):
+    result = _export(workdir, _broken_playlist_class(8, fail_after=3))
+    assert result.exported == 3
+    assert result.error and "não foi lida até o fim" in result.error
+
+    checkpoint = PlaylistCheckpoint.open("PLtest", ["en"], "txt")
+    assert checkpoint.summary()[PlaylistCheckpoint.STATUS_DONE] == 3
+    checkpoint.close()
+
+    # A nova execução reaproveita os três vídeos e busca apenas o restante
+    result = _export(workdir, make_playlist_class(8))
+    assert result.error is None
+    assert result.exported == 8
+    assert not (workdir / "jobs" / PlaylistCheckpoint.job_id("PLtest", ["en"], "txt")).exists()
+
+
+def test_pdfs_go_straight_into_the_zip(workdir):
+    with install(FakeTranscriptBackend(segments=20, missing_ratio=0.0), make_playlist_class(4)):
+        videos, _, _ = YouTubeService.stream_playlist("PLtest")
+        result = ExportService.export_playlist_job(
+            "PLtest", videos, ["en"], "out.zip", export_format="pdf",
+            output_dir=str(workdir / "out"), render_workers=1
+        )
+
+    assert result.exported == 4
+    # Nenhum PDF intermediário é gravado no diretório de saída
+    assert os.listdir(workdir / "out") == ["out.zip"]
+    with zipfile.ZipFile(result.zip_path) as zipf:
+        assert zipf.testzip() is None
+        names = zipf.namelist()
+        assert len(names) == 4 and all(name.endswith(".pdf") for name in names)
+        assert all(zipf.read(name).startswith(b"%PDF-") for name in names)
@@ -0,0 +1,108 @@
+# tests/test_exporters.py
+import io
+import json
+from dataclasses import replace
+
+import pytest
+
+from api import exporters
+from api.exporters import EXPORTERS
+from models.data_models import TranscriptSegments, Video
+from utils import config
+
+VIDEO = Video(
+    id="abc123",
+    title="Aula de teste",
+    transcript=TranscriptSegments.from_raw([
+        {"text": "Olá, mundo", "start": 0.0, "duration": 1.5},
+        {"text": "primeira linha\n\n  \nsegunda linha", "start": 3661.25, "duration": 2.0},
+    ]),
+    language_used="pt",
+    duration=3700,
+    channel="Canal",
+)
+
+
+def render(export_format: str) -> str:
+    return EXPORTERS[export_format].render(VIDEO).decode("utf-8")
+
+
+def test_srt_numbers_cues_and_drops_blank_lines():
+    assert render("srt") == (
+        "1\n00:00:00,000 --> 00:00:01,500\nOlá, mundo\n\n"
+        "2\n01:01:01,250 --> 01:01:03,250\nprimeira linha\nsegunda linha\n\n"
+    )
+
+
+def test_webvtt_has_header_and_drops_blank_lines():
+    assert render("vtt") == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\nOlá, mundo\n\n"
+        "01:01:01.250 --> 01:01:03.250\nprimeira linha\nsegunda linha\n\n"
+    )
+
+
+def test_json_keeps_segments_and_metadata():
+    data = json.loads(render("json"))
+    assert data["id"] == "abc123"
+    assert data["language"] == "pt"
+    assert data["channel"] == "Canal"
+    assert data["duration"] == 3700
+    assert [segment["start"] for segment in data["segments"]] == [0.0, 3661.25]
+    assert data["segments"][1]["text"] == "primeira linha\n\n  \nsegunda linha"
+
+
+def test_markdown_links_each_segment_to_its_time():
+    lines = render("md").splitlines()
+    assert lines[0] == "# Aula de teste"
+    assert "- **Duração:** 01:01:40" in lines
+    assert lines[-1] == "[01:01:01](https://www.youtube.com/watch?v=abc123&t=3661s) primeira linha segunda linha  "
+
+
+def test_text_exporters_stream_the_same_bytes_they_render():
+    for export_format in ("txt", "srt", "vtt", "json", "md"):
+        stream = io.BytesIO()
+        EXPORTERS[export_format].write(VIDEO, stream)
+        assert stream.getvalue() == EXPORTERS[export_format].render(VIDEO)
+
+
+@pytest.fixture
+def render_cache(workdir, monkeypatch):
+    monkeypatch.setattr(config, "RENDER_CACHE_ENABLED", True)
+    monkeypatch.setattr(exporters, "_render_cache", None)
+    return exporters.get_render_cache()
+
+
+class CountingExporter(exporters.TextExporter):
+    def __init__(self):
+        self.renders = 0
+
+    def iter_chunks(self, video):
+        self.renders += 1
+        yield from super().iter_chunks(video)
+
+
+def test_render_cache_key_follows_format_language_version_and_content():
+    srt, vtt = EXPORTERS["srt"], EXPORTERS["vtt"]
+    key = exporters.render_cache_key(srt, VIDEO)
+    assert exporters.render_cache_key(srt, replace(VIDEO)) == key
+
+    other_segments = TranscriptSegments.from_raw([{"text": "outro", "start": 0.0, "duration": 1.0}])
+    variants = [
+        exporters.render_cache_key(vtt, VIDEO),
+        exporters.render_cache_key(srt, replace(VIDEO, language_used="en")),
+        exporters.render_cache_key(srt, replace(VIDEO, title="Outro título")),
+        exporters.render_cache_key(srt, replace(VIDEO, transcript=other_segments)),
+    ]
+    assert len(set(variants + [key])) == 5
+
+
+def test_cached_render_is_reused_until_the_exporter_version_changes(render_cache):
+    exporter = CountingExporter()
+    first = exporters.render_cached(exporter, VIDEO)
+    assert exporters.render_cached(exporter, VIDEO) == first
+    assert exporter.renders == 1
+
+    exporter.version += 1
+    assert exporters.render_cached(exporter, VIDEO) == first
+    assert exporter.renders == 2
@@ -0,0 +1,142 @@
+# tests/test_file_service.py
+import os
+import time
+import zipfile
+
+import pytest
+
+from api.file_service import ArtifactStore, ZipStreamWriter
+
+TEXT = ("Transcrição de exemplo com acentuação. " * 200).encode("utf-8")
+BINARY = bytes(range(256)) * 40
+
+
+@pytest.mark.parametrize("compression", ["stored", "deflate", "auto"])
+def test_zip_round_trip(tmp_path, compression):
+    path = str(tmp_path / "saida.zip")
+    members = {"vídeo um.txt": TEXT, "video 2.pdf": BINARY, "vazio.txt": b""}
+    with ZipStreamWriter(path, compression=compression, workers=2) as writer:
+        for index, (name, data) in enumerate(members.items()):
+            writer.add(index, name, data)
+
+    with zipfile.ZipFile(path) as zipf:
+        assert zipf.testzip() is None
+        assert zipf.namelist() == list(members)
+        for name, data in members.items():
+            assert zipf.read(name) == data
+        infos = {info.filename: info for info in zipf.infolist()}
+    if compression == "stored":
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in infos.values())
+    else:
+        assert infos["vídeo um.txt"].compress_type == zipfile.ZIP_DEFLATED
+    assert writer.member_count == 3
+    assert writer.bytes_written == sum(len(data) for data in members.values())
+
+
+def test_empty_zip_is_valid(tmp_path):
+    path = str(tmp_path / "vazio.zip")
+    ZipStreamWriter(path).close()
+    with zipfile.ZipFile(path) as zipf:
+        assert zipf.namelist() == []
+
+
+def names_for(tmp_path, order, max_buffer_bytes):
+    path = str(tmp_path / f"ordem_{'_'.join(map(str, order))}_{max_buffer_bytes}.zip")
+    with ZipStreamWriter(path, compression="stored", max_buffer_bytes=max_buffer_bytes) as writer:
+        for index in order:
+            writer.add(index, "Mesmo título.txt", f"vídeo {index}".encode("utf-8"))
+    with zipfile.ZipFile(path) as zipf:
+        assert zipf.testzip() is None
+        return {zipf.read(name).decode("utf-8"): name for name in zipf.namelist()}
+
+
+def test_duplicate_names_follow_playlist_position(tmp_path):
+    expected = {"vídeo 0": "Mesmo título.txt", "vídeo 1": "Mesmo título (2).txt",
+                "vídeo 2": "Mesmo título (3).txt"}
+    assert names_for(tmp_path, [0, 1, 2], 1 << 20) == expected
+    assert names_for(tmp_path, [2, 1, 0], 1 << 20) == expected
+
+
+def test_members_are_written_in_playlist_order(tmp_path):
+    path = str(tmp_path / "ordem.zip")
+    with ZipStreamWriter(path, compression="stored") as writer:
+        writer.add(2, "c.txt", b"c")
+        writer.skip(1)
+        writer.add(0, "a.txt", b"a")
+    with zipfile.ZipFile(path) as zipf:
+        assert zipf.namelist() == ["a.txt", "c.txt"]
+
+
+def test_buffer_overflow_writes_out_of_order_without_repeating_names(tmp_path):
+    names = names_for(tmp_path, [2, 1, 0], 0)
+    assert len(set(names.values())) == 3
+
+
+def artifact(tmp_path, store, name, content):
+    source = tmp_path / name
+    source.write_bytes(content)
+    stored = store.put(str(source))
+    time.sleep(0.01)
+    return stored
+
+
+def test_identical_artifacts_are_stored_once(tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    first = artifact(tmp_path, store, "a.zip", b"mesmo conteudo")
+    second = artifact(tmp_path, store, "b.zip", b"mesmo conteudo")
+
+    assert first.path == second.path and first.path.endswith(".zip")
+    assert store.get(first.digest).refs == 2
+    assert not (tmp_path / "a.zip").exists() and not (tmp_path / "b.zip").exists()
+    assert store.total_size() == len(b"mesmo conteudo")
+
+
+def test_quota_evicts_the_least_recently_used_artifact(tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"), max_bytes=25)
+    touched = artifact(tmp_path, store, "acessado.pdf", b"a" * 10)
+    stale = artifact(tmp_path, store, "parado.pdf", b"p" * 10)
+    for stored in (touched, stale):
+        store.release(stored.digest)
+    store.touch(touched.digest)
+
+    newest = artifact(tmp_path, store, "novo.pdf", b"n" * 10)
+    assert store.get(stale.digest) is None and not os.path.exists(stale.path)
+    assert store.get(touched.digest) is not None
+    assert store.get(newest.digest) is not None
+    assert store.total_size() == 20
+
+
+def test_quota_evicts_artifacts_in_use_only_after_unused_ones(tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"), max_bytes=25)
+    in_use = artifact(tmp_path, store, "em_uso.pdf", b"u" * 10)
+    unused = artifact(tmp_path, store, "sem_uso.pdf", b"s" * 10)
+    store.release(unused.digest)
+
+    # O arquivo em uso é o mais antigo, mas o sem uso sai primeiro
+    artifact(tmp_path, store, "novo.pdf", b"n" * 10)
+    assert store.get(unused.digest) is None
+    assert store.get(in_use.digest) is not None
+
+    # Sem arquivos sem uso, a cota vale também para os em uso
+    artifact(tmp_path, store, "outro.pdf", b"o" * 10)
+    assert store.get(in_use.digest) is None
+    assert store.total_size() == 20
+
+
+def test_sweep_removes_idle_and_orphan_files_but_keeps_marked_ones(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path / "artifacts"), max_idle=60)
+    idle = artifact(tmp_path, store, "parado.zip", b"p")
+    kept = artifact(tmp_path, store, "mantido.zip", b"m")
+    in_use = artifact(tmp_path, store, "em_uso.zip", b"e")
+    for stored in (idle, kept):
+        store.release(stored.digest)
+    store.keep(kept.digest)
+    orphan = tmp_path / "artifacts" / "objects" / "00" / "orfao.zip"
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"o")
+
+    later = time.time() + store.ORPHAN_GRACE + 1
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert store.sweep() == 2
+    assert store.get(idle.digest) is None and not orphan.exists()
+    assert store.get(kept.digest) is not None and store.get(in_use.digest) is not None
@@ -0,0 +1,66 @@
+# tests/test_metadata_service.py
+import json
+from collections import OrderedDict
+
+import pytest
+
+from api.metadata_service import MetadataPlaylist, MetadataService
+from models.data_models import VideoMetadata
+from utils import config
+
+# Continuação de playlist no formato que o YouTube envia ao pytube
+PAGE = {"onResponseReceivedActions": [{"appendContinuationItemsAction": {"continuationItems": [
+    {"playlistVideoRenderer": {
+        "videoId": "aaa",
+        "title": {"runs": [{"text": "Primeiro "}, {"text": "vídeo"}]},
+        "lengthSeconds": "125",
+        "shortBylineText": {"runs": [{"text": "Canal"}]},
+    }},
+    {"playlistVideoRenderer": {"videoId": "bbb", "title": {"simpleText": "Segundo"}, "lengthSeconds": "?"}},
+    # Vídeo privado: sem título
+    {"playlistVideoRenderer": {"videoId": "ccc"}},
+    {"continuationItemRenderer": {"continuationEndpoint": {"continuationCommand": {"token": "PROXIMA"}}}},
+]}}]}
+
+
+@pytest.fixture
+def memory_only(monkeypatch):
+    monkeypatch.setattr(config, "METADATA_CACHE_ENABLED", False)
+    monkeypatch.setattr(MetadataService, "_memory", OrderedDict())
+
+
+def test_playlist_page_yields_title_duration_and_channel():
+    assert MetadataService.parse_playlist_page(PAGE) == [
+        VideoMetadata(video_id="aaa", title="Primeiro vídeo", duration=125, channel="Canal"),
+        VideoMetadata(video_id="bbb", title="Segundo", duration=None, channel=None),
+    ]
+
+
+def test_playlist_pages_feed_the_metadata_cache(memory_only):
+    playlist = MetadataPlaylist("https://www.youtube.com/playlist?list=PLteste")
+    urls, continuation = playlist._extract_videos(json.dumps(PAGE))
+
+    # O resultado do pytube não muda
+    assert urls == ["/watch?v=aaa", "/watch?v=bbb", "/watch?v=ccc"]
+    assert continuation == "PROXIMA"
+    assert MetadataService.lookup("aaa").title == "Primeiro vídeo"
+    assert MetadataService.lookup("ccc") is None
+
+
+def test_resolve_fetches_only_unknown_videos(memory_only, monkeypatch):
+    fetched = []
+
+    def fake_oembed(video_id):
+        fetched.append(video_id)
+        return None if video_id == "removido" else VideoMetadata(video_id=video_id, title=f"Título {video_id}")
+
+    monkeypatch.setattr(MetadataService, "_fetch_oembed", staticmethod(fake_oembed))
+    MetadataService.remember([VideoMetadata(video_id="conhecido", title="Já conhecido")])
+
+    found = MetadataService.resolve(["conhecido", "novo", "removido", "novo"])
+    assert sorted(fetched) == ["novo", "removido"]
+    assert {video_id: metadata.title for video_id, metadata in found.items()} == {
+        "conhecido": "Já conhecido", "novo": "Título novo"}
+
+    MetadataService.resolve(["novo"])
+    assert len(fetched) == 2
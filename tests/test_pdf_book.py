@@ -0,0 +1,92 @@
+# tests/test_pdf_book.py
+import re
+
+import pytest
+from fpdf import FPDF
+
+from api.pdf_book import PDFBookWriter, _ParsedPDF, _REFERENCE_PATTERN
+from api.pdf_fonts import PDFFonts
+from api.pdf_service import PDFService
+from models.data_models import TranscriptSegments, Video
+
+TRICKY_URI = "https://exemplo.com/stream?ref=3 0 R&x=(endobj)"
+
+
+def chapter(text: str, language: str = "en") -> bytes:
+    segments = TranscriptSegments.from_raw({"text": f"{text} {i}", "start": float(i), "duration": 1.0}
+                                           for i in range(40))
+    return PDFService.render_pdf(Video(id="v", title=text, transcript=segments, language_used=language))
+
+
+def linked_chapter() -> bytes:
+    """Capítulo com uma string que contém "stream", "endobj" e uma falsa referência."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, txt="stream 5 0 R endobj")
+    pdf.link(10, 10, 50, 10, TRICKY_URI)
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def build(tmp_path, chapters, title="Playlist"):
+    path = str(tmp_path / "livro.pdf")
+    with PDFBookWriter(path, title=title) as writer:
+        for index, data in enumerate(chapters):
+            writer.add(index, f"Capítulo {index + 1}", data)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def check_structure(data: bytes) -> _ParsedPDF:
+    """Confere a xref e as referências de todos os objetos do livro."""
+    document = _ParsedPDF(data)
+    for number in document.offsets:
+        dictionary, _ = document.object(number)
+        for match in _REFERENCE_PATTERN.finditer(re.sub(rb"\((?:\\.|[^\\)])*\)", b"", dictionary)):
+            assert int(match.group(1)) in document.offsets
+    return document
+
+
+def test_book_has_toc_and_every_chapter_page(tmp_path):
+    chapters = [chapter("Primeiro vídeo"), chapter("Segundo vídeo")]
+    data = build(tmp_path, chapters)
+    document = check_structure(data)
+
+    chapter_pages = sum(len(_ParsedPDF(item).pages) for item in chapters)
+    assert len(document.pages) > chapter_pages
+    assert b"/Outlines" in document.dictionary(document.catalog)
+
+
+def test_strings_with_keywords_are_copied_untouched(tmp_path):
+    data = build(tmp_path, [linked_chapter(), linked_chapter()])
+    check_structure(data)
+    escaped = TRICKY_URI.replace("(", "\\(").replace(")", "\\)").encode("latin-1")
+    assert data.count(escaped) == 2
+
+
+def test_identical_fonts_are_written_once(tmp_path):
+    data = build(tmp_path, [chapter("Vídeo A"), chapter("Vídeo B"), chapter("Vídeo C")])
+    check_structure(data)
+    assert len(re.findall(rb"/BaseFont\s*/Helvetica(?![-A-Za-z])", data)) == 1
+
+
+def test_identical_unicode_font_subsets_are_written_once(tmp_path):
+    if PDFFonts.get_font("dejavusans") is None:
+        pytest.skip("DejaVu Sans não instalada")
+    single = chapter("Привет мир", "ru")
+    data = build(tmp_path, [single, chapter("Привет мир", "ru")])
+    check_structure(data)
+    assert data.count(b"/FontFile2") == single.count(b"/FontFile2")
+
+
+@pytest.mark.parametrize("line_end", [b"\r\n", b"\n"])
+def test_xref_with_other_line_endings(line_end):
+    data = chapter("Vídeo")
+    expected = _ParsedPDF(data).offsets
+
+    xref = data.rindex(b"\nxref") + 1
+    trailer = data.index(b"trailer", xref)
+    table = data[xref:trailer].replace(b" \n", line_end).replace(b"\n", line_end)
+    rewritten = data[:xref] + table + data[trailer:]
+    # O startxref continua válido: a tabela começa na mesma posição
+    assert _ParsedPDF(rewritten).offsets == expected
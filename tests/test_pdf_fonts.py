@@ -0,0 +1,36 @@
+# tests/test_pdf_fonts.py
+import fpdf.fpdf
+import fpdf.ttfonts
+import pytest
+from fpdf.ttfonts import TTFontFile
+
+from api import pdf_fonts
+from api.pdf_fonts import CORE_FONT, PDFFonts
+from utils import config
+
+
+def test_require_fails_loudly_when_a_font_file_is_missing(tmp_path, monkeypatch):
+    (tmp_path / "DejaVuSans.ttf").write_bytes(b"")
+    monkeypatch.setattr(config, "FONT_DIRS", [str(tmp_path)])
+    monkeypatch.setattr(PDFFonts, "_files", None)
+
+    PDFFonts.require(["dejavusans"])
+    with pytest.raises(RuntimeError, match="Lohit-Devanagari.ttf"):
+        PDFFonts.require(["dejavusans", "lohitdevanagari"])
+
+
+def test_font_subsets_match_fpdf_without_patching_it():
+    font = PDFFonts.get_font("dejavusans")
+    if font is None:
+        pytest.skip("DejaVu Sans não instalada")
+    subset = [ord(char) for char in "Привет, мир! Olá"]
+
+    assert fpdf.fpdf.TTFontFile is TTFontFile
+    assert fpdf.ttfonts.calcChecksum is not pdf_fonts._checksum
+    assert pdf_fonts._CachedTTFontFile().makeSubset(font.files[""], list(subset)) == \
+        TTFontFile().makeSubset(font.files[""], list(subset))
+
+
+def test_other_fpdf_versions_fall_back_to_arial(monkeypatch):
+    monkeypatch.setattr(pdf_fonts, "FPDF_SUPPORTED", False)
+    assert PDFFonts.select("ru", "Привет") is CORE_FONT
@@ -0,0 +1,57 @@
+# tests/test_rate_limiter.py
+import threading
+import time
+
+import pytest
+
+from utils.rate_limiter import AdaptiveLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_limits():
+    bucket = TokenBucket(rate=10, capacity=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_token_bucket_acquire_respects_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_token_bucket_is_shared_between_threads():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.08
+
+
+def test_token_bucket_set_rate():
+    bucket = TokenBucket(rate=1, capacity=5)
+    bucket.set_rate(1000, capacity=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    with pytest.raises(ValueError):
+        bucket.set_rate(0)
+
+
+def test_adaptive_limiter_aimd():
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=4, initial_limit=4)
+    limiter.acquire()
+    limiter.release(success=False)
+    assert limiter.limit == 2
+    limiter.acquire()
+    limiter.release(success=None)
+    assert limiter.limit == 2
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(success=True)
+    assert limiter.limit == 4
+    assert limiter.in_use == 0
@@ -0,0 +1,108 @@
+# tests/test_retry.py
+import threading
+import time
+
+import pytest
+
+from utils.retry import CircuitBreaker, RetryPolicy
+
+
+def _call_in_thread(breaker: CircuitBreaker) -> threading.Event:
+    """Chama before_call em outra thread e retorna o evento sinalizado ao ser liberada."""
+    done = threading.Event()
+
+    def run():
+        breaker.before_call()
+        done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    return done
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_retry_policy_delays_are_capped():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=2.0)
+    assert all(0 <= policy.delay(attempt) <= 2.0 for attempt in range(10))
+    assert policy.should_retry(0) and policy.should_retry(1)
+    assert not policy.should_retry(2)
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.1)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 1
+
+
+def test_breaker_success_resets_failures():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.1)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_blocks_until_cooldown_and_closes_on_success():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.1)
+    _trip(breaker)
+
+    start = time.monotonic()
+    probe = breaker.before_call()
+    assert probe is not None
+    assert time.monotonic() - start >= 0.05
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    waiting = _call_in_thread(breaker)
+    assert not waiting.wait(0.2)
+
+    breaker.record_success()
+    assert waiting.wait(1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_failed_probe_doubles_cooldown():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05, max_cooldown=0.15)
+    _trip(breaker)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker._current_cooldown == pytest.approx(0.1)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker._current_cooldown == pytest.approx(0.15)
+
+
+def test_breaker_released_probe_unblocks_waiters():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.1)
+    _trip(breaker)
+    probe = breaker.before_call()
+
+    waiting = _call_in_thread(breaker)
+    assert not waiting.wait(0.2)
+
+    # Erro transitório sem limitação (rede, 5xx): nada foi registrado
+    breaker.release_probe(probe)
+    assert waiting.wait(1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_breaker_stale_probe_release_is_ignored():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    _trip(breaker)
+    first = breaker.before_call()
+    breaker.record_failure()
+    second = breaker.before_call()
+
+    breaker.release_probe(first)
+    waiting = _call_in_thread(breaker)
+    assert not waiting.wait(0.2)
+
+    breaker.release_probe(second)
+    assert waiting.wait(1)
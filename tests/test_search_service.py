@@ -0,0 +1,82 @@
+# tests/test_search_service.py
+import threading
+import time
+
+from api.search_service import SearchIndex, SearchService
+from models.data_models import TranscriptSegments, Video
+
+
+def segments(*texts):
+    return TranscriptSegments.from_raw({"text": text, "start": float(i * 5), "duration": 5.0}
+                                       for i, text in enumerate(texts))
+
+
+def test_oldest_transcript_is_ranked_against_the_whole_match(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    # A transcrição mais relevante é a primeira gravada (menores rowids)
+    index.add([("antigo", "en", "Antigo", segments("python python python"))])
+    filler = " ".join(["palavra"] * 30)
+    # Mais segmentos recentes que casam do que qualquer corte por rowid aceitaria
+    index.add([(f"novo{i}", "en", f"Novo {i}", segments(*[f"python {filler}"] * 100))
+               for i in range(60)])
+
+    rows = index.search(SearchService._build_match("python"), 5)
+    assert rows[0][0] == "antigo"
+    assert "**python**" in rows[0][4]
+
+
+def test_hits_are_grouped_per_video(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    index.add([
+        ("a", "en", "A", segments("gato gato gato", "gato", "gato e cão", "gato preto")),
+        ("b", "en", "B", segments("gato", "cão")),
+    ])
+
+    rows = index.search(SearchService._build_match("gato"), 10, hits_per_video=2)
+    assert [row[0] for row in rows] == ["a", "a", "b"]
+
+
+def test_concurrent_writers_do_not_share_rowids(tmp_path):
+    path = str(tmp_path / "search.sqlite3")
+    writers = [SearchIndex(path), SearchIndex(path)]
+
+    def write(index, prefix):
+        for i in range(20):
+            index.add([(f"{prefix}{i}", "en", prefix, segments(f"{prefix} um", f"{prefix} dois"))])
+
+    threads = [threading.Thread(target=write, args=(index, prefix))
+               for index, prefix in zip(writers, ("alfa", "beta"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writers[0].count() == (40, 80)
+    assert len(writers[0].search(SearchService._build_match("alfa"), 100)) == 40
+    assert len(writers[0].search(SearchService._build_match("beta"), 100)) == 40
+
+
+def test_index_video_never_loses_transcripts_when_writing_lags(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    class SlowIndex(SearchIndex):
+        def add(self, entries):
+            release.wait(5)
+            return super().add(entries)
+
+    index = SlowIndex(str(tmp_path / "search.sqlite3"))
+    monkeypatch.setattr(SearchService, "get_index", staticmethod(lambda: index))
+    monkeypatch.setattr(SearchService, "QUEUE_SIZE", 2)
+    monkeypatch.setattr(SearchService, "PUT_TIMEOUT", 0.01)
+    monkeypatch.setattr(SearchService, "BATCH_SIZE", 3)
+
+    started = time.monotonic()
+    for i in range(20):
+        SearchService.index_video(Video(id=f"v{i}", title=f"V{i}", transcript=segments(f"texto {i}"),
+                                        language_used="en"))
+    # A gravação está parada, mas quem enfileira espera no máximo PUT_TIMEOUT por vídeo
+    assert time.monotonic() - started < 2
+
+    release.set()
+    SearchService.flush()
+    assert index.count() == (20, 20)
@@ -0,0 +1,79 @@
+# tests/test_single_flight.py
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def run_together(flight, key, fn, callers=4):
+    """Chama flight.do de várias threads; retorna os resultados ou exceções de cada uma."""
+    outcomes = [None] * callers
+
+    def call(position):
+        try:
+            outcomes[position] = flight.do(key, fn)
+        except Exception as e:
+            outcomes[position] = e
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def wait_for_followers(flight, count):
+    deadline = time.monotonic() + 5
+    while flight.shared < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    result = object()
+
+    def slow():
+        release.wait(5)
+        return result
+
+    threads, outcomes = run_together(flight, "video", slow)
+    wait_for_followers(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(outcome is result for outcome in outcomes)
+    assert (flight.executions, flight.shared, flight.in_flight()) == (1, 3, 0)
+
+    # Depois de concluída, a chave é executada de novo
+    assert flight.do("video", lambda: "novo") == "novo"
+    assert flight.executions == 2
+
+
+def test_concurrent_callers_share_the_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+    error = ValueError("falhou")
+
+    def failing():
+        release.wait(5)
+        raise error
+
+    threads, outcomes = run_together(flight, "video", failing)
+    wait_for_followers(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(outcome is error for outcome in outcomes)
+    assert flight.executions == 1 and flight.in_flight() == 0
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    with pytest.raises(KeyError):
+        flight.do("b", lambda: {}["ausente"])
+    assert (flight.executions, flight.shared) == (2, 0)
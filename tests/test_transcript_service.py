@@ -0,0 +1,113 @@
+# tests/test_transcript_service.py
+import threading
+import time
+
+import pytest
+from fakes import FakeTranscriptBackend, install
+
+from api.search_service import SearchService
+from api.transcript_service import TranscriptService
+from utils import config
+from utils.retry import CircuitBreaker, RetryPolicy
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    monkeypatch.setattr(TranscriptService, "circuit_breaker", breaker)
+    monkeypatch.setattr(TranscriptService, "retry_policy", RetryPolicy(max_attempts=2, base_delay=0.0))
+    return breaker
+
+
+@pytest.fixture
+def fresh_cache(workdir, monkeypatch):
+    """Cache de transcrições novo no diretório do teste, sem índice de busca."""
+    monkeypatch.setattr(TranscriptService, "_cache", None)
+    monkeypatch.setattr(SearchService, "get_index", staticmethod(lambda: None))
+    return workdir
+
+
+def test_probe_with_network_error_does_not_block_other_callers(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    def network_error():
+        raise ConnectionResetError("reset")
+
+    with pytest.raises(ConnectionResetError):
+        TranscriptService._call_upstream(network_error)
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (TranscriptService._call_upstream(lambda: "ok"), done.set()),
+                     daemon=True).start()
+    assert done.wait(2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_interrupted_by_base_exception_is_released(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    in_use = TranscriptService.concurrency.in_use
+    with pytest.raises(KeyboardInterrupt):
+        TranscriptService._call_upstream(interrupted)
+    assert TranscriptService.concurrency.in_use == in_use
+
+    assert TranscriptService._call_upstream(lambda: "ok") == "ok"
+
+
+def test_every_upstream_attempt_takes_a_token(breaker, monkeypatch):
+    taken = []
+    monkeypatch.setattr(TranscriptService.rate_limiter, "acquire", lambda: taken.append(1))
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionResetError("reset")
+        return "ok"
+
+    assert TranscriptService._call_upstream(flaky) == "ok"
+    assert len(taken) == 2
+
+
+def test_resolution_lists_once_and_fetches_only_the_chosen_language(fresh_cache):
+    backend = FakeTranscriptBackend(segments=5, languages=("en", "pt", "es"), languages_per_video=3)
+    with install(backend):
+        resolution = TranscriptService.resolve_transcript("video1", ["de", "pt", "en"])
+
+    assert (backend.listings, backend.fetches) == (1, 1)
+    assert resolution.language_used == "pt"
+    assert len(resolution.transcript) == 5
+    assert {info.language_code for info in resolution.available_transcripts} == {"en", "pt", "es"}
+
+
+def test_permanent_failures_are_cached_until_their_ttl(fresh_cache, monkeypatch):
+    monkeypatch.setattr(config, "NEGATIVE_CACHE_TTL", 0.2)
+    backend = FakeTranscriptBackend(segments=5, missing_ratio=1.0)
+    with install(backend, disable_cache=False):
+        first = TranscriptService.resolve_transcript("sem_legendas", ["en"])
+        second = TranscriptService.resolve_transcript("sem_legendas", ["pt"])
+        assert backend.listings == 1
+        time.sleep(0.3)
+        TranscriptService.resolve_transcript("sem_legendas", ["en"])
+
+    assert first.failure_kind == second.failure_kind == TranscriptService.FAILURE_PERMANENT
+    assert second.error == first.error
+    assert backend.listings == 2
+
+
+def test_missing_language_is_cached_only_for_that_preference(fresh_cache):
+    backend = FakeTranscriptBackend(segments=5, languages=("en", "pt"), languages_per_video=1)
+    with install(backend, disable_cache=False):
+        missing = TranscriptService.resolve_transcript("video2", ["de"])
+        TranscriptService.resolve_transcript("video2", ["de"])
+        assert backend.listings == 1
+        found = TranscriptService.resolve_transcript("video2", ["de", "en"])
+
+    assert missing.failure_kind == TranscriptService.FAILURE_PERMANENT
+    assert found.language_used == "en"
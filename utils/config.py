@@ -0,0 +1,160 @@
+# utils/config.py
+"""
+Configurações da aplicação lidas de variáveis de ambiente.
+
+Todas as variáveis usam o prefixo TRANSCRIPTTUBE_ e possuem valores padrão
+adequados para execução local ou em Docker.
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Lê uma variável de ambiente inteira, usando o padrão se inválida."""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lê uma variável de ambiente decimal, usando o padrão se inválida."""
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_choice(name: str, default: str, choices: tuple) -> str:
+    """Lê uma variável de ambiente com um valor entre as opções, usando o padrão se inválida."""
+    value = os.environ.get(name, default).strip().lower()
+    return value if value in choices else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Lê uma variável de ambiente booleana ("1", "true", "sim" etc.)."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "sim", "on")
+
+
+# Número de workers usados para buscar transcrições em paralelo
+FETCH_MAX_WORKERS = _env_int("TRANSCRIPTTUBE_FETCH_WORKERS", 4)
+
+# Limite de requisições por segundo enviadas ao YouTube (token bucket)
+FETCH_REQUESTS_PER_SECOND = _env_float("TRANSCRIPTTUBE_REQUESTS_PER_SECOND", 2.0)
+
+# Quantidade máxima de requisições que podem ser feitas em rajada
+FETCH_BURST = _env_int("TRANSCRIPTTUBE_REQUESTS_BURST", 4)
+
+# Diretório dos caches persistentes (vazio = <downloads>/.cache)
+CACHE_DIR = os.environ.get("TRANSCRIPTTUBE_CACHE_DIR", "")
+
+# Diretório dos checkpoints de exportação de playlists (vazio = <downloads>/.jobs)
+JOBS_DIR = os.environ.get("TRANSCRIPTTUBE_JOBS_DIR", "")
+
+# Retoma exportações de playlists interrompidas a partir do checkpoint
+RESUME_JOBS = _env_bool("TRANSCRIPTTUBE_RESUME_JOBS", True)
+
+# Habilita o cache persistente de transcrições
+TRANSCRIPT_CACHE_ENABLED = _env_bool("TRANSCRIPTTUBE_TRANSCRIPT_CACHE", True)
+
+# Tempo de vida das transcrições em cache, em segundos (padrão: 7 dias)
+TRANSCRIPT_CACHE_TTL = _env_float("TRANSCRIPTTUBE_TRANSCRIPT_CACHE_TTL", 7 * 24 * 3600)
+
+# Tamanho máximo do cache de transcrições, em megabytes
+TRANSCRIPT_CACHE_MAX_MB = _env_int("TRANSCRIPTTUBE_TRANSCRIPT_CACHE_MAX_MB", 256)
+
+# Tempo de vida das falhas permanentes em cache (vídeos sem transcrição), em segundos
+NEGATIVE_CACHE_TTL = _env_float("TRANSCRIPTTUBE_NEGATIVE_CACHE_TTL", 6 * 3600)
+
+# Memória máxima usada para reordenar arquivos antes de gravá-los no ZIP, em megabytes
+ZIP_BUFFER_MB = _env_int("TRANSCRIPTTUBE_ZIP_BUFFER_MB", 32)
+
+# Compressão dos membros do ZIP: stored (sem compressão), deflate ou auto
+# (deflate apenas nos arquivos que comprimem bem, como TXT, SRT e JSON)
+ZIP_COMPRESSION = _env_choice("TRANSCRIPTTUBE_ZIP_COMPRESSION", "auto", ("stored", "deflate", "auto"))
+
+# Nível do deflate, de 1 (mais rápido) a 9 (menor arquivo)
+ZIP_COMPRESSION_LEVEL = min(max(_env_int("TRANSCRIPTTUBE_ZIP_COMPRESSION_LEVEL", 6), 1), 9)
+
+# Threads que comprimem os membros do ZIP (0 = número de núcleos disponíveis)
+ZIP_COMPRESSION_WORKERS = _env_int("TRANSCRIPTTUBE_ZIP_COMPRESSION_WORKERS", 0)
+
+# Processos usados para renderizar PDFs de playlists (0 = número de núcleos disponíveis, 1 = sem paralelismo)
+RENDER_WORKERS = _env_int("TRANSCRIPTTUBE_RENDER_WORKERS", 0)
+
+# Trabalhos de exportação executados em paralelo em segundo plano
+JOB_WORKERS = _env_int("TRANSCRIPTTUBE_JOB_WORKERS", 2)
+
+# Tempo que trabalhos concluídos e seus arquivos são mantidos, em segundos (padrão: 24 horas)
+JOB_RETENTION = _env_float("TRANSCRIPTTUBE_JOB_RETENTION", 24 * 3600)
+
+# Intervalo de atualização da interface enquanto há trabalhos em andamento, em segundos
+JOB_POLL_INTERVAL = _env_float("TRANSCRIPTTUBE_JOB_POLL_INTERVAL", 1.0)
+
+# Tentativas por requisição ao YouTube em falhas transitórias (rede, limitação)
+RETRY_MAX_ATTEMPTS = _env_int("TRANSCRIPTTUBE_RETRY_ATTEMPTS", 4)
+
+# Atraso base e máximo do backoff exponencial entre tentativas, em segundos
+RETRY_BASE_DELAY = _env_float("TRANSCRIPTTUBE_RETRY_BASE_DELAY", 1.0)
+RETRY_MAX_DELAY = _env_float("TRANSCRIPTTUBE_RETRY_MAX_DELAY", 30.0)
+
+# Falhas de limitação consecutivas que pausam as buscas, e duração da pausa em segundos
+CIRCUIT_BREAKER_THRESHOLD = _env_int("TRANSCRIPTTUBE_CIRCUIT_BREAKER_THRESHOLD", 5)
+CIRCUIT_BREAKER_COOLDOWN = _env_float("TRANSCRIPTTUBE_CIRCUIT_BREAKER_COOLDOWN", 60.0)
+
+# Limites do controle adaptativo de requisições simultâneas ao YouTube (AIMD)
+ADAPTIVE_MIN_CONCURRENCY = _env_int("TRANSCRIPTTUBE_MIN_CONCURRENCY", 1)
+ADAPTIVE_MAX_CONCURRENCY = _env_int("TRANSCRIPTTUBE_MAX_CONCURRENCY", 8)
+
+# Porta do endpoint de métricas no formato do Prometheus (0 = desativado)
+METRICS_PORT = _env_int("TRANSCRIPTTUBE_METRICS_PORT", 9464)
+
+# Endereço de escuta do endpoint de métricas (use 0.0.0.0 dentro do Docker)
+METRICS_ADDRESS = os.environ.get("TRANSCRIPTTUBE_METRICS_ADDRESS", "127.0.0.1")
+
+# Porta do servidor que entrega os arquivos gerados (0 = envia pelo próprio Streamlit)
+DOWNLOAD_PORT = _env_int("TRANSCRIPTTUBE_DOWNLOAD_PORT", 8502)
+
+# Endereço de escuta do servidor de downloads, que não tem autenticação (a
+# imagem Docker usa 0.0.0.0 para que a porta publicada funcione)
+DOWNLOAD_ADDRESS = os.environ.get("TRANSCRIPTTUBE_DOWNLOAD_ADDRESS", "127.0.0.1")
+
+# Endereço público do servidor de downloads usado nos links (padrão: o host
+# pelo qual o navegador acessou a interface, na porta de downloads)
+DOWNLOAD_BASE_URL = os.environ.get("TRANSCRIPTTUBE_DOWNLOAD_BASE_URL", "")
+
+# Diretório dos arquivos gerados pelos trabalhos (padrão: <downloads>/.artifacts)
+ARTIFACTS_DIR = os.environ.get("TRANSCRIPTTUBE_ARTIFACTS_DIR", "")
+
+# Espaço máximo ocupado pelos arquivos gerados, em MB
+ARTIFACT_QUOTA_MB = _env_int("TRANSCRIPTTUBE_ARTIFACT_QUOTA_MB", 2048)
+
+# Intervalo da limpeza em segundo plano dos arquivos gerados, em segundos
+ARTIFACT_SWEEP_INTERVAL = _env_float("TRANSCRIPTTUBE_ARTIFACT_SWEEP_INTERVAL", 600.0)
+
+# Fontes TrueType (Unicode) nos PDFs; desativado, usa apenas a Arial (latin-1)
+UNICODE_FONTS_ENABLED = _env_bool("TRANSCRIPTTUBE_UNICODE_FONTS", True)
+
+# Diretórios onde as fontes TrueType são procuradas (separados por os.pathsep)
+FONT_DIRS = [
+    directory for directory in
+    os.environ.get("TRANSCRIPTTUBE_FONT_DIRS", os.pathsep.join(["fonts", "/usr/share/fonts"])).split(os.pathsep)
+    if directory
+]
+
+# Cache persistente dos arquivos renderizados (PDF e demais formatos)
+RENDER_CACHE_ENABLED = _env_bool("TRANSCRIPTTUBE_RENDER_CACHE", True)
+
+# Tamanho máximo do cache de arquivos renderizados, em MB
+RENDER_CACHE_MAX_MB = _env_int("TRANSCRIPTTUBE_RENDER_CACHE_MAX_MB", 512)
+
+# Cache persistente de títulos, durações e canais dos vídeos
+METADATA_CACHE_ENABLED = _env_bool("TRANSCRIPTTUBE_METADATA_CACHE", True)
+
+# Tempo de vida dos dados dos vídeos no cache, em segundos
+METADATA_CACHE_TTL = _env_float("TRANSCRIPTTUBE_METADATA_CACHE_TTL", 7 * 24 * 3600)
+
+# Índice de busca local sobre todas as transcrições obtidas
+SEARCH_INDEX_ENABLED = _env_bool("TRANSCRIPTTUBE_SEARCH_INDEX", True)
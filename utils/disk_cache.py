@@ -0,0 +1,223 @@
+# utils/disk_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class DiskCache:
+    """Cache persistente chave/valor em SQLite com TTL e remoção LRU.
+
+    Os valores são armazenados como bytes. Quando o tamanho total ultrapassa
+    `max_bytes`, as entradas acessadas há mais tempo são removidas primeiro.
+    O arquivo pode ser compartilhado entre processos (modo WAL).
+
+    Para não pesar em cada operação, o tamanho total é mantido em memória e
+    só recalculado no arquivo (o que também conta as gravações de outros
+    processos) a cada MAINTENANCE_WRITES gravações, quando as entradas
+    expiradas são removidas, ou antes de remover entradas pelo limite. Os
+    horários de acesso das leituras ficam em memória e são gravados em lote.
+    """
+
+    # Gravações entre duas limpezas das entradas expiradas (com recálculo do total)
+    MAINTENANCE_WRITES = 256
+    # Acessos acumulados em memória antes de gravar os horários no arquivo
+    TOUCH_BATCH = 256
+    # Tempo máximo, em segundos, que um horário de acesso fica só em memória
+    TOUCH_INTERVAL = 30.0
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """Abre (ou cria) o cache no caminho informado.
+
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl: Tempo de vida padrão das entradas em segundos (None = sem expiração)
+            max_bytes: Tamanho máximo total dos valores (None = ilimitado)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        # Horários de acesso ainda não gravados, por chave
+        self._touched: Dict[str, float] = {}
+        self._touched_flushed_at = time.time()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "expires_at REAL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries (expires_at)")
+            self._conn.commit()
+            self._total = self._stored_size()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor armazenado ou None se ausente ou expirado."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total -= len(value)
+                self._touched.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH or now - self._touched_flushed_at >= self.TOUCH_INTERVAL:
+                self._write_touched(now)
+                self._conn.commit()
+            self.hits += 1
+            return bytes(value)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Armazena um valor, removendo entradas antigas se exceder o limite.
+
+        Args:
+            key: Chave da entrada
+            value: Conteúdo em bytes
+            ttl: Tempo de vida específico desta entrada (usa o padrão se None)
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), expires_at, now)
+            )
+            self._total += len(value) - (replaced[0] if replaced else 0)
+            self._touched.pop(key, None)
+            self._after_write(now, 1)
+            self._conn.commit()
+
+    def set_many(self, items: Dict[str, bytes], ttl: Optional[float] = None) -> None:
+        """Armazena vários valores em uma única transação."""
+        if not items:
+            return
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            for key in items:
+                replaced = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                if replaced:
+                    self._total -= replaced[0]
+                self._touched.pop(key, None)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, sqlite3.Binary(value), len(value), expires_at, now) for key, value in items.items()]
+            )
+            self._total += sum(len(value) for value in items.values())
+            self._after_write(now, len(items))
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove uma entrada do cache."""
+        with self._lock:
+            removed = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+            if removed:
+                self._total -= removed[0]
+            self._touched.pop(key, None)
+
+    def get_json(self, key: str) -> Any:
+        """Retorna o valor decodificado de JSON ou None se ausente."""
+        value = self.get(key)
+        if value is None:
+            return None
+        return json.loads(value.decode("utf-8"))
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Armazena um valor serializável em JSON."""
+        self.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"), ttl)
+
+    def _stored_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _write_touched(self, now: float) -> None:
+        """Grava os horários de acesso pendentes (sem commit)."""
+        if self._touched:
+            self._conn.executemany("UPDATE entries SET accessed_at = ? WHERE key = ?",
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched.clear()
+        self._touched_flushed_at = now
+
+    def _after_write(self, now: float, count: int) -> None:
+        """Faz a limpeza periódica e remove entradas se o total passar do limite."""
+        self._writes += count
+        if self._writes >= self.MAINTENANCE_WRITES:
+            self._writes = 0
+            self._remove_expired(now)
+        if self.max_bytes is not None and self._total > self.max_bytes:
+            self._evict(now)
+
+    def _remove_expired(self, now: float) -> None:
+        """Remove as entradas expiradas e recalcula o total a partir do arquivo."""
+        self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        self._total = self._stored_size()
+
+    def _evict(self, now: float) -> None:
+        """Remove entradas expiradas e, se necessário, as menos usadas recentemente."""
+        # A ordem LRU precisa dos acessos que ainda estão em memória
+        self._write_touched(now)
+        self._remove_expired(now)
+        total = self._total
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC")
+        to_delete = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+        self._total = total
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna contadores de acertos/falhas e o uso atual do cache."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._total = 0
+            self._touched.clear()
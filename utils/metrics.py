@@ -0,0 +1,306 @@
+# utils/metrics.py
+"""
+Métricas de desempenho expostas no formato de texto do Prometheus.
+
+Implementação mínima, sem dependências externas, de contadores, gauges e
+histogramas com rótulos. Os processos de renderização acumulam suas
+próprias amostras, que são devolvidas ao processo principal com
+`REGISTRY.drain()` e somadas com `REGISTRY.merge()`.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Limites dos buckets de latência, em segundos
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base das métricas: guarda os valores por combinação de rótulos."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: LabelValues, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+    def drain(self) -> Dict[LabelValues, object]:
+        """Retorna os valores acumulados e zera a métrica."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+
+class Counter(_Metric):
+    """Contador que só aumenta (vídeos processados, bytes gravados, falhas)."""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def merge(self, values: Dict[LabelValues, float]) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0) + value
+
+
+class Gauge(_Metric):
+    """Valor que sobe e desce (requisições em andamento, limite de concorrência)."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """Incrementa o gauge durante a execução do bloco."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def drain(self) -> Dict[LabelValues, object]:
+        # Gauges descrevem o estado do próprio processo e não são somados
+        return {}
+
+    def merge(self, values) -> None:
+        pass
+
+
+class Histogram(_Metric):
+    """Distribuição de valores em buckets cumulativos (latências)."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Mede a duração do bloco e registra no histograma."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def merge(self, values) -> None:
+        with self._lock:
+            for key, (counts, total, count) in values.items():
+                state = self._values.get(key)
+                if state is None:
+                    state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+                state[2] += count
+
+    def _render_value(self, key: LabelValues, value) -> List[str]:
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Conjunto das métricas da aplicação."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Gera o texto no formato de exposição do Prometheus."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Dict[LabelValues, object]]:
+        """Retorna e zera as amostras acumuladas (usado nos processos de renderização)."""
+        return {name: values for name, values in
+                ((name, metric.drain()) for name, metric in self._metrics.items()) if values}
+
+    def merge(self, samples: Optional[Dict[str, Dict[LabelValues, object]]]) -> None:
+        """Soma as amostras vindas de outro processo."""
+        for name, values in (samples or {}).items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "transcripttube_stage_seconds",
+    "Duração de cada etapa do processamento, em segundos",
+    ["stage"]
+))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "transcripttube_in_flight",
+    "Operações em andamento por etapa",
+    ["stage"]
+))
+VIDEOS_PROCESSED = REGISTRY.register(Counter(
+    "transcripttube_videos_processed_total",
+    "Vídeos processados por resultado (ok, missing, failed)",
+    ["result"]
+))
+FAILURES = REGISTRY.register(Counter(
+    "transcripttube_failures_total",
+    "Falhas por etapa e tipo de erro",
+    ["stage", "kind"]
+))
+RETRIES = REGISTRY.register(Counter(
+    "transcripttube_retries_total",
+    "Novas tentativas de requisições ao YouTube",
+    ["reason"]
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "transcripttube_cache_requests_total",
+    "Consultas ao cache de transcrições por resultado",
+    ["kind", "result"]
+))
+BYTES_WRITTEN = REGISTRY.register(Counter(
+    "transcripttube_bytes_written_total",
+    "Bytes gerados por tipo de arquivo",
+    ["kind"]
+))
+UPSTREAM_CONCURRENCY = REGISTRY.register(Gauge(
+    "transcripttube_upstream_concurrency_limit",
+    "Limite atual de requisições simultâneas ao YouTube (AIMD)"
+))
+CIRCUIT_OPEN = REGISTRY.register(Gauge(
+    "transcripttube_circuit_breaker_open",
+    "1 enquanto as buscas estão pausadas pelo circuit breaker"
+))
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """Mede a duração de uma etapa e conta as operações em andamento."""
+    with IN_FLIGHT.track_inprogress(stage=stage), STAGE_SECONDS.time(stage=stage):
+        yield
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Não polui a saída com um log por coleta
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_server(port: int, address: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Inicia (uma única vez por processo) o endpoint /metrics em uma thread.
+
+    Args:
+        port: Porta HTTP (0 ou negativo desativa)
+        address: Endereço de escuta
+
+    Returns:
+        Servidor em execução ou None se desativado ou se a porta estiver em uso
+    """
+    global _server, _server_started
+    if port <= 0:
+        return None
+
+    with _server_lock:
+        if not _server_started:
+            # Tenta uma única vez; o Streamlit executa o script a cada interação
+            _server_started = True
+            try:
+                _server = ThreadingHTTPServer((address, port), _MetricsHandler)
+            except OSError as e:
+                print(f"Não foi possível iniciar o endpoint de métricas na porta {port}: {str(e)}")
+                return None
+            _server.daemon_threads = True
+            thread = threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True)
+            thread.start()
+        return _server
@@ -0,0 +1,120 @@
+# utils/rate_limiter.py
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Limitador de taxa no formato token bucket, seguro para múltiplas threads.
+
+    Os tokens são repostos continuamente na taxa `rate` (tokens por segundo)
+    até o limite `capacity`, permitindo pequenas rajadas sem ultrapassar a
+    média configurada.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("A taxa do token bucket deve ser maior que zero")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Consome um token se houver disponível, sem bloquear.
+
+        Returns:
+            True se o token foi consumido, False caso contrário
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def set_rate(self, rate: float, capacity: Optional[int] = None) -> None:
+        """Altera a taxa (e, opcionalmente, a capacidade) do bucket.
+
+        Raises:
+            ValueError: Se a taxa não for maior que zero
+        """
+        if rate <= 0:
+            raise ValueError("A taxa do token bucket deve ser maior que zero")
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = max(1, capacity)
+                self._tokens = min(self._tokens, self.capacity)
+
+    def acquire(self) -> None:
+        """Bloqueia até que um token esteja disponível e o consome."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """Limite de requisições simultâneas ajustado por AIMD.
+
+    Cada sucesso aumenta o limite aos poucos (aumento aditivo, cerca de +1 a
+    cada `limit` sucessos) e cada falha por limitação ou erro de rede o reduz
+    pela metade (redução multiplicativa), mantendo a vazão perto do máximo
+    que o servidor aceita sem provocar bloqueios.
+    """
+
+    def __init__(self, min_limit: int = 1, max_limit: int = 8, initial_limit: int = None):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        initial = self.max_limit if initial_limit is None else initial_limit
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Número atual de requisições simultâneas permitidas."""
+        return int(self._limit)
+
+    @property
+    def in_use(self) -> int:
+        """Número de requisições em andamento."""
+        return self._in_use
+
+    def acquire(self) -> None:
+        """Bloqueia até haver uma vaga dentro do limite atual."""
+        with self._condition:
+            while self._in_use >= int(self._limit):
+                self._condition.wait()
+            self._in_use += 1
+
+    def release(self, success: Optional[bool] = True) -> None:
+        """Libera a vaga e ajusta o limite conforme o resultado da requisição.
+
+        Args:
+            success: False se a requisição falhou por limitação ou erro
+                     transitório; None libera a vaga sem ajustar o limite
+                     (requisição interrompida)
+        """
+        with self._condition:
+            self._in_use -= 1
+            if success is None:
+                pass
+            elif success:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            else:
+                self._limit = max(self.min_limit, self._limit / 2)
+            self._condition.notify_all()
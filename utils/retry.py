@@ -0,0 +1,124 @@
+# utils/retry.py
+import random
+import threading
+import time
+from typing import Optional
+
+
+class RetryPolicy:
+    """Política de novas tentativas com backoff exponencial e jitter.
+
+    O atraso da tentativa `n` é sorteado entre zero e
+    min(max_delay, base_delay * 2**n) ("full jitter"), para que vários
+    workers que falharam juntos não tentem de novo ao mesmo tempo.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+
+    def delay(self, attempt: int) -> float:
+        """Retorna quantos segundos esperar antes da próxima tentativa.
+
+        Args:
+            attempt: Número da tentativa que falhou, a partir de 0
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def should_retry(self, attempt: int) -> bool:
+        """Indica se ainda há tentativas após a tentativa `attempt` (a partir de 0)."""
+        return attempt + 1 < self.max_attempts
+
+
+class CircuitBreaker:
+    """Pausa as chamadas ao servidor após falhas consecutivas de limitação.
+
+    Depois de `threshold` falhas seguidas o circuito abre e todas as chamadas
+    esperam `cooldown` segundos. Em seguida uma única chamada de teste é
+    liberada: se tiver sucesso o circuito fecha; se falhar, abre de novo com
+    o dobro da espera (até `max_cooldown`). Se a chamada de teste terminar
+    sem resposta sobre a limitação (erro de rede, 5xx), `release_probe`
+    libera o teste para a próxima chamada.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0, max_cooldown: Optional[float] = None):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown if max_cooldown is not None else cooldown * 8
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._current_cooldown = cooldown
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_id = 0
+        self._condition = threading.Condition()
+
+    def before_call(self) -> Optional[int]:
+        """Bloqueia enquanto o circuito estiver aberto ou uma chamada de teste estiver em andamento.
+
+        Returns:
+            Identificador da chamada de teste, se esta for a chamada liberada
+            com o circuito meio aberto (a ser passado a `release_probe`), ou None
+        """
+        with self._condition:
+            while True:
+                if self.state == self.CLOSED:
+                    return None
+
+                remaining = self._opened_at + self._current_cooldown - time.monotonic()
+                if self.state == self.OPEN and remaining <= 0:
+                    self.state = self.HALF_OPEN
+
+                if self.state == self.HALF_OPEN and not self._probing:
+                    self._probing = True
+                    self._probe_id += 1
+                    return self._probe_id
+
+                self._condition.wait(timeout=remaining if remaining > 0 else None)
+
+    def release_probe(self, probe: Optional[int]) -> None:
+        """Libera a chamada de teste que terminou sem sucesso nem falha de limitação.
+
+        O circuito continua meio aberto e a próxima chamada vira o novo teste.
+        Não faz nada se o teste já foi resolvido por `record_success` ou
+        `record_failure` (ou se `probe` for None).
+        """
+        with self._condition:
+            if probe is not None and self._probing and probe == self._probe_id:
+                self._probing = False
+                self._condition.notify_all()
+
+    def record_success(self) -> None:
+        """Registra uma chamada bem-sucedida, fechando o circuito."""
+        with self._condition:
+            self.failures = 0
+            self._probing = False
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                self._current_cooldown = self.cooldown
+                self._condition.notify_all()
+
+    def record_failure(self) -> None:
+        """Registra uma falha por limitação, abrindo o circuito se necessário."""
+        with self._condition:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                # A chamada de teste falhou: espera mais antes da próxima
+                self._current_cooldown = min(self.max_cooldown, self._current_cooldown * 2)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.trips += 1
+        self._probing = False
+        self._opened_at = time.monotonic()
+        print(f"Muitas requisições recusadas pelo YouTube; pausando as buscas por {self._current_cooldown:.0f}s")
+        self._condition.notify_all()
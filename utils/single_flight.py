@@ -0,0 +1,72 @@
+# utils/single_flight.py
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """Execução em andamento de uma chave, compartilhada pelos chamadores."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Agrupa chamadas simultâneas com a mesma chave em uma única execução.
+
+    O primeiro chamador executa a função; os que chegam enquanto ela está em
+    andamento esperam e recebem o mesmo resultado (ou a mesma exceção). Ao
+    terminar, a chave é liberada, então chamadas posteriores executam de novo
+    (o cache persistente é quem evita repetições ao longo do tempo).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Executa `fn` uma única vez para todos os chamadores simultâneos da chave.
+
+        Args:
+            key: Identificador da operação (por exemplo, ID do vídeo e idiomas)
+            fn: Função sem argumentos que produz o resultado
+
+        Returns:
+            Resultado de `fn`, compartilhado entre os chamadores
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Retorna quantas chaves estão em execução no momento."""
+        with self._lock:
+            return len(self._calls)
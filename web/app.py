@@ -10,31 +10,40 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Agora que temos o caminho correto, podemos importar nossos módulos
 try:
     from web.ui_components import UIComponents
-    from api.youtube_service import YouTubeService
-    from api.transcript_service import TranscriptService
-    from api.pdf_service import PDFService
-    from api.file_service import FileService
-    from utils.url_utils import extract_video_id
+    from api.exporters import EXPORTERS
+    from api.job_service import JobService
+    from api.download_service import DownloadService
+    from api.search_service import SearchService
+    from models.data_models import Job
+    from utils import config, metrics
 except ImportError:
     # Tente importações absolutas se as relativas falharem
     from YoutubePDF.web.ui_components import UIComponents
-    from YoutubePDF.api.youtube_service import YouTubeService
-    from YoutubePDF.api.transcript_service import TranscriptService
-    from YoutubePDF.api.pdf_service import PDFService
-    from YoutubePDF.api.file_service import FileService
-    from YoutubePDF.utils.url_utils import extract_video_id
+    from YoutubePDF.api.exporters import EXPORTERS
+    from YoutubePDF.api.job_service import JobService
+    from YoutubePDF.api.download_service import DownloadService
+    from YoutubePDF.api.search_service import SearchService
+    from YoutubePDF.models.data_models import Job
+    from YoutubePDF.utils import config, metrics
 
 
 class StreamlitApp:
+    # Quantidade máxima de trabalhos exibidos por sessão
+    MAX_VISIBLE_JOBS = 5
+
     def __init__(self):
         self.ui = UIComponents
-        self.youtube_service = YouTubeService
-        self.transcript_service = TranscriptService
-        self.pdf_service = PDFService
-        self.file_service = FileService
+        self.job_service = JobService
+        self.download_service = DownloadService
+        self.search_service = SearchService
 
     def run(self):
         """Executa a aplicação Streamlit."""
+        # Endpoint de métricas (iniciado uma única vez por processo)
+        metrics.start_server(config.METRICS_PORT, config.METRICS_ADDRESS)
+        # Servidor que entrega os arquivos gerados direto do disco
+        self.download_service.start_server()
+
         self.ui.header()
 
         # Entrada da URL
@@ -43,68 +52,137 @@ class StreamlitApp:
         # Seleção de idiomas
         languages = self.ui.language_selector()
 
+        # Formato do arquivo gerado
+        export_format = self.ui.format_selector(
+            {code: exporter.label for code, exporter in EXPORTERS.items()}
+        )
+
+        # Playlist em um único PDF (apenas no formato PDF)
+        combine = self.ui.combine_option() if export_format == "pdf" else False
+
         # Opção para manter arquivos
         keep_files = self.ui.keep_files_option()
 
         # Botão para processar
         if self.ui.action_button():
-            self._process_url(url, languages)
+            self._submit_job(url, languages, export_format, keep_files, combine)
+
+        # Trabalhos desta sessão (preservados na URL para sobreviver a recarregamentos)
+        jobs = self._show_jobs()
 
-        # Limpar arquivos temporários
-        if 'cleanup_file' in st.session_state and isinstance(st.session_state.cleanup_file, list):
-            self.file_service.cleanup_files(st.session_state.cleanup_file)
-            del st.session_state.cleanup_file
+        # Busca nas transcrições já processadas
+        self._show_search()
 
         self.ui.show_instructions()
 
-    def _process_url(self, url: str, languages: list):
-        """Processa a URL fornecida pelo usuário.
+        # Enquanto houver trabalhos em andamento, atualiza a página periodicamente
+        if any(not job.finished for job in jobs):
+            time.sleep(config.JOB_POLL_INTERVAL)
+            self.ui.rerun()
+
+    def _show_search(self):
+        """Mostra o campo de busca e os trechos encontrados no índice local."""
+        if self.search_service.get_index() is None:
+            return
+
+        query = self.ui.search_section()
+        if query.strip():
+            self.ui.show_search_results(self.search_service.search(query))
+
+    def _submit_job(self, url: str, languages: list, export_format: str = "pdf", keep_files: bool = False,
+                    combine: bool = False):
+        """Envia a URL fornecida pelo usuário para a fila de processamento.
 
         Args:
             url: URL do vídeo ou playlist do YouTube
             languages: Lista de códigos de idioma selecionados pelo usuário
+            export_format: Formato dos arquivos gerados (pdf, txt, srt, vtt, json ou md)
+            keep_files: Mantém os arquivos na pasta de downloads
+            combine: Exporta playlists em um único PDF, com sumário
         """
         if not url:
             self.ui.show_warning("Por favor, insira uma URL válida")
             return
 
-        progress_bar, status_text = self.ui.progress_indicator()
-
         try:
-            video_id = extract_video_id(url)
+            job = self.job_service.submit(url, languages, export_format, keep_files, combine)
+        except ValueError as e:
+            self.ui.show_error(str(e))
+            return
 
-            if not video_id:
-                self.ui.show_error("URL inválida. Por favor, verifique e tente novamente.")
-                return
+        job_ids = [job.id] + [job_id for job_id in self.ui.get_query_list("jobs") if job_id != job.id]
+        self.ui.set_query_list("jobs", job_ids[:self.MAX_VISIBLE_JOBS])
 
-            # Verifica se é uma playlist
-            if isinstance(video_id, tuple) and video_id[1] == 'playlist':
-                self._process_playlist(video_id[0], languages, progress_bar, status_text)
-            else:
-                self._process_video(video_id, languages, progress_bar, status_text)
+    def _show_jobs(self) -> list:
+        """Mostra o andamento e os resultados dos trabalhos desta sessão.
 
-        except Exception as e:
-            self.ui.show_error(f"Ocorreu um erro: {str(e)}")
-            import traceback
-            self.ui.show_error(traceback.format_exc())
+        Returns:
+            Lista de Job exibidos
+        """
+        jobs = []
+        for job_id in self.ui.get_query_list("jobs"):
+            job = self.job_service.get(job_id)
+            if job is not None:
+                jobs.append(job)
+
+        for job in jobs:
+            st.markdown("---")
+            if job.finished:
+                self._show_job_result(job)
+            else:
+                progress_bar, status_text = self.ui.progress_indicator()
+                label = job.title or job.url
+                self.ui.update_progress(progress_bar, status_text, job.progress, f"{label}: {job.message}")
+        return jobs
 
-    def _process_video(self, video_id: str, languages: list, progress_bar, status_text):
-        """Processa um único vídeo.
+    def _show_job_result(self, job: Job):
+        """Mostra o resultado de um trabalho concluído.
 
         Args:
-            video_id: ID do vídeo do YouTube
-            languages: Lista de códigos de idioma para as transcrições
-            progress_bar: Barra de progresso do Streamlit
-            status_text: Elemento de texto para status do Streamlit
+            job: Trabalho concluído, com ou sem sucesso
         """
-        self.ui.update_progress(progress_bar, status_text, 0.2, "Processando vídeo...")
-
-        # Obter detalhes do vídeo
-        video = self.youtube_service.get_video_details(video_id)
+        if job.status == self.job_service.STATUS_FAILED:
+            self.ui.show_error(f"{job.title or job.url}: {job.error}")
+            return
 
-        # Mostrar idiomas disponíveis
-        self.ui.update_progress(progress_bar, status_text, 0.3, "Verificando transcrições disponíveis...")
-        available_transcripts = self.transcript_service.list_available_transcripts(video_id)
+        if job.kind == "playlist":
+            self._show_playlist_result(job)
+        else:
+            self._show_video_result(job)
+
+        if job.result_path and os.path.exists(job.result_path):
+            label = self._download_label(job)
+            if self.download_service.is_available():
+                # Entregue direto do disco, sem carregar o arquivo na sessão
+                self.ui.download_link(label, self.download_service.url_for(job, self.ui.request_host()),
+                                     key=f"download_{job.id}")
+            else:
+                with open(job.result_path, "rb") as f:
+                    self.ui.download_button(
+                        label=label,
+                        data=f.read(),
+                        file_name=job.result_name,
+                        mime=job.mime,
+                        key=f"download_{job.id}"
+                    )
+            if job.keep_files:
+                self.ui.show_success(f"O arquivo está disponível em: {job.result_path}")
+        elif job.artifact:
+            self.ui.show_warning("O arquivo gerado foi removido para liberar espaço. Envie o pedido novamente.")
+
+    @staticmethod
+    def _download_label(job: Job) -> str:
+        """Texto do botão de download conforme o tipo e o formato do arquivo gerado."""
+        if job.kind != "playlist":
+            return f"Baixar transcrição: {job.title[:30]}..."
+        if job.combine:
+            return "Baixar todas as transcrições (PDF único)"
+        return "Baixar todas as transcrições (ZIP)"
+
+    def _show_video_result(self, job: Job):
+        """Mostra os idiomas disponíveis e avisos de um vídeo processado."""
+        available_transcripts = job.details.get("available_transcripts", [])
+        languages = job.languages
 
         # Se tiver transcrições disponíveis, mostrar ao usuário
         if available_transcripts:
@@ -122,136 +200,39 @@ class StreamlitApp:
                     f"O sistema tentará usar qualquer idioma disponível."
                 )
 
-        self.ui.update_progress(progress_bar, status_text, 0.4, f"Obtendo transcrição para: {video.title}")
-
-        # Adicionar transcrição
-        video = self.transcript_service.add_transcript_to_video(video, languages)
-
-        if video.transcript:
-            self.ui.update_progress(progress_bar, status_text, 0.8, "Criando PDF...")
-
-            # Criar PDF
-            pdf_file = self.pdf_service.create_pdf(video)
-
-            if pdf_file:
-                self.ui.update_progress(progress_bar, status_text, 1.0, "Processamento concluído!")
-
-                # Use isso para gerar uma chave verdadeiramente única
-                unique_key = f"download_{video_id}_{int(time.time())}"
-
-                # Em _process_video, quando criamos o botão de download do PDF
-                with open(pdf_file, "rb") as f:
-                    self.ui.download_button(
-                        label=f"Baixar transcrição: {video.title[:30]}...",
-                        data=f,
-                        file_name=pdf_file,
-                        mime="application/pdf",
-                        key=unique_key  # Chave única usando o ID do vídeo
-                    )
-
-                # Marcar para limpeza posterior
-                st.session_state.cleanup_file = [pdf_file]
-            else:
-                self.ui.show_error("Erro ao criar o arquivo PDF.")
-        else:
-            self.ui.update_progress(progress_bar, status_text, 1.0, "Processamento concluído!")
+        if not job.result_path:
             self.ui.show_warning(
                 "Nenhuma transcrição disponível para este vídeo nos idiomas selecionados. "
                 "Tente selecionar outros idiomas ou verificar se o vídeo possui legendas."
             )
 
-    def _process_playlist(self, playlist_id: str, languages: list, progress_bar, status_text):
-        """Processa uma playlist completa.
-
-        Args:
-            playlist_id: ID da playlist do YouTube
-            languages: Lista de códigos de idioma para as transcrições
-            progress_bar: Barra de progresso do Streamlit
-            status_text: Elemento de texto para status do Streamlit
-        """
-        self.ui.update_progress(progress_bar, status_text, 0.1, "Processando playlist...")
-
-        # Obter informações da playlist
-        playlist = self.youtube_service.get_playlist_details(playlist_id)
-        total_videos = len(playlist.videos)
-
-        if total_videos == 0:
-            self.ui.show_error("Não foi possível encontrar vídeos na playlist ou a playlist está vazia.")
-            return
-
-        self.ui.show_info(f"Playlist: {playlist.title} - {total_videos} vídeos encontrados")
-        pdf_files = []
+    def _show_playlist_result(self, job: Job):
+        """Mostra o resumo da exportação de uma playlist."""
+        total_videos = job.details.get("total", 0)
+        missing = job.details.get("missing", [])
+        failed = job.details.get("failed", [])
+        incomplete = job.details.get("incomplete")
 
-        # Limpar qualquer área de download anterior
-        download_area = st.empty()
+        self.ui.show_info(f"Playlist: {job.title} - {total_videos} vídeos processados")
 
-        # Processar cada vídeo
-        for i, video in enumerate(playlist.videos):
-            progress = 0.1 + (0.8 * (i / total_videos))
-            self.ui.update_progress(
-                progress_bar,
-                status_text,
-                progress,
-                f"Processando ({i + 1}/{total_videos}): {video.title}"
+        if incomplete:
+            self.ui.show_warning(
+                f"{incomplete}. O arquivo traz apenas os vídeos lidos até a falha; "
+                f"processe a playlist novamente para continuar de onde parou."
             )
 
-            # Adicionar transcrição
-            video = self.transcript_service.add_transcript_to_video(video, languages)
-
-            if video.transcript:
-                # Criar PDF
-                pdf_file = self.pdf_service.create_pdf(video)
-                if pdf_file:
-                    pdf_files.append(pdf_file)
-
-            # Pequeno delay para não sobrecarregar a API
-            time.sleep(0.5)
-
-        # Criar ZIP com todos os PDFs
-        if pdf_files:
-            self.ui.update_progress(progress_bar, status_text, 0.9, "Criando arquivo ZIP...")
-
-            zip_filename = f"{playlist.title[:50]}_transcricoes.zip"
-            zip_path = self.file_service.create_zip(pdf_files, zip_filename)
-
-            # Remover os arquivos PDF individuais após criar o ZIP
-            for pdf_file in pdf_files:
-                if os.path.exists(pdf_file):
-                    try:
-                        os.remove(pdf_file)
-                    except Exception as e:
-                        print(f"Erro ao remover arquivo PDF {pdf_file}: {str(e)}")
-
-            self.ui.update_progress(progress_bar, status_text, 1.0, "Processamento concluído!")
-
-            # Gerar chave única para o botão de download
-            unique_key = f"download_zip_{int(time.time())}"
-
-            # Usar a área reservada para mostrar apenas um botão
-            with open(zip_path, "rb") as f:
-                download_area.download_button(
-                    label="Baixar todos os PDFs (ZIP)",
-                    data=f,
-                    file_name=os.path.basename(zip_path),
-                    mime="application/zip",
-                    key=unique_key
-                )
-
-            # Verificar se o usuário quer manter os arquivos
-            keep_files = st.session_state.get("keep_files", False)
+        if missing:
+            self.ui.show_warning(
+                f"{len(missing)} de {total_videos} vídeos não possuem transcrição nos idiomas selecionados."
+            )
+        if failed:
+            self.ui.show_warning(
+                f"{len(failed)} de {total_videos} vídeos falharam temporariamente ao carregar. "
+                f"Processe a playlist novamente mais tarde para buscar apenas os vídeos que faltaram."
+            )
 
-            if keep_files:
-                # Se o usuário quer manter os arquivos, mostrar mensagem
-                self.ui.show_success(f"O arquivo ZIP está disponível em: {zip_path}")
-                # Limpar apenas a referência, não o arquivo
-                if 'cleanup_file' in st.session_state:
-                    del st.session_state.cleanup_file
-            else:
-                # Marcar apenas o ZIP para limpeza posterior (os PDFs já foram removidos)
-                st.session_state.cleanup_file = [zip_path]
-        else:
-            self.ui.update_progress(progress_bar, status_text, 1.0, "Processamento concluído!")
+        if not job.result_path:
             self.ui.show_warning(
                 "Nenhuma transcrição foi encontrada para os vídeos desta playlist nos idiomas selecionados. "
                 "Tente selecionar outros idiomas ou verificar se os vídeos possuem legendas."
-            )
\ No newline at end of file
+            )
@@ -1,7 +1,11 @@
 # web/ui_components.py
+import inspect
+
 import streamlit as st
 from typing import Callable, Optional, List, Tuple, Dict
 
+from models.data_models import SearchResult
+
 
 class UIComponents:
     # Lista de idiomas comuns com seus códigos
@@ -107,11 +111,61 @@ class UIComponents:
 
         return selected_langs
 
+    @staticmethod
+    def format_selector(formats: Dict[str, str]) -> str:
+        """Renderiza o seletor do formato de exportação.
+
+        Args:
+            formats: Dicionário de código do formato para o rótulo exibido
+
+        Returns:
+            Código do formato selecionado pelo usuário
+        """
+        codes = list(formats.keys())
+        return st.selectbox(
+            "Formato do arquivo",
+            options=codes,
+            index=0,  # PDF como padrão
+            format_func=lambda code: formats[code],
+            key="export_format"
+        )
+
+    @staticmethod
+    def combine_option() -> bool:
+        """Renderiza a opção de exportar playlists em um único PDF."""
+        return st.checkbox("Playlists em um único PDF, com sumário (em vez de um ZIP)", value=False,
+                           key="combine")
+
     @staticmethod
     def action_button(label: str = "Processar") -> bool:
         """Renderiza o botão de ação."""
         return st.button(label)
 
+    @staticmethod
+    def get_query_list(name: str) -> List[str]:
+        """Lê uma lista separada por vírgulas dos parâmetros da URL da página."""
+        if hasattr(st, "query_params"):
+            value = st.query_params.get(name, "")
+        else:
+            value = ",".join(st.experimental_get_query_params().get(name, []))
+        return [item for item in value.split(",") if item]
+
+    @staticmethod
+    def set_query_list(name: str, values: List[str]):
+        """Grava uma lista nos parâmetros da URL, preservada ao recarregar a página."""
+        if hasattr(st, "query_params"):
+            st.query_params[name] = ",".join(values)
+        else:
+            st.experimental_set_query_params(**{name: ",".join(values)})
+
+    @staticmethod
+    def rerun():
+        """Executa o script novamente para atualizar a página."""
+        if hasattr(st, "rerun"):
+            st.rerun()
+        else:
+            st.experimental_rerun()
+
     @staticmethod
     def progress_indicator():
         """Renderiza indicadores de progresso."""
@@ -164,6 +218,57 @@ class UIComponents:
             key=key
         )
 
+    @staticmethod
+    def request_host() -> Optional[str]:
+        """Retorna o cabeçalho Host da requisição do navegador, se o Streamlit o expuser."""
+        context = getattr(st, "context", None)
+        headers = getattr(context, "headers", None)
+        return headers.get("Host") if headers else None
+
+    @staticmethod
+    def download_link(label: str, url: str, key: str = None):
+        """Renderiza um link para baixar um arquivo servido fora do Streamlit.
+
+        Args:
+            label: Texto do botão
+            url: Endereço do arquivo
+            key: Identificador único para o botão (opcional, ignorado nas versões
+                do Streamlit cujo link_button não aceita key)
+        """
+        if hasattr(st, "link_button"):
+            if "key" in inspect.signature(st.link_button).parameters:
+                return st.link_button(label, url, key=key)
+            return st.link_button(label, url)
+        return st.markdown(f"[{label}]({url})")
+
+    @staticmethod
+    def search_section() -> str:
+        """Renderiza o campo de busca nas transcrições já processadas."""
+        st.markdown("---")
+        st.subheader("🔎 Buscar nas transcrições")
+        return st.text_input("Palavras ou frase (busca em todos os vídeos já processados)", key="search_query")
+
+    @staticmethod
+    def show_search_results(results: List[SearchResult]):
+        """Mostra os vídeos encontrados com links para cada trecho.
+
+        Args:
+            results: Resultados da busca, por relevância
+        """
+        if not results:
+            st.info("Nenhum trecho encontrado.")
+            return
+
+        for result in results:
+            lines = [f"**{result.title}** ({result.language})"]
+            for hit in result.hits:
+                seconds = int(hit.start)
+                hours, remainder = divmod(seconds, 3600)
+                timestamp = (f"{hours}:{remainder // 60:02d}:{remainder % 60:02d}" if hours
+                             else f"{remainder // 60:02d}:{remainder % 60:02d}")
+                lines.append(f"- [{timestamp}]({hit.url}) {hit.snippet}")
+            st.markdown("\n".join(lines))
+
     @staticmethod
     def show_instructions():
         """Renderiza instruções de uso."""
@@ -173,7 +278,7 @@ class UIComponents:
         1. Cole o link de um vídeo do YouTube ou de uma playlist
         2. Selecione os idiomas desejados para as transcrições
         3. Clique em "Processar"
-        4. Aguarde o processamento
+        4. Acompanhe o processamento (você pode recarregar a página ou enviar outras URLs enquanto isso)
         5. Baixe o arquivo PDF da transcrição ou o arquivo ZIP com todas as transcrições (no caso de playlist)
 
         **Observação:** O sistema só consegue extrair transcrições de vídeos que possuem legendas disponíveis nos idiomas selecionados.